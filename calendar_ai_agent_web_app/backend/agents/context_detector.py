@@ -0,0 +1,81 @@
+import re
+import threading
+import time
+from collections import Counter
+from typing import Optional
+from calendar_ai_agent_web_app.backend.config import context_recency_seconds
+
+# "that meeting", "the same time", "this one": references to something said earlier.
+# Bare "this"/"next" are left alone because "this Friday" / "next week" are self-contained.
+_REFERENCE_RE = re.compile(
+    r"\b(?:that|those|these|the same|same|this one|the other)\s+"
+    r"(?:meeting|meetings|event|events|call|appointment|one|ones|time|day|slot|lunch|dinner|session|invite)\b"
+    r"|\bthe (?:meeting|event|call|appointment|invite)\b(?!\s+(?:with|about|for|on|at|called|named)\b)",
+    re.IGNORECASE,
+)
+_PRONOUN_RE = re.compile(r"\b(?:it|its|them|they|him|her|there|then|that|those|ones)\b", re.IGNORECASE)
+_CONTINUATION_RE = re.compile(
+    r"^\s*(?:and|also|but|or|instead|actually|no|nope|yes|yeah|ok|okay|sure|never ?mind|what about|how about|make it)\b"
+    r"|\b(?:instead|again|as well|too|cancel that|undo)\b",
+    re.IGNORECASE,
+)
+_SHORT_FOLLOW_UP_WORDS = 4
+
+
+def context_reason(user_input: str, last_activity: Optional[float], now: Optional[float] = None) -> Optional[str]:
+    """
+    Why `user_input` needs the conversation history to be understood, or None
+    if it can go straight to extraction.
+    """
+    if last_activity is None:
+        # Nothing to enrich from
+        return None
+
+    text = user_input.strip()
+    if _REFERENCE_RE.search(text):
+        return "reference"
+    if _PRONOUN_RE.search(text):
+        return "pronoun"
+    if _CONTINUATION_RE.search(text):
+        return "continuation"
+    if text.endswith(("...", "…")) or (text.endswith("?") and len(text.split()) <= _SHORT_FOLLOW_UP_WORDS):
+        return "ellipsis"
+
+    now = time.time() if now is None else now
+    if now - last_activity <= context_recency_seconds and len(text.split()) <= _SHORT_FOLLOW_UP_WORDS:
+        return "recent_short_follow_up"
+    return None
+
+
+class EnrichmentStats:
+    """Bypass rate and the enrichment latency those bypasses avoided."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = Counter()
+        self._enrich_seconds = 0.0
+
+    def record_enriched(self, reason: str, seconds: float) -> None:
+        with self._lock:
+            self._counts["enriched"] += 1
+            self._counts[f"reason_{reason}"] += 1
+            self._enrich_seconds += seconds
+
+    def record_bypassed(self) -> None:
+        with self._lock:
+            self._counts["bypassed"] += 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            stats = dict(self._counts)
+            enriched = stats.get("enriched", 0)
+            bypassed = stats.get("bypassed", 0)
+            avg_enrich = self._enrich_seconds / enriched if enriched else 0.0
+        total = enriched + bypassed
+        stats["bypass_rate"] = bypassed / total if total else 0.0
+        stats["avg_enrichment_ms"] = avg_enrich * 1000
+        stats["estimated_latency_saved_ms"] = bypassed * avg_enrich * 1000
+        return stats
+
+
+enrichment_stats = EnrichmentStats()
@@ -1,12 +1,16 @@
-import os
+import asyncio
+import time
 import uuid
 from dotenv import load_dotenv
-from langchain_community.chat_message_histories import FileChatMessageHistory
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
-from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 from langchain_core.chat_history import InMemoryChatMessageHistory
 from langgraph.graph import START, MessagesState, StateGraph
+from calendar_ai_agent_web_app.backend.config import async_http_client
+from calendar_ai_agent_web_app.backend.agents.memory import JsonlChatMessageHistory
+from calendar_ai_agent_web_app.backend.agents.session_cache import session_cache
+from calendar_ai_agent_web_app.backend.utils.metrics import record_llm_call, stage
 
 # Load API key from .env
 load_dotenv()
@@ -15,13 +19,17 @@ load_dotenv()
 chats_by_session_id = {}
 
 # Initialize model
-model = ChatOpenAI(model="gpt-4o", temperature=0)
+model = ChatOpenAI(model="gpt-4o", temperature=0, http_async_client=async_http_client)
 
 # Session-based chat memory
-def get_chat_history(session_id: str) -> FileChatMessageHistory:
-    history_dir = "chat_histories"
-    os.makedirs(history_dir, exist_ok=True)
-    return FileChatMessageHistory(os.path.join(history_dir, f"{session_id}.json"))
+def get_chat_history(session_id: str) -> JsonlChatMessageHistory:
+    return session_cache.get(session_id)
+
+# Latency and token usage of one chat call, for /metrics
+def _observe(started: float, ai_message=None) -> None:
+    usage = getattr(ai_message, "usage_metadata", None) or {}
+    record_llm_call(model.model_name, time.perf_counter() - started, ai_message is not None,
+                    usage.get("input_tokens", 0), usage.get("output_tokens", 0))
 
 # LangGraph node to handle model calls
 def call_model(state: MessagesState, config: RunnableConfig) -> dict:
@@ -34,20 +42,54 @@ def call_model(state: MessagesState, config: RunnableConfig) -> dict:
     # Add system instruction to guide the model
     system_message = SystemMessage(content="Here is the conversation history. Use it to answer the user's current question.")
 
-    # Compose full message history with system message
-    messages = [system_message] + list(chat_history.messages) + state["messages"]
+    # Compose bounded history (rolling summary + recent window) with system message
+    messages = [system_message] + chat_history.prompt_messages() + state["messages"]
 
     # Call the model
-    ai_message = model.invoke(messages)
+    started = time.perf_counter()
+    try:
+        with stage("chat"):
+            ai_message = model.invoke(messages)
+    except Exception:
+        _observe(started)
+        raise
+    _observe(started, ai_message)
 
     # Store current messages + model reply
     chat_history.add_messages(state["messages"] + [ai_message])
 
     return {"messages": ai_message}
 
+# Async twin of call_model, used when the graph is driven with astream/ainvoke
+async def call_model_async(state: MessagesState, config: RunnableConfig) -> dict:
+    session_id = config.get("configurable", {}).get("session_id")
+    if not session_id:
+        raise ValueError("Missing session_id in config['configurable']")
+
+    chat_history = get_chat_history(session_id)
+
+    system_message = SystemMessage(content="Here is the conversation history. Use it to answer the user's current question.")
+
+    # History file I/O runs in a worker thread so the event loop stays free
+    history_messages = await asyncio.to_thread(chat_history.prompt_messages)
+    messages = [system_message] + history_messages + state["messages"]
+
+    started = time.perf_counter()
+    try:
+        with stage("chat"):
+            ai_message = await model.ainvoke(messages)
+    except Exception:
+        _observe(started)
+        raise
+    _observe(started, ai_message)
+
+    await chat_history.aadd_messages(state["messages"] + [ai_message])
+
+    return {"messages": ai_message}
+
 # LangGraph definition
 builder = StateGraph(state_schema=MessagesState)
-builder.add_node("model", call_model)
+builder.add_node("model", RunnableLambda(call_model, afunc=call_model_async))
 builder.set_entry_point("model")
 graph = builder.compile()
 
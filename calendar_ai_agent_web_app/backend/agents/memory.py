@@ -0,0 +1,242 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Sequence
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import BaseMessage, SystemMessage, message_to_dict, messages_from_dict
+from calendar_ai_agent_web_app.backend.config import memory_window_messages, memory_summary_batch
+from calendar_ai_agent_web_app.backend.utils.logger import logger
+
+HISTORY_DIR = "chat_histories"
+_TAIL_BLOCK = 64 * 1024
+
+Summarizer = Callable[[str, list[BaseMessage]], str]
+
+# Summaries are folded in one at a time, off the request path
+_summary_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory-summary")
+
+
+def _default_summarizer(summary: str, messages: list[BaseMessage]) -> str:
+    from langchain_openai import ChatOpenAI
+
+    transcript = "\n".join(f"{m.type}: {m.content}" for m in messages)
+    prompt = (
+        "You maintain a running summary of a calendar assistant conversation. "
+        "Fold the new messages into the summary. Keep every event name, date, time, "
+        "participant and location that is still relevant. Reply with the summary only.\n\n"
+        f"Current summary:\n{summary or '(empty)'}\n\nNew messages:\n{transcript}"
+    )
+    return ChatOpenAI(model="gpt-4o-mini", temperature=0).invoke(prompt).content
+
+
+def _read_tail_lines(path: str, count: int) -> list[bytes]:
+    """Last `count` lines of a file, reading backwards in blocks instead of loading it whole."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b""
+        while position > 0 and data.count(b"\n") <= count:
+            step = min(_TAIL_BLOCK, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+    return [line for line in data.splitlines() if line.strip()][-count:]
+
+
+def _count_lines(path: str) -> int:
+    total = 0
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            total += block.count(b"\n")
+    return total
+
+
+class JsonlChatMessageHistory(BaseChatMessageHistory):
+    """
+    Append-only chat history: one JSON message per line in `<session>.jsonl`.
+
+    Only the last `window` messages are loaded and sent to the model. Older
+    messages are folded into a rolling summary stored next to the log
+    (`<session>.summary.json`) by a background worker, so a long session costs
+    the same per turn as a short one.
+    """
+
+    def __init__(self, session_id: str, history_dir: str = HISTORY_DIR, window: int = memory_window_messages,
+                 summary_batch: int = memory_summary_batch, summarizer: Optional[Summarizer] = None,
+                 write_behind: bool = False):
+        os.makedirs(history_dir, exist_ok=True)
+        self.session_id = session_id
+        self.path = os.path.join(history_dir, f"{session_id}.jsonl")
+        self.summary_path = os.path.join(history_dir, f"{session_id}.summary.json")
+        self.window = window
+        self.summary_batch = summary_batch
+        self.summarizer = summarizer or _default_summarizer
+        # With write-behind, appends are buffered until flush() (see agents/session_cache.py)
+        self.write_behind = write_behind
+
+        self._lock = threading.Lock()
+        self._tail: Optional[deque] = None
+        self._total: Optional[int] = None
+        self._summary: Optional[dict] = None
+        self._summarizing = False
+        self._pending: list[str] = []
+        self._last_activity: Optional[float] = None
+
+        self._migrate_legacy(os.path.join(history_dir, f"{session_id}.json"))
+
+    def _migrate_legacy(self, legacy_path: str) -> None:
+        # Sessions written by FileChatMessageHistory are converted once, then left alone
+        if os.path.exists(self.path) or not os.path.exists(legacy_path):
+            return
+        with open(legacy_path) as f:
+            legacy = json.load(f)
+        with open(self.path, "w") as f:
+            for message in legacy:
+                f.write(json.dumps(message) + "\n")
+        logger.info(f"Migrated {len(legacy)} messages from {legacy_path}")
+
+    # ----------------------------- Lazy state -----------------------------
+    def _load(self) -> None:
+        if self._tail is not None:
+            return
+        if os.path.exists(self.path):
+            lines = _read_tail_lines(self.path, self.window)
+            self._tail = deque(messages_from_dict([json.loads(line) for line in lines]), maxlen=self.window)
+            self._total = _count_lines(self.path)
+        else:
+            self._tail = deque(maxlen=self.window)
+            self._total = 0
+
+    def _load_summary(self) -> dict:
+        if self._summary is None:
+            if os.path.exists(self.summary_path):
+                with open(self.summary_path) as f:
+                    self._summary = json.load(f)
+            else:
+                self._summary = {"summary": "", "covered": 0, "offset": 0}
+        return self._summary
+
+    # ----------------------------- BaseChatMessageHistory -----------------------------
+    @property
+    def messages(self) -> list[BaseMessage]:
+        """The recent window only; older turns live in the rolling summary."""
+        with self._lock:
+            self._load()
+            return list(self._tail)
+
+    def add_messages(self, messages: Sequence[BaseMessage]) -> None:
+        if not messages:
+            return
+        payload = "".join(json.dumps(message_to_dict(message)) + "\n" for message in messages)
+        with self._lock:
+            self._load()
+            if self.write_behind:
+                self._pending.append(payload)
+            else:
+                with open(self.path, "a") as f:
+                    f.write(payload)
+            self._tail.extend(messages)
+            self._total += len(messages)
+            self._last_activity = time.time()
+        self._maybe_summarize()
+
+    def last_activity(self) -> Optional[float]:
+        """Epoch seconds of the latest turn, or None for an empty session."""
+        with self._lock:
+            self._load()
+            if self._last_activity is None and self._total:
+                self._last_activity = os.path.getmtime(self.path)
+            return self._last_activity
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._pending)
+
+    def flush(self) -> int:
+        """Write buffered appends to disk; returns how many writes were flushed."""
+        with self._lock:
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, []
+            with open(self.path, "a") as f:
+                f.write("".join(pending))
+            return len(pending)
+
+    def approx_bytes(self) -> int:
+        """Rough in-memory footprint, used by the session cache's memory cap."""
+        with self._lock:
+            tail = sum(len(str(message.content)) for message in self._tail or ())
+            summary = len((self._summary or {}).get("summary", ""))
+            return 512 + tail + summary + sum(len(payload) for payload in self._pending)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending = []
+            for path in (self.path, self.summary_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._tail = deque(maxlen=self.window)
+            self._total = 0
+            self._summary = None
+            self._last_activity = None
+
+    # ----------------------------- Prompt -----------------------------
+    def prompt_messages(self) -> list[BaseMessage]:
+        """Rolling summary (if any) followed by the recent window."""
+        with self._lock:
+            self._load()
+            summary = self._load_summary()["summary"]
+            window = list(self._tail)
+        if summary:
+            return [SystemMessage(content=f"Summary of earlier conversation: {summary}")] + window
+        return window
+
+    # ----------------------------- Rolling summary -----------------------------
+    def _maybe_summarize(self) -> None:
+        with self._lock:
+            summary = self._load_summary()
+            unsummarized = self._total - self.window - summary["covered"]
+            if self._summarizing or unsummarized < self.summary_batch:
+                return
+            self._summarizing = True
+        _summary_executor.submit(self._summarize)
+
+    def _summarize(self) -> None:
+        try:
+            # The summarizer reads the log from disk, so buffered appends must land first
+            self.flush()
+            with self._lock:
+                summary = dict(self._load_summary())
+                upto = self._total - self.window
+
+            # Everything between the last summarized offset and the window start is stable on disk
+            evicted, offset = [], summary["offset"]
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                for _ in range(upto - summary["covered"]):
+                    line = f.readline()
+                    offset += len(line)
+                    evicted.append(json.loads(line))
+
+            started = time.perf_counter()
+            text = self.summarizer(summary["summary"], messages_from_dict(evicted))
+            updated = {"summary": text, "covered": upto, "offset": offset}
+
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.summary_path))
+            with os.fdopen(fd, "w") as f:
+                json.dump(updated, f)
+            os.replace(tmp_path, self.summary_path)
+
+            with self._lock:
+                self._summary = updated
+            logger.info(f"Folded {len(evicted)} messages into summary for {self.session_id} "
+                        f"in {(time.perf_counter() - started) * 1000:.0f}ms")
+        except Exception:
+            logger.exception(f"Summarizing history for {self.session_id} failed")
+        finally:
+            with self._lock:
+                self._summarizing = False
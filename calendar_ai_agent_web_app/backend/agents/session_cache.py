@@ -0,0 +1,124 @@
+import asyncio
+import atexit
+import threading
+from collections import Counter, OrderedDict
+from typing import Optional
+from calendar_ai_agent_web_app.backend.agents.memory import JsonlChatMessageHistory, HISTORY_DIR
+from calendar_ai_agent_web_app.backend.config import session_cache_max_bytes, session_flush_interval
+from calendar_ai_agent_web_app.backend.utils.logger import logger
+
+
+class _Session:
+    __slots__ = ("history", "lock", "async_lock")
+
+    def __init__(self, history: JsonlChatMessageHistory):
+        self.history = history
+        self.lock = threading.Lock()
+        self.async_lock = asyncio.Lock()
+
+    @property
+    def busy(self) -> bool:
+        return self.lock.locked() or self.async_lock.locked()
+
+
+class SessionCache:
+    """
+    LRU of live chat sessions, capped at roughly `max_bytes` of history.
+
+    Appends are buffered in memory and written out by a background flusher
+    every `flush_interval` seconds (and on eviction / shutdown). Each session has
+    its own lock, so concurrent turns from one user are serialized while
+    different users run in parallel. Sessions whose lock is held are never evicted.
+    """
+
+    def __init__(self, max_bytes: int = session_cache_max_bytes, flush_interval: float = session_flush_interval,
+                 history_dir: str = HISTORY_DIR):
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.history_dir = history_dir
+
+        self._sessions: "OrderedDict[str, _Session]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = Counter()
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    def _entry(self, session_id: str) -> _Session:
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is not None:
+                self._sessions.move_to_end(session_id)
+                self._stats["hits"] += 1
+                return entry
+
+            self._stats["misses"] += 1
+            entry = _Session(JsonlChatMessageHistory(session_id, self.history_dir, write_behind=True))
+            self._sessions[session_id] = entry
+            self._evict_locked()
+            self._start_flusher_locked()
+            return entry
+
+    def _evict_locked(self) -> None:
+        total = sum(entry.history.approx_bytes() for entry in self._sessions.values())
+        for session_id in list(self._sessions):
+            if total <= self.max_bytes or len(self._sessions) <= 1:
+                break
+            entry = self._sessions[session_id]
+            if entry.busy:
+                continue
+            total -= entry.history.approx_bytes()
+            del self._sessions[session_id]
+            # Anything still holding this object after eviction writes straight to disk
+            entry.history.write_behind = False
+            entry.history.flush()
+            self._stats["evictions"] += 1
+
+    def get(self, session_id: str) -> JsonlChatMessageHistory:
+        return self._entry(session_id).history
+
+    def lock(self, session_id: str) -> threading.Lock:
+        return self._entry(session_id).lock
+
+    def async_lock(self, session_id: str) -> asyncio.Lock:
+        return self._entry(session_id).async_lock
+
+    # ----------------------------- Write-behind -----------------------------
+    def _start_flusher_locked(self) -> None:
+        if self._flusher is None:
+            self._flusher = threading.Thread(target=self._run_flusher, name="session-flusher", daemon=True)
+            self._flusher.start()
+
+    def _run_flusher(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush_all()
+
+    def flush_all(self) -> int:
+        with self._lock:
+            dirty = [entry.history for entry in self._sessions.values() if entry.history.dirty]
+        flushed = 0
+        for history in dirty:
+            try:
+                flushed += history.flush()
+            except OSError:
+                logger.exception(f"Flushing chat history for {history.session_id} failed")
+        if flushed:
+            self._stats["flushed_writes"] += flushed
+        return flushed
+
+    def close(self) -> None:
+        self._stop.set()
+        self.flush_all()
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["sessions"] = len(self._sessions)
+            stats["approx_bytes"] = sum(entry.history.approx_bytes() for entry in self._sessions.values())
+            stats["dirty_sessions"] = sum(1 for entry in self._sessions.values() if entry.history.dirty)
+        lookups = stats.get("hits", 0) + stats.get("misses", 0)
+        stats["hit_rate"] = stats.get("hits", 0) / lookups if lookups else 0.0
+        return stats
+
+
+session_cache = SessionCache()
+atexit.register(session_cache.close)
@@ -0,0 +1,80 @@
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from calendar_ai_agent_web_app.backend.benchmarks.fake_calendar import FakeCalendarServer, fake_service
+from calendar_ai_agent_web_app.backend.logic.calendar import event_body
+from calendar_ai_agent_web_app.backend.logic.calendar_batch import add_calendar_events_batch
+from calendar_ai_agent_web_app.backend.logic.calendar_mirror import CalendarMirror
+from calendar_ai_agent_web_app.backend.logic.calendar_service import EVENT_FIELDS
+from calendar_ai_agent_web_app.backend.schemas.models import EventDetails
+from calendar_ai_agent_web_app.backend.config import calendar_batch_size
+
+
+def _sample_items(count: int) -> list[tuple[EventDetails, list[str]]]:
+    return [
+        (EventDetails(name=f"Standup {i}", description="Daily standup", location="Zoom",
+                      date=f"2025-06-{1 + i % 28:02d}T09:00:00", duration_minutes=15,
+                      participants=["team@example.com"]), ["team@example.com"])
+        for i in range(count)
+    ]
+
+
+def benchmark(events: int = 200, concurrency: int = 8, rtt_ms: float = 50.0) -> dict:
+    """
+    Insert throughput against a local fake Calendar server: one events.insert per event
+    (what /process does, run on `concurrency` threads) vs. batch requests.
+    `rtt_ms` is the delay the server adds to every HTTP request, standing in for the network.
+    """
+    server = FakeCalendarServer(rtt_ms / 1000)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.port
+    items = _sample_items(events)
+    local = threading.local()
+
+    def insert_one(item):
+        # httplib2 connections aren't thread-safe, so each thread gets its own service
+        if not hasattr(local, "service"):
+            local.service = fake_service(port)
+        local.service.events().insert(calendarId="primary", body=event_body(*item), fields=EVENT_FIELDS).execute()
+
+    report = {"events": events, "concurrency": concurrency, "rtt_ms": rtt_ms, "batch_size": calendar_batch_size}
+    with tempfile.TemporaryDirectory() as tmp:
+        mirror = CalendarMirror(path=os.path.join(tmp, "mirror.db"))
+        try:
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                list(executor.map(insert_one, items))
+            elapsed = time.perf_counter() - started
+            report["per_event"] = {"seconds": elapsed, "events_per_second": events / elapsed, "http_requests": events}
+
+            started = time.perf_counter()
+            results = add_calendar_events_batch(items, service=fake_service(port), mirror=mirror)
+            elapsed = time.perf_counter() - started
+            report["batched"] = {
+                "seconds": elapsed,
+                "events_per_second": events / elapsed,
+                "http_requests": -(-events // calendar_batch_size),
+                "errors": sum(1 for _, error in results if error),
+            }
+        finally:
+            server.shutdown()
+            server.server_close()
+    report["server_inserted"] = len(server.events)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched Calendar inserts against one request per event.")
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rtt-ms", type=float, default=50.0)
+    args = parser.parse_args()
+    print(json.dumps(benchmark(args.events, args.concurrency, args.rtt_ms), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import argparse
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from calendar_ai_agent_web_app.backend.benchmarks.fake_calendar import FakeCalendarServer, fake_service
+from calendar_ai_agent_web_app.backend.logic.calendar_mirror import CalendarMirror
+from calendar_ai_agent_web_app.backend.logic.calendar_service import calendar_service_manager
+from calendar_ai_agent_web_app.backend.logic.event_import import iter_records
+from calendar_ai_agent_web_app.backend.tasks.calendar_import import import_events
+from calendar_ai_agent_web_app.backend.config import calendar_batch_size
+
+
+def _write_sample(path: str, fmt: str, events: int, seed: int = 0) -> None:
+    """A synthetic export: mostly timed meetings, some all-day events and weekly series."""
+    rng = random.Random(seed)
+    origin = datetime(2025, 1, 6, 8, 0)
+    with open(path, "w", newline="") as f:
+        if fmt == "ics":
+            f.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//bench//EN\r\n")
+        else:
+            f.write("Subject,Start Date,Start Time,End Date,End Time,All Day Event,Description,Location\r\n")
+        for i in range(events):
+            start = origin + timedelta(days=rng.randrange(365), minutes=15 * rng.randrange(40))
+            end = start + timedelta(minutes=rng.choice([15, 30, 45, 60, 90]))
+            all_day = i % 20 == 0
+            if fmt == "ics":
+                when = (f"DTSTART;VALUE=DATE:{start:%Y%m%d}\r\n" if all_day else
+                        f"DTSTART;TZID=America/New_York:{start:%Y%m%dT%H%M%S}\r\n"
+                        f"DTEND;TZID=America/New_York:{end:%Y%m%dT%H%M%S}\r\n")
+                rule = "RRULE:FREQ=WEEKLY;COUNT=10\r\n" if i % 50 == 0 else ""
+                f.write(
+                    f"BEGIN:VEVENT\r\nUID:bench-{i}@example.com\r\nSUMMARY:Meeting {i}\r\n{when}{rule}"
+                    f"LOCATION:Room {i % 30}\r\nDESCRIPTION:Agenda item {i}\\, follow-ups\\nand notes that run lon\r\n"
+                    f" g enough to be folded\r\nATTENDEE;CN=Team:mailto:team{i % 7}@example.com\r\n"
+                    f"BEGIN:VALARM\r\nACTION:DISPLAY\r\nTRIGGER:-PT10M\r\nEND:VALARM\r\nEND:VEVENT\r\n"
+                )
+            else:
+                f.write(f'Meeting {i},{start:%m/%d/%Y},{start:%I:%M %p},{end:%m/%d/%Y},{end:%I:%M %p},'
+                        f'{"True" if all_day else "False"},"Agenda item {i}, follow-ups",Room {i % 30}\r\n')
+        if fmt == "ics":
+            f.write("END:VCALENDAR\r\n")
+
+
+def benchmark(events: int = 50_000, rtt_ms: float = 50.0) -> dict:
+    """
+    Parse throughput and peak memory for both formats, then a full .ics import against the
+    local fake Calendar server, stopped halfway and resumed from its checkpoint.
+    """
+    report = {"events": events, "rtt_ms": rtt_ms, "batch_size": calendar_batch_size}
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in ("ics", "csv"):
+            path = os.path.join(tmp, f"sample.{fmt}")
+            _write_sample(path, fmt, events)
+
+            started = time.perf_counter()
+            parsed = sum(1 for record in iter_records(path) if record.error is None)
+            elapsed = time.perf_counter() - started
+
+            tracemalloc.start()
+            for _ in iter_records(path):
+                pass
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            report[f"parse_{fmt}"] = {"file_mb": os.path.getsize(path) / 1e6, "records": parsed,
+                                      "seconds": elapsed, "records_per_second": parsed / elapsed,
+                                      "peak_traced_kb": peak / 1024}
+
+        server = FakeCalendarServer(rtt_ms / 1000)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            service = fake_service(server.port)
+            mirror = CalendarMirror(path=os.path.join(tmp, "mirror.db"))
+            source = os.path.join(tmp, "sample.ics")
+            before = calendar_service_manager.stats().get("batch_requests", 0)
+
+            first = import_events(source, rate=0, limit=events // 2, service=service, mirror=mirror)
+            second = import_events(source, rate=0, service=service, mirror=mirror)
+            seconds = first["seconds"] + second["seconds"]
+            report["import_ics"] = {
+                "seconds": seconds,
+                "events_per_second": events / seconds,
+                "http_requests": calendar_service_manager.stats()["batch_requests"] - before,
+                "resumed_at": first["records_done"],
+                "inserted": second["inserted"],
+                "server_events": len(server.events),
+            }
+        finally:
+            server.shutdown()
+            server.server_close()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse + import a synthetic export against a fake Calendar server.")
+    parser.add_argument("--events", type=int, default=50_000)
+    parser.add_argument("--rtt-ms", type=float, default=50.0)
+    args = parser.parse_args()
+    print(json.dumps(benchmark(args.events, args.rtt_ms), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from calendar_ai_agent_web_app.backend.logic.calendar_mirror import CalendarMirror
+from calendar_ai_agent_web_app.backend.logic.recurrence import Series
+from calendar_ai_agent_web_app.backend.logic.temporal import DEFAULT_TZ
+
+
+def _synthetic_calendar(series: int, singles: int, seed: int) -> list[dict]:
+    """Weekly and daily meetings (a few with COUNT, some moved or cancelled) plus one-off events."""
+    rng = random.Random(seed)
+    origin = datetime(2024, 1, 1, tzinfo=DEFAULT_TZ)
+    events = []
+    for i in range(series):
+        start = origin + timedelta(days=rng.randrange(365), hours=rng.randrange(8, 17))
+        rule = "RRULE:FREQ=DAILY;BYDAY=MO,TU,WE,TH,FR" if i % 10 == 0 else "RRULE:FREQ=WEEKLY"
+        if i % 4 == 0:
+            rule += f";COUNT={rng.randrange(5, 60)}"
+        zone = {"timeZone": "America/Los_Angeles"}
+        master = {
+            "id": f"series{i}", "status": "confirmed", "summary": f"Recurring {i}", "updated": "1",
+            "start": {"dateTime": start.isoformat(), **zone},
+            "end": {"dateTime": (start + timedelta(minutes=rng.choice([30, 60]))).isoformat(), **zone},
+            "attendees": [{"email": f"person{i % 40}@example.com"}], "recurrence": [rule],
+        }
+        events.append(master)
+        for start in Series(master).occurrences(origin, origin + timedelta(days=730))[5:40:9]:
+            instance = Series(master).instance(start)
+            if rng.random() < 0.5:
+                events.append({"id": instance["id"], "status": "cancelled", "recurringEventId": master["id"]})
+            else:
+                moved = start + timedelta(hours=1)
+                instance["start"] = {"dateTime": moved.isoformat()}
+                instance["end"] = {"dateTime": (moved + timedelta(minutes=30)).isoformat()}
+                events.append(instance)
+    for i in range(singles):
+        start = origin + timedelta(days=rng.randrange(730), hours=rng.randrange(8, 17))
+        events.append({"id": f"single{i}", "status": "confirmed", "summary": f"Meeting {i}",
+                       "start": {"dateTime": start.isoformat()},
+                       "end": {"dateTime": (start + timedelta(hours=1)).isoformat()}})
+    return events
+
+
+def benchmark(series: int = 300, singles: int = 3000, window_days: int = 92, seed: int = 0) -> dict:
+    """
+    What a sync stores and what a quarter-long query costs with one row per occurrence
+    (singleEvents=True, expanded two years ahead) vs. master events expanded on read.
+    """
+    events = _synthetic_calendar(series, singles, seed)
+    window_start = datetime(2025, 1, 6, tzinfo=DEFAULT_TZ)
+    window_end = window_start + timedelta(days=window_days)
+    report = {"series": series, "singles": singles, "window_days": window_days}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        masters = CalendarMirror(path=os.path.join(tmp, "masters.db"))
+        masters._apply(events)
+        # The old format: every occurrence materialised, as singleEvents=True returned them
+        expanded = CalendarMirror(path=os.path.join(tmp, "expanded.db"))
+        expanded._apply(masters.query(datetime(2024, 1, 1, tzinfo=DEFAULT_TZ), datetime(2026, 1, 1, tzinfo=DEFAULT_TZ)))
+
+        for name, mirror in (("single_events", expanded), ("masters", masters)):
+            with mirror._db_lock:
+                rows = mirror._conn.execute("SELECT body FROM events UNION ALL SELECT body FROM series").fetchall()
+            report[f"{name}_synced_items"] = len(rows)
+            report[f"{name}_synced_kb"] = round(sum(len(body) for (body,) in rows) / 1024, 1)
+
+        def timed(mirror: CalendarMirror, runs: int = 20) -> tuple[float, list[str]]:
+            started = time.perf_counter()
+            for _ in range(runs):
+                found = mirror.query(window_start, window_end)
+            return (time.perf_counter() - started) / runs * 1000, [event["id"] for event in found]
+
+        report["single_events_query_ms"], expected = timed(expanded)
+        with masters._cache_lock:
+            masters._series_cache.clear()
+            masters._expansion_cache.clear()
+        report["masters_cold_query_ms"], cold = timed(masters, runs=1)
+        report["masters_cached_query_ms"], cached = timed(masters)
+        report["window_events"] = len(expected)
+        assert sorted(cold) == sorted(expected) == sorted(cached)
+    return {key: round(value, 2) if isinstance(value, float) else value for key, value in report.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark master-event storage with local recurrence expansion.")
+    parser.add_argument("--series", type=int, default=300)
+    parser.add_argument("--singles", type=int, default=3000)
+    parser.add_argument("--window-days", type=int, default=92)
+    args = parser.parse_args()
+    print(json.dumps(benchmark(args.series, args.singles, args.window_days), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import argparse
+import json
+import random
+import time
+from datetime import datetime
+from calendar_ai_agent_web_app.backend.logic.conflicts import IntervalTree
+from calendar_ai_agent_web_app.backend.logic.temporal import DEFAULT_TZ
+
+
+def benchmark(n_events: int = 100_000, n_queries: int = 10_000, seed: int = 0) -> dict:
+    """Tree build and overlap-query timings on synthetic events, against a linear scan."""
+    rng = random.Random(seed)
+    origin = datetime(2025, 1, 1, tzinfo=DEFAULT_TZ).timestamp()
+    span = 365 * 24 * 3600
+    intervals = []
+    for i in range(n_events):
+        start = origin + rng.randrange(0, span, 900)
+        intervals.append((start, start + rng.choice([15, 30, 45, 60, 90, 120, 480]) * 60, i))
+    queries = []
+    for _ in range(n_queries):
+        start = origin + rng.randrange(0, span, 900)
+        queries.append((start, start + rng.choice([30, 60]) * 60))
+
+    started = time.perf_counter()
+    tree = IntervalTree(intervals)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    found = sum(len(tree.overlaps(start, end)) for start, end in queries)
+    tree_us = (time.perf_counter() - started) / n_queries * 1e6
+
+    sample = queries[:200]
+    started = time.perf_counter()
+    scanned = [sum(1 for s, e, _ in intervals if s < end and e > start) for start, end in sample]
+    scan_us = (time.perf_counter() - started) / len(sample) * 1e6
+    assert scanned == [len(tree.overlaps(start, end)) for start, end in sample]
+
+    return {
+        "events": n_events,
+        "queries": n_queries,
+        "build_ms": round(build_ms, 1),
+        "avg_overlaps_per_query": round(found / n_queries, 2),
+        "tree_us_per_query": round(tree_us, 2),
+        "linear_scan_us_per_query": round(scan_us, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the conflict-check interval tree.")
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=10_000)
+    args = parser.parse_args()
+    print(json.dumps(benchmark(args.events, args.queries), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from calendar_ai_agent_web_app.backend.benchmarks.fake_calendar import DEFAULT_PAGE_SIZE, FakeCalendarServer, fake_service
+from calendar_ai_agent_web_app.backend.logic.calendar_service import calendar_service_manager, iter_event_pages
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "calendar_events.json")
+
+
+def load_fixture(count: int) -> list[dict]:
+    """
+    `count` events built from the fixture: full resources as events.list returns them without
+    `fields`. Copies past the first round get their own ids and move a week later per round.
+    """
+    with open(FIXTURE_PATH) as f:
+        recorded = json.load(f)
+    events = []
+    for i in range(count):
+        event = json.loads(json.dumps(recorded[i % len(recorded)]))
+        shift = timedelta(weeks=i // len(recorded))
+        if shift:
+            event["id"] = f"{event['id']}r{i // len(recorded)}"
+            for key in ("start", "end"):
+                moved = datetime.fromisoformat(event[key]["dateTime"]) + shift
+                event[key]["dateTime"] = moved.isoformat()
+        events.append(event)
+    return events
+
+
+def _list_stats() -> dict:
+    stats = calendar_service_manager.stats()
+    return {key: stats.get(key, 0) for key in ("list_pages", "list_items", "list_bytes")}
+
+
+def _timed_listing(server: FakeCalendarServer, port: int, **params) -> dict:
+    """Drain iter_event_pages once; sizes as counted by the client, checked against the server."""
+    service = fake_service(port)
+    before, served = _list_stats(), server.bytes_served
+    started = time.perf_counter()
+    for _ in iter_event_pages(service, "primary", **params):
+        pass
+    elapsed = time.perf_counter() - started
+    after = _list_stats()
+    result = {key: after[key] - before[key] for key in after}
+    assert result["list_bytes"] == server.bytes_served - served
+    result["ms"] = elapsed * 1000
+    result["kb_per_event"] = result["list_bytes"] / 1024 / max(1, result["list_items"])
+    return result
+
+
+def benchmark(events: int = 2000, rtt_ms: float = 30.0, mbps: float = 20.0, page_size: int = DEFAULT_PAGE_SIZE) -> dict:
+    """
+    Listing a calendar of `events` fixture events from the fake Calendar server (each request
+    delayed by `rtt_ms`, each body sent at `mbps`): the old single events.list call with full
+    resources, every page with full resources, and every page with the EVENT_LIST_FIELDS
+    projection the pipeline uses.
+    """
+    report = {"events": events, "rtt_ms": rtt_ms, "mbps": mbps, "page_size": page_size}
+    with FakeCalendarServer(rtt_ms / 1000, load_fixture(events), bandwidth=mbps * 1e6 / 8) as server:
+        port = server.port
+
+        # Before pagination: one call, no projection; anything past the first page was dropped
+        started, served = time.perf_counter(), server.bytes_served
+        page = fake_service(port).events().list(calendarId="primary", maxResults=page_size).execute()
+        report["single_call_full"] = {
+            "ms": (time.perf_counter() - started) * 1000,
+            "list_items": len(page.get("items", [])),
+            "list_bytes": server.bytes_served - served,
+        }
+
+        report["paged_full"] = _timed_listing(server, port, fields=None, maxResults=page_size)
+        report["paged_projected"] = _timed_listing(server, port, maxResults=page_size)
+
+    full, projected = report["paged_full"], report["paged_projected"]
+    report["payload_reduction"] = 1 - projected["list_bytes"] / full["list_bytes"]
+    report["latency_reduction"] = 1 - projected["ms"] / full["ms"]
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Payload size and latency of calendar listings, full vs. projected.")
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--rtt-ms", type=float, default=30.0)
+    parser.add_argument("--mbps", type=float, default=20.0, help="simulated link speed, megabits per second")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    args = parser.parse_args()
+    print(json.dumps(benchmark(args.events, args.rtt_ms, args.mbps, args.page_size), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+import json
+import threading
+import time
+import uuid
+from email.parser import BytesParser
+from email.policy import HTTP
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+import httplib2
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+
+# Google's default and largest events.list page
+DEFAULT_PAGE_SIZE = 250
+MAX_PAGE_SIZE = 2500
+
+
+def parse_fields(spec: str) -> dict:
+    """
+    A partial-response selector such as "nextPageToken,items(id,start,attendees(email))" as
+    nested dicts: {"nextPageToken": {}, "items": {"id": {}, ...}}. An empty dict selects everything.
+    """
+    def add(node: dict, path: str, child: dict) -> None:
+        *parents, leaf = path.strip().split("/")
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        node.setdefault(leaf, {}).update(child)
+
+    def parse(i: int) -> tuple[dict, int]:
+        node, name = {}, ""
+        while i < len(spec):
+            char = spec[i]
+            if char == "(":
+                child, i = parse(i + 1)
+                add(node, name, child)
+                name = ""
+                continue
+            if char == ")":
+                break
+            if char == ",":
+                if name.strip():
+                    add(node, name, {})
+                name = ""
+            else:
+                name += char
+            i += 1
+        if name.strip():
+            add(node, name, {})
+        return node, i + 1
+
+    return parse(0)[0] if spec else {}
+
+
+def project(value, selector: dict):
+    """`value` cut down to what `selector` (from parse_fields) asks for."""
+    if not selector:
+        return value
+    if isinstance(value, list):
+        return [project(item, selector) for item in value]
+    if isinstance(value, dict):
+        return {key: project(value[key], sub) for key, sub in selector.items() if key in value}
+    return value
+
+
+class FakeCalendarHandler(BaseHTTPRequestHandler):
+    """
+    events.list (paging, `fields`, sync tokens) and single or batched events.insert, answered
+    from memory after `server.rtt` seconds, plus the body's transfer time when `server.bandwidth`
+    (bytes per second) is set. Every response body's size is added to `server.bytes_served`.
+    """
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, content_type: str, payload: bytes, status: int = 200) -> None:
+        with self.server.lock:
+            self.server.bytes_served += len(payload)
+        if self.server.bandwidth:
+            time.sleep(len(payload) / self.server.bandwidth)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _reply_json(self, body: dict, status: int = 200) -> None:
+        self._reply("application/json", json.dumps(body).encode(), status)
+
+    def _insert(self, body: dict) -> tuple[int, dict]:
+        event_id = body.get("id") or uuid.uuid4().hex
+        event = {**body, "id": event_id, "status": "confirmed",
+                 "htmlLink": f"https://www.google.com/calendar/event?eid={event_id}"}
+        with self.server.lock:
+            if event_id in self.server.events:
+                return 409, {"error": {"code": 409, "message": "The requested identifier already exists."}}
+            self.server.put(event)
+        return 200, event
+
+    def do_GET(self):
+        time.sleep(self.server.rtt)
+        url = urlsplit(self.path)
+        if not url.path.rstrip("/").endswith("/events"):
+            self._reply_json({"error": {"code": 404, "message": "Not Found"}}, 404)
+            return
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        with self.server.lock:
+            since = None
+            if "syncToken" in params:
+                since = self.server.token_seq(params["syncToken"])
+                if since is None:
+                    body = {"error": {"code": 410, "message": "Sync token is no longer valid, a full sync is required.",
+                                      "errors": [{"reason": "fullSyncRequired"}]}}
+                    self._reply_json(body, 410)
+                    return
+            # Incremental syncs include deletions; full listings only with showDeleted
+            show_deleted = since is not None or params.get("showDeleted") == "true"
+            items = [event for seq, event in self.server.ordered()
+                     if (since is None or seq > since) and (show_deleted or event.get("status") != "cancelled")]
+            sync_token = self.server.current_token()
+
+        offset = int(params.get("pageToken", 0))
+        size = min(int(params.get("maxResults", DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+        page = {"kind": "calendar#events", "summary": "primary", "timeZone": "America/Los_Angeles",
+                "items": items[offset:offset + size]}
+        if offset + size < len(items):
+            page["nextPageToken"] = str(offset + size)
+        else:
+            page["nextSyncToken"] = sync_token
+        self._reply_json(project(page, parse_fields(params.get("fields", ""))))
+
+    def do_POST(self):
+        time.sleep(self.server.rtt)
+        content = self.rfile.read(int(self.headers["Content-Length"]))
+
+        if not self.path.startswith("/batch/"):
+            status, event = self._insert(json.loads(content))
+            self._reply_json(event, status)
+            return
+
+        # multipart/mixed of application/http parts, each a whole HTTP request
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + content
+        )
+        boundary = uuid.uuid4().hex
+        parts = []
+        for part in message.iter_parts():
+            request = part.get_payload(decode=True).decode()
+            body = request.split("\r\n\r\n", 1)[1] if "\r\n\r\n" in request else request.split("\n\n", 1)[1]
+            content_id = part["Content-ID"].strip("<>")
+            status, event = self._insert(json.loads(body))
+            parts.append(
+                f"--{boundary}\r\nContent-Type: application/http\r\nContent-ID: <response-{content_id}>\r\n\r\n"
+                f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\nContent-Type: application/json\r\n\r\n"
+                f"{json.dumps(event)}\r\n"
+            )
+        parts.append(f"--{boundary}--\r\n")
+        self._reply(f"multipart/mixed; boundary={boundary}", "".join(parts).encode())
+
+
+class FakeCalendarServer(ThreadingHTTPServer):
+    """
+    A single in-memory calendar behind the Calendar API's URLs. Every change gets the next
+    sequence number, so a sync token is just the sequence it was issued at; expire_sync_tokens()
+    makes every earlier token answer 410 Gone.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, rtt: float = 0.0, events: list[dict] = (), bandwidth: Optional[float] = None):
+        super().__init__(("127.0.0.1", 0), FakeCalendarHandler)
+        self.rtt = rtt
+        self.bandwidth = bandwidth
+        self.lock = threading.RLock()
+        self.events: dict[str, dict] = {}
+        self._seq: dict[str, int] = {}
+        self._last_seq = 0
+        self._epoch = 0
+        self.bytes_served = 0
+        for event in events:
+            self.put(event)
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def put(self, event: dict) -> None:
+        """Create or replace an event, as if edited in Google Calendar."""
+        with self.lock:
+            self._last_seq += 1
+            self.events[event["id"]] = event
+            self._seq[event["id"]] = self._last_seq
+
+    def cancel(self, event_id: str) -> None:
+        with self.lock:
+            event = self.events.get(event_id, {"id": event_id})
+            self.put({"id": event_id, "status": "cancelled",
+                      **{key: event[key] for key in ("recurringEventId", "originalStartTime") if key in event}})
+
+    def expire_sync_tokens(self) -> None:
+        with self.lock:
+            self._epoch += 1
+
+    def ordered(self) -> list[tuple[int, dict]]:
+        return sorted((self._seq[event_id], event) for event_id, event in self.events.items())
+
+    def current_token(self) -> str:
+        return f"{self._epoch}-{self._last_seq}"
+
+    def token_seq(self, token: str) -> Optional[int]:
+        epoch, _, seq = token.partition("-")
+        return int(seq) if epoch == str(self._epoch) and seq.isdigit() else None
+
+    def __enter__(self) -> "FakeCalendarServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+def fake_service(port: int):
+    """A Calendar service object whose requests all go to the fake server on `port`."""
+    doc = json.loads(get_static_doc("calendar", "v3"))
+    doc["rootUrl"] = f"http://127.0.0.1:{port}/"
+    doc["baseUrl"] = f"http://127.0.0.1:{port}/{doc['servicePath']}"
+    return build_from_document(doc, http=httplib2.Http())
@@ -0,0 +1,59 @@
+import argparse
+import json
+import time
+import numpy as np
+from calendar_ai_agent_web_app.backend.logic.intent_classifier import LocalIntentClassifier, _label, load_training_data
+
+
+def evaluate(texts: list[str], labels: list[str], folds: int = 5, seed: int = 0, threshold: float = 0.9) -> dict:
+    """K-fold accuracy, calibration error, fast-path coverage and per-call latency."""
+    order = np.random.default_rng(seed).permutation(len(texts))
+    confidences, correct = [], []
+    for fold in range(folds):
+        held_out = order[fold::folds]
+        train_idx = np.setdiff1d(order, held_out)
+        model = LocalIntentClassifier.train([texts[i] for i in train_idx], [labels[i] for i in train_idx], seed=seed)
+        for i in held_out:
+            extraction = model.predict(texts[i])
+            predicted = _label(extraction.model_dump())
+            confidences.append(extraction.confidence_score)
+            correct.append(predicted == labels[i])
+
+    confidences, correct = np.array(confidences), np.array(correct)
+
+    # Expected calibration error over 10 equal-width bins
+    bins = np.minimum((confidences * 10).astype(int), 9)
+    ece = sum(
+        abs(confidences[bins == b].mean() - correct[bins == b].mean()) * (bins == b).mean()
+        for b in range(10) if (bins == b).any()
+    )
+
+    confident = confidences >= threshold
+    model = LocalIntentClassifier.train(texts, labels, seed=seed)
+    started = time.perf_counter()
+    for text in texts:
+        model.predict(text)
+    latency_us = (time.perf_counter() - started) / len(texts) * 1e6
+
+    return {
+        "examples": len(texts),
+        "accuracy": float(correct.mean()),
+        "expected_calibration_error": float(ece),
+        "threshold": threshold,
+        "fast_path_coverage": float(confident.mean()),
+        "fast_path_accuracy": float(correct[confident].mean()) if confident.any() else None,
+        "latency_us_per_call": latency_us,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate the local intent classifier on the training data.")
+    parser.add_argument("--threshold", type=float, default=0.9)
+    args = parser.parse_args()
+
+    texts, labels = load_training_data()
+    print(json.dumps(evaluate(texts, labels, threshold=args.threshold), indent=2))
+
+
+if __name__ == "__main__":
+    main()
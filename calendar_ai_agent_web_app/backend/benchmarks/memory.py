@@ -0,0 +1,36 @@
+import argparse
+import json
+import tempfile
+import time
+from langchain_core.messages import AIMessage, HumanMessage
+from calendar_ai_agent_web_app.backend.agents.memory import JsonlChatMessageHistory, _summary_executor
+
+
+def benchmark(turns: int = 1000, checkpoints: tuple = (10, 100, 1000)) -> dict:
+    """Per-turn memory overhead (load, prompt assembly, append) at increasing session lengths."""
+    results = {}
+    with tempfile.TemporaryDirectory() as history_dir:
+        summarize = lambda summary, messages: (summary + f" +{len(messages)} messages").strip()
+        for turn in range(1, turns + 1):
+            started = time.perf_counter()
+            # A fresh object per turn, like a process that kept nothing in memory
+            history = JsonlChatMessageHistory("bench", history_dir, summarizer=summarize)
+            prompt = history.prompt_messages()
+            history.add_messages([HumanMessage(content=f"Book a meeting number {turn} tomorrow at 3pm"),
+                                  AIMessage(content=f"Booking meeting number {turn} tomorrow at 3pm.")])
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if turn in checkpoints:
+                results[f"turn_{turn}"] = {"ms": round(elapsed_ms, 3), "prompt_messages": len(prompt)}
+        _summary_executor.submit(lambda: None).result()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the append-only conversation memory.")
+    parser.add_argument("--turns", type=int, default=1000)
+    args = parser.parse_args()
+    print(json.dumps(benchmark(args.turns), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+import argparse
+import asyncio
+import json
+import logging
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest import mock
+import httpx
+from fastapi import FastAPI
+from pydantic import BaseModel
+from calendar_ai_agent_web_app.backend.agents.session_cache import session_cache
+from calendar_ai_agent_web_app.backend.config import blocking_io_workers
+from calendar_ai_agent_web_app.backend.logic import calendar, conflicts, llm
+from calendar_ai_agent_web_app.backend.logic.llm_cache import llm_cache
+from calendar_ai_agent_web_app.backend.logic.temporal import DEFAULT_TZ
+from calendar_ai_agent_web_app.backend.schemas.models import EventDetails, EventExtraction
+from calendar_ai_agent_web_app.backend.services import processor
+
+SAMPLE_INPUT = "Set up a project review with the design team"
+
+# Blocking OpenAI round trips the baseline handler made for a create request, one after another:
+# LangGraph enrichment (gpt-4o), extraction, detail parsing and the confirmation message
+BASELINE_LLM_CALLS = 4
+
+
+class _Request(BaseModel):
+    user_input: str
+    user_id: str
+
+
+def _bench_app(fakes: "_FakeBackends") -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/sync")
+    def process_sync(request: _Request):
+        # The handler as it was before the async pipeline: a plain def on Starlette's thread pool,
+        # waiting out each OpenAI call and then the Google insert on its worker thread
+        for _ in range(BASELINE_LLM_CALLS):
+            fakes.blocking_llm_call()
+        link = fakes.google_call("https://calendar.example/event")()
+        return {"calendar_link": link, "to_emails": [], "requires_confirmation": True}
+
+    @app.post("/async")
+    async def process_async(request: _Request):
+        return await processor.process_calendar_request_async(request.user_input, [], request.user_id)
+
+    return app
+
+
+class _FakeBackends:
+    """OpenAI and Google Calendar stand-ins that only wait out a round trip, counting peak overlap."""
+
+    def __init__(self, llm_rtt: float, google_rtt: float):
+        self.llm_rtt = llm_rtt
+        self.google_rtt = google_rtt
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+        self.llm_calls = 0
+
+    def _enter(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+
+    def _leave(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def _completion(self, response_format, messages):
+        if response_format is EventExtraction:
+            parsed = EventExtraction(description=messages[-1]["content"], is_calendar_event=True,
+                                     is_calendar_modify_event=False, is_list_events=False, confidence_score=0.95)
+        elif response_format is EventDetails:
+            start = datetime.now(DEFAULT_TZ).replace(hour=15, minute=0, second=0, microsecond=0) + timedelta(days=1)
+            parsed = EventDetails(name="Project review", description="", location="", date=start.isoformat(),
+                                  duration_minutes=60, participants=[])
+        else:
+            raise ValueError(f"No canned response for {response_format.__name__}")
+        return SimpleNamespace(usage=SimpleNamespace(prompt_tokens=500, completion_tokens=50),
+                               choices=[SimpleNamespace(message=SimpleNamespace(parsed=parsed))])
+
+    async def parse(self, model, messages, response_format):
+        self._enter()
+        try:
+            with self._lock:
+                self.llm_calls += 1
+            await asyncio.sleep(self.llm_rtt)
+            return self._completion(response_format, messages)
+        finally:
+            self._leave()
+
+    def blocking_llm_call(self) -> None:
+        """A synchronous OpenAI client call, as the baseline pipeline made them."""
+        self._enter()
+        try:
+            with self._lock:
+                self.llm_calls += 1
+            time.sleep(self.llm_rtt)
+        finally:
+            self._leave()
+
+    def google_call(self, result):
+        def call(*args, **kwargs):
+            self._enter()
+            try:
+                time.sleep(self.google_rtt)
+                return result
+            finally:
+                self._leave()
+        return call
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+async def _drive(client: httpx.AsyncClient, path: str, concurrency: int, requests: int) -> dict:
+    latencies = []
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with gate:
+            started = time.perf_counter()
+            response = await client.post(path, json={"user_input": SAMPLE_INPUT,
+                                                     "user_id": f"bench-{path.strip('/')}-{concurrency}-{i}"})
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests_per_second": requests / elapsed,
+        "p50_ms": _percentile(latencies, 0.5) * 1000,
+        "p95_ms": _percentile(latencies, 0.95) * 1000,
+    }
+
+
+def benchmark(levels: tuple[int, ...] = (10, 40, 100, 200), rounds: int = 3, llm_rtt_ms: float = 400.0,
+              google_rtt_ms: float = 100.0) -> dict:
+    """
+    /process throughput of one worker, the old thread-pool handler against the async one, at
+    each concurrency level. The old handler is replayed as its sequence of blocking round
+    trips; the async one takes the real remote path (classifiers, parser, conflict check,
+    insert). Both run against fakes that only sleep for the given round trips. `peak_in_flight`
+    is the most OpenAI / Google calls that were waiting at once: how many requests the worker
+    actually carried.
+    """
+    fakes = _FakeBackends(llm_rtt_ms / 1000, google_rtt_ms / 1000)
+    report = {"llm_rtt_ms": llm_rtt_ms, "google_rtt_ms": google_rtt_ms, "levels": {}}
+
+    async def run() -> None:
+        # Same to_thread pool as main.py's startup hook
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=blocking_io_workers))
+        transport = httpx.ASGITransport(app=_bench_app(fakes))
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            for concurrency in levels:
+                level = {}
+                for path in ("/sync", "/async"):
+                    fakes.peak = fakes.llm_calls = 0
+                    requests = concurrency * rounds
+                    result = await _drive(client, path, concurrency, requests)
+                    result["peak_in_flight"] = fakes.peak
+                    result["llm_calls_per_request"] = fakes.llm_calls / requests
+                    level[path.strip("/")] = result
+                report["levels"][concurrency] = level
+
+    with tempfile.TemporaryDirectory() as tmp, \
+            mock.patch.object(llm.async_client.beta.chat.completions, "parse", side_effect=fakes.parse), \
+            mock.patch.object(calendar, "add_calendar_event", fakes.google_call("https://calendar.example/event")), \
+            mock.patch.object(conflicts, "find_conflicts", fakes.google_call([])), \
+            mock.patch.object(processor, "local_classifier", None), \
+            mock.patch.object(llm_cache, "enabled", False), \
+            mock.patch.object(session_cache, "history_dir", tmp):
+        asyncio.run(run())
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent /process requests one worker carries, sync vs async handler.")
+    parser.add_argument("--levels", type=int, nargs="+", default=[10, 40, 100, 200])
+    parser.add_argument("--rounds", type=int, default=3, help="requests per level = concurrency x rounds")
+    parser.add_argument("--llm-rtt-ms", type=float, default=400.0)
+    parser.add_argument("--google-rtt-ms", type=float, default=100.0)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    print(json.dumps(benchmark(tuple(args.levels), args.rounds, args.llm_rtt_ms, args.google_rtt_ms), indent=2))
+
+
+if __name__ == "__main__":
+    main()
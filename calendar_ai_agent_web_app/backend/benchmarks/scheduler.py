@@ -0,0 +1,88 @@
+import argparse
+import json
+import math
+import random
+import time
+from datetime import datetime, timedelta
+from calendar_ai_agent_web_app.backend.logic.scheduler import Busy, solve
+from calendar_ai_agent_web_app.backend.logic.temporal import DEFAULT_TZ
+from calendar_ai_agent_web_app.backend.config import working_hours_start, working_hours_end, working_days
+
+
+def _synthetic_busy(participants: int, start: datetime, days: int, seed: int) -> dict[str, Busy]:
+    """Three to seven meetings per working day per person, on the quarter hour."""
+    rng = random.Random(seed)
+    busy = {}
+    for p in range(participants):
+        blocks = []
+        for d in range(days):
+            day = start + timedelta(days=d)
+            if day.weekday() >= 5:
+                continue
+            for _ in range(rng.randint(3, 7)):
+                begin = day.replace(hour=8, minute=0) + timedelta(minutes=15 * rng.randrange(40))
+                blocks.append((begin.timestamp(), (begin + timedelta(minutes=rng.choice([30, 30, 60, 60, 90]))).timestamp()))
+        busy[f"person{p}@example.com"] = blocks
+    return busy
+
+
+def _scan_best(busy: dict[str, Busy], window_start: datetime, window_end: datetime, duration_minutes: int,
+               hours: tuple[float, float], step_minutes: int) -> tuple[int, int]:
+    """Reference: try every aligned start against every participant's intervals in Python."""
+    best = (-1, 0)
+    start = window_start
+    length = timedelta(minutes=duration_minutes)
+    while start + length <= window_end:
+        local = start.astimezone(DEFAULT_TZ)
+        end_local = local + length
+        if (local.weekday() in working_days and local.hour + local.minute / 60 >= hours[0]
+                and end_local.date() == local.date() and end_local.hour + end_local.minute / 60 <= hours[1]):
+            s, e = start.timestamp(), (start + length).timestamp()
+            free = sum(1 for blocks in busy.values() if not any(a < e and b > s for a, b in blocks))
+            if free > best[0]:
+                best = (free, int(s))
+        start += timedelta(minutes=step_minutes)
+    return best
+
+
+def benchmark(participants: int = 50, days: int = 92, duration_minutes: int = 60, seed: int = 0) -> dict:
+    """Bitmap solve at 1- and 5-minute resolution vs. a pure-Python scan, on synthetic calendars."""
+    window_start = datetime(2025, 1, 6, tzinfo=DEFAULT_TZ)
+    window_end = window_start + timedelta(days=days)
+    busy = _synthetic_busy(participants, window_start, days, seed)
+    hours = (working_hours_start, working_hours_end)
+    report = {"participants": participants, "days": days, "busy_blocks": sum(len(b) for b in busy.values())}
+
+    for resolution in (5, 1):
+        solve(busy, window_start, window_end, duration_minutes, hours, resolution)  # warm-up
+        runs = 5
+        started = time.perf_counter()
+        for _ in range(runs):
+            slots = solve(busy, window_start, window_end, duration_minutes, hours, resolution)
+        elapsed = (time.perf_counter() - started) / runs
+        report[f"bitmap_{resolution}min"] = {
+            "ms": round(elapsed * 1000, 2),
+            "slots": int(math.ceil((window_end - window_start).total_seconds() / 60 / resolution)),
+            "best_available": len(slots[0].available) if slots else 0,
+        }
+
+    started = time.perf_counter()
+    best_free, best_start = _scan_best(busy, window_start, window_end, duration_minutes, hours, 30)
+    report["python_scan_30min_steps"] = {"ms": round((time.perf_counter() - started) * 1000, 1),
+                                         "best_available": best_free}
+    top = solve(busy, window_start, window_end, duration_minutes, hours, 5)[0]
+    assert len(top.available) == best_free and top.start_time.timestamp() == best_start
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the find-a-time bitmap solver.")
+    parser.add_argument("--participants", type=int, default=50)
+    parser.add_argument("--days", type=int, default=92)
+    parser.add_argument("--duration", type=int, default=60)
+    args = parser.parse_args()
+    print(json.dumps(benchmark(args.participants, args.days, args.duration), indent=2))
+
+
+if __name__ == "__main__":
+    main()
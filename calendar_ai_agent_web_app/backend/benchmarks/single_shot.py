@@ -0,0 +1,92 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Optional
+from calendar_ai_agent_web_app.backend.logic.extractor import extract_event_info_async, extract_list_event_info_async
+from calendar_ai_agent_web_app.backend.logic.intent_classifier import load_training_data
+from calendar_ai_agent_web_app.backend.logic.parser import (
+    parse_calendar_event_details_async, parse_calendar_modify_details_async, parse_list_calendar_events_async
+)
+from calendar_ai_agent_web_app.backend.logic.single_shot import classify_and_parse_async, is_usable
+from calendar_ai_agent_web_app.backend.utils.logger import logger
+
+
+async def _multi_stage_intent(text: str) -> tuple[str, float]:
+    """The current remote path: extract (with list fallback), then the matching parser."""
+    def label(extraction) -> Optional[str]:
+        if extraction.confidence_score < 0.7:
+            return None
+        if extraction.is_calendar_modify_event:
+            return "modify"
+        if extraction.is_calendar_event:
+            return "create"
+        if extraction.is_list_events:
+            return "list"
+        return None
+
+    started = time.perf_counter()
+    extraction = await extract_event_info_async(text)
+    intent = label(extraction)
+    if intent is None:
+        extraction = await extract_list_event_info_async(text)
+        intent = label(extraction)
+
+    if intent == "modify":
+        await parse_calendar_modify_details_async(extraction.description)
+    elif intent == "create":
+        await parse_calendar_event_details_async(extraction.description)
+    elif intent == "list":
+        await parse_list_calendar_events_async(extraction.description)
+    return intent or "none", time.perf_counter() - started
+
+
+async def _single_shot_intent(text: str) -> tuple[str, float]:
+    started = time.perf_counter()
+    result = await classify_and_parse_async(text)
+    return (result.intent if is_usable(result) else "none"), time.perf_counter() - started
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+async def compare(limit: int = 50, seed: int = 0, concurrency: int = 4) -> dict:
+    """Intent accuracy and classify+parse latency of both paths over a sample of the training JSONL."""
+    texts, labels = load_training_data()
+    sample = random.Random(seed).sample(range(len(texts)), min(limit, len(texts)))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(path, i):
+        async with semaphore:
+            try:
+                return await path(texts[i])
+            except Exception as e:
+                logger.error(f"{path.__name__} failed on example {i}: {e}")
+                return "error", float("nan")
+
+    report = {"examples": len(sample)}
+    for name, path in (("multi_stage", _multi_stage_intent), ("single_shot", _single_shot_intent)):
+        results = await asyncio.gather(*(run(path, i) for i in sample))
+        latencies = [seconds for _, seconds in results if seconds == seconds]
+        report[name] = {
+            "accuracy": sum(intent == labels[i] for (intent, _), i in zip(results, sample)) / len(sample),
+            "errors": sum(intent == "error" for intent, _ in results),
+            "p50_ms": _percentile(latencies, 0.5) * 1000,
+            "p95_ms": _percentile(latencies, 0.95) * 1000,
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="A/B the single-shot parse against the multi-stage pipeline.")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(compare(args.limit, concurrency=args.concurrency)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
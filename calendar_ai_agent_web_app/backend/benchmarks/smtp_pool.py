@@ -0,0 +1,118 @@
+import argparse
+import asyncio
+import json
+import smtplib
+import socketserver
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from calendar_ai_agent_web_app.backend.mail_utils.smtp_pool import CONNECT_TIMEOUT, SMTPPool
+
+
+class _StandInHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept mail, for when aiosmtpd isn't installed."""
+
+    disable_nagle_algorithm = True
+
+    def reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self.reply("220 localhost stand-in ESMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors="replace").strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self.reply("250 localhost")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                self.server.received += 1
+                self.reply("250 OK")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                # MAIL / RCPT / NOOP / RSET
+                self.reply("250 OK")
+
+
+class _StandInServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    received = 0
+
+
+def _start_stand_in() -> tuple[int, Callable[[], None]]:
+    try:
+        from aiosmtpd.controller import Controller
+        from aiosmtpd.handlers import Sink
+    except ImportError:
+        server = _StandInServer(("127.0.0.1", 0), _StandInHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server.server_address[1], server.shutdown
+
+    controller = Controller(Sink(), hostname="127.0.0.1", port=0)
+    controller.start()
+    return controller.server.sockets[0].getsockname()[1], controller.stop
+
+
+def benchmark(messages: int = 200, concurrency: int = 8, handshake_ms: float = 0.0) -> dict:
+    """
+    Throughput of connect-per-message (the old send_email) vs. the pool against a local
+    SMTP stand-in. `handshake_ms` adds a delay per new connection to stand in for the
+    TLS + AUTH round trips a real server costs.
+    """
+    port, stop = _start_stand_in()
+    body = "Subject: benchmark\r\n\r\nhello"
+    recipients = ["someone@example.com"]
+
+    def per_message():
+        time.sleep(handshake_ms / 1000)
+        with smtplib.SMTP("127.0.0.1", port, timeout=CONNECT_TIMEOUT) as server:
+            server.sendmail("bench@example.com", recipients, body)
+
+    class _BenchPool(SMTPPool):
+        def _connect(self):
+            time.sleep(handshake_ms / 1000)
+            return super()._connect()
+
+    report = {"messages": messages, "concurrency": concurrency, "handshake_ms": handshake_ms}
+    try:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(lambda _: per_message(), range(messages)))
+        elapsed = time.perf_counter() - started
+        report["connect_per_message"] = {"seconds": elapsed, "messages_per_second": messages / elapsed}
+
+        pool = _BenchPool("127.0.0.1", port, use_ssl=False, max_connections=concurrency,
+                          credentials=lambda: (None, None))
+
+        async def run():
+            await asyncio.gather(*(pool.send_async("bench@example.com", recipients, body) for _ in range(messages)))
+
+        started = time.perf_counter()
+        asyncio.run(run())
+        elapsed = time.perf_counter() - started
+        report["pooled"] = {"seconds": elapsed, "messages_per_second": messages / elapsed, **pool.stats()}
+        pool.close()
+    finally:
+        stop()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pooled SMTP against connect-per-message.")
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--handshake-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    print(json.dumps(benchmark(args.messages, args.concurrency, args.handshake_ms), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+from calendar_ai_agent_web_app.backend.logic.temporal import DEFAULT_TZ, resolve_event_fields, resolve_modify_fields
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORPUS_PATH = os.path.join(BASE_DIR, "temporal_corpus.jsonl")
+
+
+def evaluate_corpus(path: str = CORPUS_PATH) -> dict:
+    """Run the table-driven corpus and report accuracy and per-call latency."""
+    cases = [json.loads(line) for line in open(path) if line.strip()]
+    failures = []
+    elapsed = 0.0
+    for case in cases:
+        now = datetime.fromisoformat(case["now"]).astimezone(DEFAULT_TZ)
+        resolver = resolve_modify_fields if case["kind"] == "modify" else resolve_event_fields
+        started = time.perf_counter()
+        got = resolver(case["text"], now)
+        elapsed += time.perf_counter() - started
+        if got != case["expected"]:
+            failures.append({"text": case["text"], "expected": case["expected"], "got": got})
+
+    return {
+        "cases": len(cases),
+        "passed": len(cases) - len(failures),
+        "latency_us_per_call": elapsed / len(cases) * 1e6 if cases else 0.0,
+        "failures": failures,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the temporal resolver against its corpus.")
+    parser.add_argument("--corpus", default=CORPUS_PATH)
+    args = parser.parse_args()
+    print(json.dumps(evaluate_corpus(args.corpus), indent=2))
+
+
+if __name__ == "__main__":
+    main()
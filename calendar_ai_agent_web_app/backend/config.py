@@ -1,17 +1,123 @@
 # backend/config.py
 from dotenv import load_dotenv
 import os
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI, DefaultAsyncHttpxClient
 from ollama import Client
+import httpx
 
 load_dotenv()
 
+# Directory for the SQLite stores below unless their own *_PATH is set (default: this backend directory)
+data_dir = os.path.abspath(os.getenv("DATA_DIR", os.path.dirname(os.path.abspath(__file__))))
+
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 model = "gpt-4o"
 
+# One async connection pool shared by every OpenAI / LangChain call made from the event loop
+async_http_client = DefaultAsyncHttpxClient(
+    limits=httpx.Limits(
+        max_connections=int(os.getenv("ASYNC_HTTP_MAX_CONNECTIONS", "200")),
+        max_keepalive_connections=int(os.getenv("ASYNC_HTTP_MAX_KEEPALIVE", "50")),
+    ),
+    timeout=httpx.Timeout(60.0, connect=10.0),
+)
+async_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=async_http_client)
+# Threads behind asyncio.to_thread for the blocking Google client and SQLite work; the loop's
+# default (CPU count + 4, at most 32) caps how many requests can wait on Google at once
+blocking_io_workers = int(os.getenv("BLOCKING_IO_WORKERS", "64"))
+
 client_llama = Client(host='http://192.168.50.214:11435')
 model_llama = 'llama3.1:8b'
 
 model_list_event = "ft:gpt-4.1-mini-2025-04-14:personal:list-calendar-model:By8kn4z8"
 
 model_calendar = "ft:gpt-4.1-mini-2025-04-14:personal:is-calendar-event-model:C0isXu9v"
+
+# Local intent classifier (logic/intent_classifier.py); remote classifiers only run below this confidence
+local_classifier_threshold = float(os.getenv("LOCAL_CLASSIFIER_THRESHOLD", "0.9"))
+
+# Let the LLM judge list results only when specific keywords matched nothing structurally
+llm_filter_rerank = os.getenv("LLM_FILTER_RERANK", "false").lower() == "true"
+
+# Local SQLite mirror of the primary calendar (logic/calendar_mirror.py)
+calendar_mirror_path = os.getenv("CALENDAR_MIRROR_PATH", os.path.join(data_dir, "calendar_mirror.db"))
+calendar_mirror_max_staleness = float(os.getenv("CALENDAR_MIRROR_MAX_STALENESS", "60"))
+# Recurring series are stored once and expanded locally: how many (series, days) expansions to keep cached
+recurrence_cache_size = int(os.getenv("RECURRENCE_CACHE_SIZE", "4096"))
+# Days ahead (from yesterday) the in-memory conflict index covers; checks further out query the mirror
+conflict_index_days = int(os.getenv("CONFLICT_INDEX_DAYS", "92"))
+
+# Token budget per LLM filter prompt; larger event windows are split and filtered concurrently
+llm_filter_token_budget = int(os.getenv("LLM_FILTER_TOKEN_BUDGET", "4000"))
+
+# Conversation memory (agents/memory.py): recent messages sent verbatim, and how many
+# older messages accumulate before they are folded into the rolling summary
+memory_window_messages = int(os.getenv("MEMORY_WINDOW_MESSAGES", "20"))
+memory_summary_batch = int(os.getenv("MEMORY_SUMMARY_BATCH", "10"))
+
+# In-process LRU of chat sessions (agents/session_cache.py)
+session_cache_max_bytes = int(os.getenv("SESSION_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+session_flush_interval = float(os.getenv("SESSION_FLUSH_INTERVAL", "2"))
+
+# Skip the LangGraph enrichment turn for inputs that don't refer back to the conversation
+context_bypass_enabled = os.getenv("CONTEXT_BYPASS_ENABLED", "true").lower() == "true"
+# Short follow-ups within this many seconds of the last turn are treated as context-dependent
+context_recency_seconds = float(os.getenv("CONTEXT_RECENCY_SECONDS", "300"))
+
+# "multi_stage" (extract, then parse) or "single_shot" (one classify + parse call, see logic/single_shot.py)
+pipeline_mode = os.getenv("PIPELINE_MODE", "multi_stage")
+
+# Remote classify/parse overlap (services/speculative.py), opt-in since it spends tokens on
+# calls that may be thrown away: 0 serial, 1 concurrent classifiers when the local guess doesn't
+# rule out a list query, 2 also start the parser for the local classifier's best guess
+speculation_level = int(os.getenv("SPECULATION_LEVEL", "0"))
+
+# Response cache for the classifier / list-filter LLM calls (logic/llm_cache.py);
+# LLM_CACHE_PATH enables the SQLite tier that survives restarts, capped at LLM_CACHE_DISK_SIZE rows
+llm_cache_enabled = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+llm_cache_size = int(os.getenv("LLM_CACHE_SIZE", "2048"))
+llm_cache_ttl = float(os.getenv("LLM_CACHE_TTL", str(6 * 60 * 60)))
+llm_cache_path = os.getenv("LLM_CACHE_PATH", "")
+llm_cache_disk_size = int(os.getenv("LLM_CACHE_DISK_SIZE", "50000"))
+
+# Confirmation text (logic/confirmation.py): "template" renders instantly, "polish" also asks
+# the LLM and uses its text if it arrives within the deadline, "llm" always waits for the LLM
+confirmation_mode = os.getenv("CONFIRMATION_MODE", "template")
+confirmation_polish_deadline = float(os.getenv("CONFIRMATION_POLISH_DEADLINE", "1.5"))
+
+# Durable background jobs for calendar writes + confirmations (tasks/job_queue.py)
+job_queue_path = os.getenv("JOB_QUEUE_PATH", os.path.join(data_dir, "job_queue.db"))
+job_workers = int(os.getenv("JOB_WORKERS", "4"))
+job_max_attempts = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+job_retry_backoff = float(os.getenv("JOB_RETRY_BACKOFF", "2"))
+
+# Pooled SMTP sender (mail_utils/smtp_pool.py)
+smtp_host = os.getenv("SMTP_HOST", "smtp.gmail.com")
+smtp_port = int(os.getenv("SMTP_PORT", "465"))
+smtp_use_ssl = os.getenv("SMTP_USE_SSL", "true").lower() == "true"
+smtp_pool_size = int(os.getenv("SMTP_POOL_SIZE", "4"))
+smtp_idle_timeout = float(os.getenv("SMTP_IDLE_TIMEOUT", "60"))
+smtp_max_messages_per_connection = int(os.getenv("SMTP_MAX_MESSAGES_PER_CONNECTION", "100"))
+
+# Durable email outbox (mail_utils/outbox.py); retries back off from OUTBOX_RETRY_BACKOFF seconds
+outbox_path = os.getenv("OUTBOX_PATH", os.path.join(data_dir, "outbox.db"))
+outbox_max_attempts = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "6"))
+outbox_retry_backoff = float(os.getenv("OUTBOX_RETRY_BACKOFF", "5"))
+
+# /process_batch (services/batch.py): items parsed at once, and inserts per Calendar batch request
+batch_max_items = int(os.getenv("BATCH_MAX_ITEMS", "100"))
+batch_parse_concurrency = int(os.getenv("BATCH_PARSE_CONCURRENCY", "8"))
+calendar_batch_size = int(os.getenv("CALENDAR_BATCH_SIZE", "50"))
+
+# Bulk .ics / .csv import (tasks/calendar_import.py): Calendar inserts per second, 0 for no limit.
+# Google's default quota is 600 requests per minute per user, and every part of a batch counts
+calendar_import_rate = float(os.getenv("CALENDAR_IMPORT_RATE", "10"))
+
+# "Find a time" (logic/scheduler.py): bitmap resolution, working hours in America/Los_Angeles
+# (WORKING_DAYS uses Monday = 0), default search horizon and how many slots to suggest
+scheduler_resolution_minutes = int(os.getenv("SCHEDULER_RESOLUTION_MINUTES", "5"))
+working_hours_start = int(os.getenv("WORKING_HOURS_START", "9"))
+working_hours_end = int(os.getenv("WORKING_HOURS_END", "17"))
+working_days = tuple(int(day) for day in os.getenv("WORKING_DAYS", "0,1,2,3,4").split(","))
+scheduler_horizon_days = int(os.getenv("SCHEDULER_HORIZON_DAYS", "7"))
+scheduler_max_slots = int(os.getenv("SCHEDULER_MAX_SLOTS", "5"))
@@ -1,4 +1,6 @@
-from .extractor import extract_event_info, extract_list_event_info
-from .parser import parse_calendar_event_details, parse_calendar_modify_details
+from .extractor import extract_event_info_async, extract_list_event_info_async
+from .parser import parse_calendar_event_details_async, parse_calendar_modify_details_async
 from .confirmation import generate_confirmation, generate_modify_confirmation, generate_matched_calendar_events_message
-from .calendar import add_calendar_event, update_calendar_event, get_calendar_events
+from .confirmation import generate_confirmation_async, generate_modify_confirmation_async, generate_matched_calendar_events_message_async
+from .calendar import add_calendar_event, update_calendar_event
+from .calendar import add_calendar_event_async, update_calendar_event_async, get_calendar_events_async
@@ -1,199 +1,194 @@
+import asyncio
+import time
 from datetime import datetime, timedelta
 import os
 from calendar_ai_agent_web_app.backend.utils.logger import logger
-from calendar_ai_agent_web_app.backend.schemas.models import EventDetails, EventUpdateDetails, ListCalendarEventsFilters, ListedEvents, CalendarEvent
-from calendar_ai_agent_web_app.backend.constants import SCOPES
+from calendar_ai_agent_web_app.backend.utils.metrics import instrumented
+from calendar_ai_agent_web_app.backend.schemas.models import EventDetails, EventUpdateDetails, ListCalendarEventsFilters, ListedEvents, CalendarEvent, FilteredEventRows
 import os.path
 from zoneinfo import ZoneInfo  # built-in in Python 3.9+
 from typing import Optional
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from calendar_ai_agent_web_app.backend.config import client, model
+from calendar_ai_agent_web_app.backend.logic.calendar_service import get_calendar_service, EVENT_FIELDS
+from calendar_ai_agent_web_app.backend.logic.calendar_mirror import calendar_mirror
+from calendar_ai_agent_web_app.backend.logic.llm import parse_completion_async
+from calendar_ai_agent_web_app.backend.logic.event_filter import (
+    IndexedEvent, filter_events, index_events, select_events, specific_keywords, to_calendar_event
+)
+from calendar_ai_agent_web_app.backend.logic.event_encoding import EVENT_HEADER, encode_events, chunk_rows, record_savings
+from calendar_ai_agent_web_app.backend.config import llm_filter_rerank, llm_filter_token_budget
+
+def event_window(event_details: EventDetails) -> tuple[datetime, datetime]:
+    start_dt = datetime.fromisoformat(event_details.date).replace(tzinfo=ZoneInfo("America/Los_Angeles"))  # or your actual timezone
+    return start_dt, start_dt + timedelta(minutes=event_details.duration_minutes)
+
+def event_body(event_details: EventDetails, emails: list[str]) -> dict:
+    start_dt, end_dt = event_window(event_details)
+
+    return {
+        "summary": event_details.name,
+        "location": event_details.location,
+        "description": event_details.description,
+        "colorId": 5,
+        "start": {
+            "dateTime": start_dt.isoformat(),
+            "timeZone": "America/Los_Angeles"
 
-def add_calendar_event(event_details: EventDetails, emails: list[str]) -> str:
-    logger.info("Adding event to Google Calendar")
+        },
+        "end": {
+            "dateTime": end_dt.isoformat(),
+            "timeZone": "America/Los_Angeles"
 
-    creds = None
+        },
+        "attendees": [{"email": email} for email in emails],
+        "reminders": {
+          "useDefault": True,
+        },
+    }
 
-    if os.path.exists("token.json"):
-        creds = Credentials.from_authorized_user_file("token.json")
+@instrumented("calendar_insert")
+def insert_calendar_event(event_details: EventDetails, emails: list[str], event_id: Optional[str] = None) -> str:
+    """Insert the event and return its link; API errors propagate, for callers that retry them."""
+    logger.info("Adding event to Google Calendar")
+    service = get_calendar_service()
 
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            CREDENTIALS_PATH = os.path.join(BASE_DIR, "credentials2.json")
+    start_dt, end_dt = event_window(event_details)
+    event = event_body(event_details, emails)
 
-            flow = InstalledAppFlow.from_client_secrets_file(CREDENTIALS_PATH, SCOPES)
-            creds = flow.run_console()
-        with open("token.json", "w") as token:
-            token.write(creds.to_json())
+    if event_id:
+        # A caller-chosen id makes retried inserts idempotent: the duplicate comes back as 409
+        event["id"] = event_id
 
     try:
-        service = build("calendar", "v3", credentials=creds)
-
-        start_time = event_details.date
-        duration = event_details.duration_minutes
-
-        start_dt = datetime.fromisoformat(start_time).replace(tzinfo=ZoneInfo("America/Los_Angeles"))  # or your actual timezone
-        end_dt = start_dt + timedelta(minutes=duration)
-
-        event = {
-            "summary": event_details.name,
-            "location": event_details.location,
-            "description": event_details.description,
-            "colorId": 5,
-            "start": {
-                "dateTime": start_dt.isoformat(),
-                "timeZone": "America/Los_Angeles"
-
-            },
-            "end": {
-                "dateTime": end_dt.isoformat(),
-                "timeZone": "America/Los_Angeles"
-
-            },
-            "attendees": [{"email": email} for email in emails],
-            "reminders": {
-              "useDefault": True,
-            },
-        }
-
-        event = service.events().insert(calendarId="primary", body=event).execute()
-
-        print("Start datetime:", start_dt.isoformat())
-        print("End datetime:", end_dt.isoformat())
+        event = service.events().insert(calendarId="primary", body=event, fields=EVENT_FIELDS).execute()
+    except HttpError as error:
+        if not event_id or error.resp.status != 409:
+            raise
+        logger.info(f"Event {event_id} was already inserted; reusing it")
+        event = service.events().get(calendarId="primary", eventId=event_id, fields=EVENT_FIELDS).execute()
+    calendar_mirror.upsert(event)
 
-        print(f"Event created {event.get('htmlLink')}")
-        return event.get('htmlLink')
+    logger.debug(f"Event window {start_dt.isoformat()} - {end_dt.isoformat()}")
+    logger.info(f"Event created {event.get('htmlLink')}")
+    return event.get('htmlLink')
 
+def add_calendar_event(event_details: EventDetails, emails: list[str], event_id: Optional[str] = None) -> str:
+    try:
+        return insert_calendar_event(event_details, emails, event_id)
     except HttpError as error:
-        print("An error occurred:", error)
-
-def update_calendar_event(event_details: EventUpdateDetails, emails: list[str]) -> str:
-    logger.info("Updating event in Google Calendar")
+        logger.error(f"An error occurred during event insert: {error}")
 
-    creds = None
-    if os.path.exists("token.json"):
-        creds = Credentials.from_authorized_user_file("token.json")
-
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            CREDENTIALS_PATH = os.path.join(BASE_DIR, "credentials2.json")
-            flow = InstalledAppFlow.from_client_secrets_file(CREDENTIALS_PATH, SCOPES)
-            creds = flow.run_console()
-        with open("token.json", "w") as token:
-            token.write(creds.to_json())
+async def add_calendar_event_async(event_details: EventDetails, emails: list[str], event_id: Optional[str] = None) -> str:
+    return await asyncio.to_thread(add_calendar_event, event_details, emails, event_id)
 
-    try:
-        service = build("calendar", "v3", credentials=creds)
+@instrumented("calendar_update")
+def patch_calendar_event(event_details: EventUpdateDetails, emails: list[str]) -> str:
+    """
+    Move the event found at `original_date` and return its link, or "" when there is no such
+    event. API errors propagate, for callers that retry them.
+    """
+    logger.info("Updating event in Google Calendar")
 
-        if not event_details.original_date:
-            logger.error("Missing original_date — cannot find existing event to update.")
-            return ""
+    service = get_calendar_service()
 
-        original_start_dt = datetime.fromisoformat(event_details.original_date)
-        original_end_dt = original_start_dt + timedelta(minutes=event_details.duration_minutes)
+    if not event_details.original_date:
+        logger.error("Missing original_date — cannot find existing event to update.")
+        return ""
 
-        new_start_dt = datetime.fromisoformat(event_details.new_date)
-        new_end_dt = new_start_dt + timedelta(minutes=event_details.duration_minutes)
+    original_start_dt = datetime.fromisoformat(event_details.original_date)
+    original_end_dt = original_start_dt + timedelta(minutes=event_details.duration_minutes)
 
-        time_min = original_start_dt - timedelta(minutes=10)
-        time_max = original_end_dt + timedelta(minutes=10)
+    new_start_dt = datetime.fromisoformat(event_details.new_date)
+    new_end_dt = new_start_dt + timedelta(minutes=event_details.duration_minutes)
 
-        logger.info(f"Searching for events between {time_min} and {time_max}")
+    time_min = original_start_dt - timedelta(minutes=10)
+    time_max = original_end_dt + timedelta(minutes=10)
 
-        events_result = service.events().list(
-            calendarId="primary",
-            timeMin=time_min.astimezone().isoformat(),
-            timeMax=time_max.astimezone().isoformat(),
-            singleEvents=True,
-            orderBy="startTime"
-        ).execute()
+    logger.info(f"Searching for events between {time_min} and {time_max}")
 
-        events = events_result.get("items", [])
-        if not events:
-            logger.warning("No matching event found to update.")
-            return ""
+    calendar_mirror.ensure_fresh()
+    events = calendar_mirror.query(time_min.astimezone(), time_max.astimezone())
+    if not events:
+        logger.warning("No matching event found to update.")
+        return ""
 
-        event = events[0]
-        event_id = event["id"]
+    event_id = events[0]["id"]
 
-        # Update event details
-        event["summary"] = event_details.name
-        event["location"] = event_details.location
-        event["description"] = event_details.description
-        event["start"] = {
+    # Only send the fields we change; patch leaves the rest of the event untouched
+    changes = {
+        "summary": event_details.name,
+        "location": event_details.location,
+        "description": event_details.description,
+        "start": {
             "dateTime": new_start_dt.isoformat(),
             "timeZone": "America/Los_Angeles"
-        }
-        event["end"] = {
+        },
+        "end": {
             "dateTime": new_end_dt.isoformat(),
             "timeZone": "America/Los_Angeles"
-        }
-        event["attendees"] = [{"email": email} for email in emails]
-        event["reminders"] = {"useDefault": True}
+        },
+        "attendees": [{"email": email} for email in emails],
+        "reminders": {"useDefault": True},
+    }
 
-        updated_event = service.events().update(
-            calendarId="primary", eventId=event_id, body=event
-        ).execute()
+    updated_event = service.events().patch(
+        calendarId="primary", eventId=event_id, body=changes, fields=EVENT_FIELDS
+    ).execute()
+    calendar_mirror.upsert(updated_event)
 
-        logger.info(f"Event updated: {updated_event.get('htmlLink')}")
-        return updated_event.get("htmlLink")
+    logger.info(f"Event updated: {updated_event.get('htmlLink')}")
+    return updated_event.get("htmlLink")
 
+def update_calendar_event(event_details: EventUpdateDetails, emails: list[str]) -> str:
+    try:
+        return patch_calendar_event(event_details, emails)
     except HttpError as error:
         logger.error(f"An error occurred during event update: {error}")
         return ""
 
-def get_calendar_events(filters: ListCalendarEventsFilters) -> ListedEvents:
-    logger.info("Fetching events from Google Calendar")
+async def update_calendar_event_async(event_details: EventUpdateDetails, emails: list[str]) -> str:
+    return await asyncio.to_thread(update_calendar_event, event_details, emails)
 
-    creds = None
-    if os.path.exists("token.json"):
-        creds = Credentials.from_authorized_user_file("token.json")
-
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            CREDENTIALS_PATH = os.path.join(BASE_DIR, "credentials2.json")
-            flow = InstalledAppFlow.from_client_secrets_file(CREDENTIALS_PATH, SCOPES)
-            creds = flow.run_console()
-        with open("token.json", "w") as token:
-            token.write(creds.to_json())
+def _fetch_window_events(filters: ListCalendarEventsFilters) -> list[dict]:
+    # Default time window: today to 1 week later if not specified
+    start_time = filters.start_time or datetime.now().astimezone()
+    end_time = filters.end_time or (start_time + timedelta(days=7))
 
-    try:
-        service = build("calendar", "v3", credentials=creds)
+    logger.info(f"Querying events from {start_time} to {end_time}")
 
-        # Default time window: today to 1 week later if not specified
-        start_time = filters.start_time or datetime.now().astimezone()
-        end_time = filters.end_time or (start_time + timedelta(days=7))
+    calendar_mirror.ensure_fresh()
+    events = calendar_mirror.query(start_time, end_time)
+    logger.info(f"Found {len(events)} events")
 
-        logger.info(f"Querying events from {start_time} to {end_time}")
+    return events
 
-        events_result = service.events().list(
-            calendarId="primary",
-            timeMin=start_time.isoformat(),
-            timeMax=end_time.isoformat(),
-            singleEvents=True,
-            orderBy="startTime"
-        ).execute()
+def _filter_structured(events: list[dict], filters: ListCalendarEventsFilters) -> ListedEvents:
+    started = time.perf_counter()
+    matched = filter_events(events, filters)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info(f"Structured filter kept {len(matched.matched_events)}/{len(events)} events in {elapsed_ms:.2f}ms")
+    return matched
 
-        events = events_result.get("items", [])
-        logger.info(f"Found {len(events)} events")
-        print(events)
+def _needs_rerank(matched: ListedEvents, filters: ListCalendarEventsFilters) -> bool:
+    # Keywords can be paraphrases ("sync" for "standup"); only then is the LLM worth asking
+    return llm_filter_rerank and not matched.matched_events and bool(specific_keywords(filters))
 
-        matched = filter_events_with_llm(events, filters)
+def _rerank_candidates(events: list[dict], filters: ListCalendarEventsFilters) -> list[dict]:
+    return [event.raw for event in select_events(index_events(events), filters, apply_keywords=False)]
 
-        print(matched)
+@instrumented("calendar_list")
+async def get_calendar_events_async(filters: ListCalendarEventsFilters) -> ListedEvents:
+    logger.info("Fetching events from Google Calendar")
+
+    try:
+        # The Google client is blocking, so keep it off the event loop
+        events = await asyncio.to_thread(_fetch_window_events, filters)
+
+        matched = _filter_structured(events, filters)
+        if _needs_rerank(matched, filters):
+            matched = await filter_events_with_llm_async(_rerank_candidates(events, filters), filters)
+
+        logger.debug(f"Matched events: {matched}")
 
         return matched
 
@@ -201,31 +196,45 @@ def get_calendar_events(filters: ListCalendarEventsFilters) -> ListedEvents:
         logger.error(f"Error fetching events: {error}")
         return ListedEvents(query_summary=filters.description, matched_events=[])
 
-def filter_events_with_llm(events: list[dict], filters: ListCalendarEventsFilters) -> Optional[ListedEvents]:
+def _filter_events_messages(rows: list[str], filters: ListCalendarEventsFilters) -> list[dict]:
+    system_prompt = (
+        "You are a helpful assistant that filters calendar events based on a user's intent. "
+        "Events are given one per line as pipe-separated columns under a header row. "
+        "Return the row numbers of the events that match the user's filter. No explanations."
+    )
+
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": f"User's filter: {filters.model_dump()}"},
+        {"role": "user", "content": "Events to filter:\n" + EVENT_HEADER + "\n" + "\n".join(rows)},
+    ]
+
+def _encode_for_filter(events: list[dict]) -> tuple[list[IndexedEvent], list[list[str]]]:
+    indexed, rows = encode_events(events)
+    chunks = chunk_rows(rows, llm_filter_token_budget)
+    record_savings(events, chunks)
+    return indexed, chunks
+
+def _merge_filtered(indexed: list[IndexedEvent], results: list, filters: ListCalendarEventsFilters) -> ListedEvents:
+    rows = set()
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error(f"LLM filtering failed for one chunk: {result}")
+            continue
+        rows.update(row for row in result.matched_rows if 0 <= row < len(indexed))
+
+    return ListedEvents(
+        query_summary=filters.description,
+        matched_events=[to_calendar_event(indexed[row]) for row in sorted(rows)],
+    )
+
+async def filter_events_with_llm_async(events: list[dict], filters: ListCalendarEventsFilters) -> ListedEvents:
     logger.info("Filtering events using LLM")
 
-    try:
-        system_prompt = (
-            "You are a helpful assistant that filters calendar events based on a user's intent. "
-            "Return only the list of events that match the user's filter as a JSON list. "
-            "Use exact structure of the input events. No explanations."
-        )
-
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": f"User's filter: {filters.model_dump()}"},
-            {"role": "user", "content": f"Events to filter: {events}"},
-        ]
-
-        response = client.beta.chat.completions.parse(
-            model=model,
-            messages=messages,
-            response_format=ListedEvents,
-        )
-
-        parsed_events = response.choices[0].message.parsed
-        return parsed_events
-
-    except Exception as e:
-        logger.exception("LLM filtering failed")
-        return []
\ No newline at end of file
+    indexed, chunks = _encode_for_filter(events)
+    results = await asyncio.gather(
+        *(parse_completion_async(_filter_events_messages(rows, filters), FilteredEventRows) for rows in chunks),
+        return_exceptions=True,
+    )
+
+    return _merge_filtered(indexed, results, filters)
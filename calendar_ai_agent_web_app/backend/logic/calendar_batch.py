@@ -0,0 +1,108 @@
+import asyncio
+import time
+from typing import Optional
+from googleapiclient.errors import HttpError
+from calendar_ai_agent_web_app.backend.logic.calendar import event_body
+from calendar_ai_agent_web_app.backend.logic.calendar_service import (
+    get_calendar_service, calendar_service_manager, EVENT_FIELDS
+)
+from calendar_ai_agent_web_app.backend.logic.calendar_mirror import CalendarMirror, calendar_mirror
+from calendar_ai_agent_web_app.backend.schemas.models import EventDetails
+from calendar_ai_agent_web_app.backend.config import calendar_batch_size
+from calendar_ai_agent_web_app.backend.utils.logger import logger
+from calendar_ai_agent_web_app.backend.utils.metrics import instrumented
+
+# Seconds to wait before resending the inserts a batch had rate-limited; doubles per retry
+RATE_LIMIT_RETRY_SECONDS = 1.0
+
+
+def _is_rate_limited(error: HttpError) -> bool:
+    # Rate-limited parts were never executed, so resending them can't duplicate an event
+    status = error.resp.status
+    return status == 429 or (status == 403 and b"ratelimitexceeded" in (error.content or b"").lower())
+
+
+def _execute_batch(service, bodies: dict[str, dict], results: dict[str, tuple[Optional[str], Optional[str]]],
+                   mirror: CalendarMirror) -> list[str]:
+    """One batch HTTP request for `bodies`; fills `results` and returns the rate-limited ids."""
+    rate_limited = []
+    inserted = []
+
+    def on_response(request_id, event, error):
+        if error is None:
+            inserted.append(event)
+            results[request_id] = (event.get("htmlLink"), None)
+        elif isinstance(error, HttpError) and _is_rate_limited(error):
+            rate_limited.append(request_id)
+        elif isinstance(error, HttpError) and error.resp.status == 409 and "id" in bodies[request_id]:
+            # Our own id already exists: an earlier, interrupted run inserted it
+            calendar_service_manager._count("batch_item_duplicates")
+            results[request_id] = (None, None)
+        else:
+            calendar_service_manager._count("batch_item_errors")
+            results[request_id] = (None, str(error))
+
+    # Building the events() resource walks the discovery doc, so do it once per batch
+    events = service.events()
+    batch = service.new_batch_http_request(callback=on_response)
+    for request_id, body in bodies.items():
+        batch.add(events.insert(calendarId="primary", body=body, fields=EVENT_FIELDS),
+                  request_id=request_id)
+
+    started = time.perf_counter()
+    try:
+        batch.execute()
+    except HttpError as error:
+        # The batch request itself failed, so none of its parts ran
+        logger.error(f"Calendar batch request failed: {error}")
+        for request_id in bodies:
+            results.setdefault(request_id, (None, str(error)))
+        return []
+    finally:
+        calendar_service_manager._count("batch_requests")
+        calendar_service_manager._count("batch_items", len(bodies))
+        calendar_service_manager._count("batch_seconds", time.perf_counter() - started)
+    mirror.upsert_many(inserted)
+    return rate_limited
+
+
+def insert_events_batch(bodies: list[dict], service=None, mirror: CalendarMirror = calendar_mirror,
+                        retries: int = 1) -> list[tuple[Optional[str], Optional[str]]]:
+    """
+    events.insert for every body, up to CALENDAR_BATCH_SIZE per batch HTTP request.
+    Returns (htmlLink, None) or (None, error) for each body, in order. A body that carries
+    its own "id" which already exists comes back as (None, None), so reruns are idempotent.
+    Rate-limited inserts are resent up to `retries` times with exponential backoff.
+    """
+    service = service or get_calendar_service()
+    keyed = {str(index): body for index, body in enumerate(bodies)}
+    results: dict[str, tuple[Optional[str], Optional[str]]] = {}
+
+    pending = list(keyed)
+    for attempt in range(retries + 1):
+        retry = []
+        for offset in range(0, len(pending), calendar_batch_size):
+            chunk = pending[offset:offset + calendar_batch_size]
+            retry += _execute_batch(service, {request_id: keyed[request_id] for request_id in chunk}, results, mirror)
+        pending = retry
+        if not pending or attempt == retries:
+            break
+        delay = RATE_LIMIT_RETRY_SECONDS * 2 ** attempt
+        logger.warning(f"{len(pending)} batched inserts were rate limited; retrying in {delay:.0f}s")
+        time.sleep(delay)
+
+    for request_id in pending:
+        results.setdefault(request_id, (None, "Rate limit exceeded"))
+    return [results[str(index)] for index in range(len(bodies))]
+
+
+@instrumented("calendar_batch_insert")
+def add_calendar_events_batch(items: list[tuple[EventDetails, list[str]]], service=None,
+                              mirror: CalendarMirror = calendar_mirror) -> list[tuple[Optional[str], Optional[str]]]:
+    """Batched add_calendar_event: (htmlLink, None) or (None, error) for each item, in order."""
+    logger.info(f"Adding {len(items)} events to Google Calendar in batches of {calendar_batch_size}")
+    return insert_events_batch([event_body(details, emails) for details, emails in items], service, mirror)
+
+
+async def add_calendar_events_batch_async(items: list[tuple[EventDetails, list[str]]]) -> list[tuple[Optional[str], Optional[str]]]:
+    return await asyncio.to_thread(add_calendar_events_batch, items)
@@ -0,0 +1,426 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from datetime import datetime, timedelta
+from typing import Optional
+from googleapiclient.errors import HttpError
+from calendar_ai_agent_web_app.backend.logic.calendar_service import get_calendar_service, iter_event_pages
+from calendar_ai_agent_web_app.backend.logic.event_filter import IndexedEvent
+from calendar_ai_agent_web_app.backend.logic.recurrence import Series, is_recurring_master, series_id_of
+from calendar_ai_agent_web_app.backend.logic.temporal import DEFAULT_TZ
+from calendar_ai_agent_web_app.backend.utils.logger import logger
+from calendar_ai_agent_web_app.backend.config import (
+    calendar_mirror_path, calendar_mirror_max_staleness, recurrence_cache_size
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    calendar_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    start_ts REAL NOT NULL,
+    end_ts REAL NOT NULL,
+    updated TEXT,
+    body TEXT NOT NULL,
+    PRIMARY KEY (calendar_id, id)
+);
+CREATE INDEX IF NOT EXISTS events_by_start ON events (calendar_id, start_ts);
+CREATE TABLE IF NOT EXISTS series (
+    calendar_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    start_ts REAL NOT NULL,
+    until_ts REAL,
+    updated TEXT,
+    body TEXT NOT NULL,
+    PRIMARY KEY (calendar_id, id)
+);
+CREATE TABLE IF NOT EXISTS instance_overrides (
+    calendar_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    series_id TEXT NOT NULL,
+    PRIMARY KEY (calendar_id, id)
+);
+CREATE INDEX IF NOT EXISTS overrides_by_series ON instance_overrides (calendar_id, series_id);
+CREATE TABLE IF NOT EXISTS sync_state (
+    calendar_id TEXT PRIMARY KEY,
+    sync_token TEXT,
+    last_synced_at REAL,
+    last_full_sync_at REAL
+);
+"""
+
+# Format 1 stored Google's singleEvents expansion; its rows and sync tokens can't be mixed with master events
+MIRROR_FORMAT = 2
+
+# How many recent versions changes_since can replay, and the most one-off changes one version may log
+_CHANGELOG_VERSIONS = 64
+_CHANGELOG_MAX_EVENTS = 256
+
+
+def _day_span(time_min: datetime, time_max: datetime) -> tuple[datetime, datetime]:
+    """Local midnights on or before `time_min` and on or after `time_max`."""
+    start = time_min.astimezone(DEFAULT_TZ).replace(hour=0, minute=0, second=0, microsecond=0)
+    end = time_max.astimezone(DEFAULT_TZ)
+    midnight = end.replace(hour=0, minute=0, second=0, microsecond=0)
+    return start, midnight if midnight == end else midnight + timedelta(days=1)
+
+
+class CalendarMirror:
+    """
+    Local SQLite copy of a Google calendar, kept current with syncToken-based
+    incremental sync. Reads are served from the mirror once it is no older than
+    `max_staleness` seconds; our own inserts and updates are written through.
+    A 410 Gone on the sync token drops the mirror and does a full resync.
+
+    Recurring series are synced as master events (RRULE / EXDATE) rather than one row per
+    occurrence. Reads expand them over just the requested window, skipping occurrences that
+    were moved or cancelled, so callers see the same instances singleEvents=True returns.
+    """
+
+    def __init__(self, path: str = calendar_mirror_path, calendar_id: str = "primary",
+                 max_staleness: float = calendar_mirror_max_staleness):
+        self.path = path
+        self.calendar_id = calendar_id
+        self.max_staleness = max_staleness
+
+        # Opened on first use, so importing the module doesn't create the file
+        self._connection: Optional[sqlite3.Connection] = None
+        self._open_lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+
+        # Parsed series and their expansions over whole local days, keyed by the series' `updated` so edits miss
+        self._cache_lock = threading.Lock()
+        self._series_cache: OrderedDict = OrderedDict()
+        self._expansion_cache: OrderedDict = OrderedDict()
+
+        self._stats = Counter()
+        self._last_sync_duration = 0.0
+        # Bumped only when rows actually change. Each bump is logged with the one-off events it
+        # wrote or deleted (None when a series changed), so derived indexes can catch up in place
+        self.version = 0
+        self._changelog: deque = deque(maxlen=_CHANGELOG_VERSIONS)
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        if self._connection is None:
+            with self._open_lock:
+                if self._connection is None:
+                    conn = sqlite3.connect(self.path, check_same_thread=False)
+                    conn.executescript(_SCHEMA)
+                    self._upgrade(conn)
+                    self._connection = conn
+        return self._connection
+
+    @staticmethod
+    def _upgrade(conn: sqlite3.Connection) -> None:
+        (fmt,) = conn.execute("PRAGMA user_version").fetchone()
+        if fmt >= MIRROR_FORMAT:
+            return
+        with conn:
+            # Dropping the sync tokens makes the next sync a full one in the new format
+            conn.execute("DELETE FROM events")
+            outdated = conn.execute("DELETE FROM sync_state").rowcount
+            conn.execute(f"PRAGMA user_version = {MIRROR_FORMAT}")
+        if outdated:
+            logger.info("Calendar mirror predates local recurrence expansion; it will be rebuilt on the next sync")
+
+    # ----------------------------- Sync state -----------------------------
+    def _state(self) -> tuple[Optional[str], Optional[float]]:
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT sync_token, last_synced_at FROM sync_state WHERE calendar_id = ?", (self.calendar_id,)
+            ).fetchone()
+        return (row[0], row[1]) if row else (None, None)
+
+    def staleness_seconds(self) -> Optional[float]:
+        _, last_synced_at = self._state()
+        return time.time() - last_synced_at if last_synced_at else None
+
+    def _save_state(self, sync_token: str, full: bool) -> None:
+        now = time.time()
+        with self._db_lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO sync_state (calendar_id, sync_token, last_synced_at, last_full_sync_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(calendar_id) DO UPDATE SET sync_token = excluded.sync_token, "
+                "last_synced_at = excluded.last_synced_at, "
+                "last_full_sync_at = COALESCE(excluded.last_full_sync_at, sync_state.last_full_sync_at)",
+                (self.calendar_id, sync_token, now, now if full else None),
+            )
+
+    # ----------------------------- Writes -----------------------------
+    # Each helper reports whether it changed anything, so a no-op page doesn't bump the version
+    def _stored_body(self, table: str, event_id: str) -> Optional[str]:
+        row = self._conn.execute(
+            f"SELECT body FROM {table} WHERE calendar_id = ? AND id = ?", (self.calendar_id, event_id)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _delete_event(self, event_id: str) -> bool:
+        return self._conn.execute(
+            "DELETE FROM events WHERE calendar_id = ? AND id = ?", (self.calendar_id, event_id)
+        ).rowcount > 0
+
+    def _set_override(self, instance_id: str, series_id: str) -> bool:
+        return self._conn.execute(
+            "INSERT OR IGNORE INTO instance_overrides (calendar_id, id, series_id) VALUES (?, ?, ?)",
+            (self.calendar_id, instance_id, series_id),
+        ).rowcount > 0
+
+    def _forget_series(self, series_id: str) -> bool:
+        # Moved occurrences go with their series
+        deleted = self._conn.execute(
+            "DELETE FROM events WHERE calendar_id = ? AND id IN "
+            "(SELECT id FROM instance_overrides WHERE calendar_id = ? AND series_id = ?)",
+            (self.calendar_id, self.calendar_id, series_id),
+        ).rowcount
+        deleted += self._conn.execute(
+            "DELETE FROM series WHERE calendar_id = ? AND id = ?", (self.calendar_id, series_id)
+        ).rowcount
+        deleted += self._conn.execute(
+            "DELETE FROM instance_overrides WHERE calendar_id = ? AND series_id = ?", (self.calendar_id, series_id)
+        ).rowcount
+        return deleted > 0
+
+    def _apply_series(self, event: dict) -> Optional[bool]:
+        """Store a recurring master; None if its recurrence can't be expanded."""
+        try:
+            series = Series(event)
+        except ValueError as error:
+            # Keep it as a one-off at its first start rather than dropping it
+            logger.warning(f"Can't expand recurrence of event {event['id']}: {error}")
+            return None
+        body = json.dumps(event)
+        if self._stored_body("series", event["id"]) == body:
+            return False
+        self._delete_event(event["id"])
+        self._conn.execute(
+            "INSERT OR REPLACE INTO series (calendar_id, id, start_ts, until_ts, updated, body) VALUES (?, ?, ?, ?, ?, ?)",
+            (self.calendar_id, event["id"], series.timestamp(series.start), series.last_end(),
+             event.get("updated"), body),
+        )
+        return True
+
+    def _apply(self, events: list[dict]) -> None:
+        # One-off rows written (event) or deleted (None), and whether any series' expansion changed
+        changed: dict[str, Optional[dict]] = {}
+        series_changed = False
+        with self._db_lock, self._conn:
+            for event in events:
+                series_id = series_id_of(event)
+                if event.get("status") == "cancelled":
+                    if self._delete_event(event["id"]):
+                        changed[event["id"]] = None
+                    if series_id:
+                        # One occurrence deleted: remembered so expansion leaves it out
+                        series_changed |= self._set_override(event["id"], series_id)
+                    else:
+                        series_changed |= self._forget_series(event["id"])
+                    continue
+                if is_recurring_master(event):
+                    stored = self._apply_series(event)
+                    if stored is not None:
+                        series_changed |= stored
+                        continue
+                indexed = IndexedEvent(event)
+                if indexed.start is None:
+                    continue
+                if series_id:
+                    # A moved or edited occurrence is stored as it is now and replaces the generated one
+                    series_changed |= self._set_override(event["id"], series_id)
+                else:
+                    # A series that stopped repeating keeps its id
+                    series_changed |= self._forget_series(event["id"])
+                body = json.dumps(event)
+                if self._stored_body("events", event["id"]) == body:
+                    continue
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO events (calendar_id, id, start_ts, end_ts, updated, body) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (self.calendar_id, event["id"], indexed.start.timestamp(), indexed.end.timestamp(),
+                     event.get("updated"), body),
+                )
+                changed[event["id"]] = event
+            if changed or series_changed:
+                self._bump(None if series_changed or len(changed) > _CHANGELOG_MAX_EVENTS else changed)
+
+    def upsert(self, event: dict) -> None:
+        """Write-through for events we just inserted or updated via the API."""
+        if event:
+            self.upsert_many([event])
+
+    def upsert_many(self, events: list[dict]) -> None:
+        """upsert for a whole batch of API results, in one transaction."""
+        if events:
+            self._apply(events)
+            self._stats["write_through"] += len(events)
+
+    def _clear(self) -> None:
+        with self._db_lock, self._conn:
+            for table in ("events", "series", "instance_overrides", "sync_state"):
+                self._conn.execute(f"DELETE FROM {table} WHERE calendar_id = ?", (self.calendar_id,))
+            self._bump(None)
+
+    def _bump(self, changes: Optional[dict[str, Optional[dict]]]) -> None:
+        # Called with _db_lock held
+        self.version += 1
+        self._changelog.append((self.version, changes))
+
+    def changes_since(self, version: int) -> Optional[dict[str, Optional[dict]]]:
+        """
+        One-off events written (the event) or deleted (None) after `version`, by id. None when the
+        log can't say: a series changed, too much changed at once, or `version` is too old.
+        """
+        with self._db_lock:
+            entries = [changes for logged, changes in self._changelog if logged > version]
+            if len(entries) != self.version - version:
+                return None
+        merged = {}
+        for changes in entries:
+            if changes is None:
+                return None
+            merged.update(changes)
+        return merged
+
+    # ----------------------------- Sync -----------------------------
+    def _run_sync(self, service, sync_token: Optional[str]) -> int:
+        params = {"syncToken": sync_token} if sync_token else {"showDeleted": False}
+        changed = 0
+        next_sync_token = None
+        # Each page is applied as it arrives, so a large first sync never sits in memory whole.
+        # Without singleEvents a series is one item, plus one per moved or cancelled occurrence
+        for page in iter_event_pages(service, self.calendar_id, maxResults=2500, **params):
+            items = page.get("items", [])
+            self._apply(items)
+            changed += len(items)
+            next_sync_token = page.get("nextSyncToken") or next_sync_token
+        self._save_state(next_sync_token, full=sync_token is None)
+        return changed
+
+    def sync(self, force_full: bool = False) -> int:
+        """Pull changes since the last sync token; returns how many events changed."""
+        with self._sync_lock:
+            started = time.perf_counter()
+            service = get_calendar_service()
+            sync_token, _ = self._state()
+            if force_full:
+                self._clear()
+                sync_token = None
+
+            try:
+                changed = self._run_sync(service, sync_token)
+            except HttpError as error:
+                if sync_token is None or error.resp.status != 410:
+                    raise
+                # Sync token expired or invalidated by Google: start over from scratch
+                logger.warning("Calendar sync token expired (410 Gone); running a full resync")
+                self._stats["resyncs_after_410"] += 1
+                self._clear()
+                sync_token = None
+                changed = self._run_sync(service, None)
+
+            self._last_sync_duration = time.perf_counter() - started
+            self._stats["full_syncs" if sync_token is None else "incremental_syncs"] += 1
+            self._stats["events_synced"] += changed
+            logger.info(f"Calendar mirror synced {changed} changes in {self._last_sync_duration * 1000:.1f}ms")
+            return changed
+
+    def ensure_fresh(self) -> None:
+        staleness = self.staleness_seconds()
+        if staleness is not None and staleness <= self.max_staleness:
+            self._stats["fresh_reads"] += 1
+            return
+
+        try:
+            self.sync()
+        except HttpError as error:
+            if staleness is None:
+                raise
+            # Serve what we have rather than failing the request outright
+            logger.error(f"Calendar mirror sync failed, serving data {staleness:.0f}s old: {error}")
+            self._stats["sync_failures"] += 1
+
+    # ----------------------------- Recurrence -----------------------------
+    def _cached(self, cache: OrderedDict, key, compute):
+        with self._cache_lock:
+            if key in cache:
+                cache.move_to_end(key)
+                self._stats["expansion_cache_hits" if cache is self._expansion_cache else "series_cache_hits"] += 1
+                return cache[key]
+        value = compute()
+        with self._cache_lock:
+            cache[key] = value
+            while len(cache) > recurrence_cache_size:
+                cache.popitem(last=False)
+        return value
+
+    def _expand(self, series_rows: list[tuple], time_min: datetime, time_max: datetime) -> list[tuple[float, dict]]:
+        """(start timestamp, instance) for every occurrence of `series_rows` overlapping the window."""
+        if not series_rows:
+            return []
+        ids = [series_id for series_id, _, _ in series_rows]
+        with self._db_lock:
+            overridden = {
+                instance_id for (instance_id,) in self._conn.execute(
+                    f"SELECT id FROM instance_overrides WHERE calendar_id = ? AND series_id IN ({','.join('?' * len(ids))})",
+                    (self.calendar_id, *ids),
+                )
+            }
+
+        # Expanded over whole days, so queries for "the next 7 days" made minutes apart share one
+        # expansion; occurrences outside the actual window are filtered out below
+        day_min, day_max = _day_span(time_min, time_max)
+        days = (day_min.timestamp(), day_max.timestamp())
+        window_min, window_max = time_min.timestamp(), time_max.timestamp()
+
+        def expand(series: Series) -> list[tuple[float, float, dict]]:
+            return [(series.timestamp(start), series.timestamp(start + series.duration), series.instance(start))
+                    for start in series.occurrences(day_min, day_max)]
+
+        instances = []
+        for series_id, updated, body in series_rows:
+            series = self._cached(self._series_cache, (series_id, updated), lambda: Series(json.loads(body)))
+            # Instances are cached fully built; callers get shallow copies
+            expansion = self._cached(self._expansion_cache, (series_id, updated, days), lambda: expand(series))
+            instances += [(start_ts, dict(instance)) for start_ts, end_ts, instance in expansion
+                          if start_ts < window_max and end_ts > window_min and instance["id"] not in overridden]
+        self._stats["instances_expanded"] += len(instances)
+        return instances
+
+    # ----------------------------- Reads -----------------------------
+    def query(self, time_min: datetime, time_max: datetime) -> list[dict]:
+        """Events overlapping [time_min, time_max), ordered by start time."""
+        time_min, time_max = (t if t.tzinfo else t.replace(tzinfo=DEFAULT_TZ) for t in (time_min, time_max))
+        with self._db_lock:
+            rows = self._conn.execute(
+                "SELECT start_ts, body FROM events WHERE calendar_id = ? AND start_ts < ? AND end_ts > ?",
+                (self.calendar_id, time_max.timestamp(), time_min.timestamp()),
+            ).fetchall()
+            series_rows = self._conn.execute(
+                "SELECT id, updated, body FROM series "
+                "WHERE calendar_id = ? AND start_ts < ? AND (until_ts IS NULL OR until_ts > ?)",
+                (self.calendar_id, time_max.timestamp(), time_min.timestamp()),
+            ).fetchall()
+        found = [(start_ts, json.loads(body)) for start_ts, body in rows]
+        found += self._expand(series_rows, time_min, time_max)
+        found.sort(key=lambda item: item[0])
+        return [event for _, event in found]
+
+    def stats(self) -> dict:
+        with self._db_lock:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM events WHERE calendar_id = ?", (self.calendar_id,)
+            ).fetchone()
+            (series,) = self._conn.execute(
+                "SELECT COUNT(*) FROM series WHERE calendar_id = ?", (self.calendar_id,)
+            ).fetchone()
+        stats = dict(self._stats)
+        stats["events"] = count
+        stats["series"] = series
+        stats["staleness_seconds"] = self.staleness_seconds()
+        stats["last_sync_duration_seconds"] = self._last_sync_duration
+        return stats
+
+
+calendar_mirror = CalendarMirror()
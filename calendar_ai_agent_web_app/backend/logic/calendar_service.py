@@ -0,0 +1,239 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Optional
+import httplib2
+from google_auth_httplib2 import AuthorizedHttp
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+from google_auth_oauthlib.flow import InstalledAppFlow
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from calendar_ai_agent_web_app.backend.constants import SCOPES
+from calendar_ai_agent_web_app.backend.utils.logger import logger
+from calendar_ai_agent_web_app.backend.utils.metrics import record_google_call
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CREDENTIALS_PATH = os.path.join(BASE_DIR, "credentials2.json")
+TOKEN_PATH = "token.json"
+DISCOVERY_URL = "https://www.googleapis.com/discovery/v1/apis/calendar/v3/rest"
+
+# Partial-response projections: only the parts of an event the pipeline reads
+EVENT_FIELDS = (
+    "id,status,summary,description,location,htmlLink,updated,transparency,"
+    "start,end,attendees(email,displayName,responseStatus),organizer(email),creator(email),"
+    "recurrence,recurringEventId,originalStartTime"
+)
+EVENT_LIST_FIELDS = f"nextPageToken,nextSyncToken,items({EVENT_FIELDS})"
+
+# .../calendars/{calendarId}/events[/{eventId}[/instances]], for naming API calls in /metrics
+_EVENTS_PATH = re.compile(r"/calendars/[^/]+/events(?:/(?P<event>[^/?]+)(?P<instances>/instances)?)?/?(?:\?|$)")
+_EVENT_METHODS = {"GET": "events.get", "PATCH": "events.patch", "PUT": "events.update", "DELETE": "events.delete"}
+
+
+def _api_method(method: str, uri: str) -> str:
+    """The Calendar API method a raw HTTP request belongs to, e.g. events.list."""
+    if "/batch/" in uri:
+        return "batch"
+    if "/freeBusy" in uri:
+        return "freebusy.query"
+    match = _EVENTS_PATH.search(uri)
+    if not match:
+        return "other"
+    event = match.group("event")
+    if event is None:
+        return "events.list" if method == "GET" else "events.insert"
+    if event in ("import", "quickAdd", "watch"):
+        return f"events.{event}"
+    if match.group("instances"):
+        return "events.instances"
+    return _EVENT_METHODS.get(method, "other")
+
+
+class _InstrumentedHttp(AuthorizedHttp):
+    """AuthorizedHttp that records every Calendar API call's method, status and latency."""
+
+    def request(self, uri, method="GET", *args, **kwargs):
+        started = time.perf_counter()
+        status = "error"
+        try:
+            response, content = super().request(uri, method, *args, **kwargs)
+            status = str(response.status)
+            return response, content
+        finally:
+            record_google_call(_api_method(method, uri), status, time.perf_counter() - started)
+
+
+class CalendarServiceManager:
+    """
+    Builds the Google Calendar client once per process instead of once per call.
+
+    Credentials are cached in memory and refreshed `refresh_margin` before they
+    expire, under a lock so concurrent requests trigger a single refresh. The
+    discovery document is parsed once, and every thread gets its own
+    AuthorizedHttp transport and service object, since httplib2 is not thread-safe.
+    """
+
+    def __init__(self, token_path: str = TOKEN_PATH, credentials_path: str = CREDENTIALS_PATH,
+                 refresh_margin: timedelta = timedelta(minutes=5), http_timeout: int = 30):
+        self.token_path = token_path
+        self.credentials_path = credentials_path
+        self.refresh_margin = refresh_margin
+        self.http_timeout = http_timeout
+
+        self._creds: Optional[Credentials] = None
+        self._creds_lock = threading.Lock()
+        self._discovery_doc: Optional[dict] = None
+        self._discovery_lock = threading.Lock()
+        self._local = threading.local()
+
+        self._stats = Counter()
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key: str, amount: float = 1) -> None:
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def _needs_refresh(self, creds: Credentials) -> bool:
+        if not creds.token:
+            return True
+        if creds.expiry is None:
+            return False
+        # google-auth keeps expiry as a naive UTC datetime
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return creds.expiry - self.refresh_margin <= now
+
+    def _load_from_disk(self) -> Optional[Credentials]:
+        if os.path.exists(self.token_path):
+            return Credentials.from_authorized_user_file(self.token_path)
+        return None
+
+    def _save(self, creds: Credentials) -> None:
+        with open(self.token_path, "w") as token:
+            token.write(creds.to_json())
+
+    def get_credentials(self) -> Credentials:
+        creds = self._creds
+        if creds is not None and not self._needs_refresh(creds):
+            self._count("credential_hits")
+            return creds
+
+        with self._creds_lock:
+            # Another thread may have refreshed while we waited for the lock
+            creds = self._creds
+            if creds is not None and not self._needs_refresh(creds):
+                self._count("credential_hits")
+                return creds
+
+            if creds is None:
+                creds = self._load_from_disk()
+
+            if creds and creds.refresh_token and self._needs_refresh(creds):
+                logger.info("Refreshing Google Calendar access token ahead of expiry")
+                creds.refresh(Request())
+                self._count("token_refreshes")
+                self._save(creds)
+            elif not creds or not creds.valid:
+                flow = InstalledAppFlow.from_client_secrets_file(self.credentials_path, SCOPES)
+                creds = flow.run_console()
+                self._save(creds)
+
+            self._creds = creds
+            self._count("credential_loads")
+            return creds
+
+    def _get_discovery_doc(self) -> dict:
+        if self._discovery_doc is not None:
+            self._count("discovery_hits")
+            return self._discovery_doc
+
+        with self._discovery_lock:
+            if self._discovery_doc is None:
+                content = get_static_doc("calendar", "v3")
+                if content is None:
+                    _, content = httplib2.Http(timeout=self.http_timeout).request(DISCOVERY_URL)
+                self._discovery_doc = json.loads(content)
+                self._count("discovery_loads")
+            return self._discovery_doc
+
+    def get_service(self):
+        """Return this thread's Calendar service, building it on first use."""
+        creds = self.get_credentials()
+
+        service = getattr(self._local, "service", None)
+        if service is not None and self._local.creds is creds:
+            self._count("service_hits")
+            return service
+
+        started = time.perf_counter()
+        http = _InstrumentedHttp(creds, http=httplib2.Http(timeout=self.http_timeout))
+        service = build_from_document(self._get_discovery_doc(), http=http)
+        self._count("service_builds")
+        self._count("service_build_seconds", time.perf_counter() - started)
+
+        self._local.service = service
+        self._local.creds = creds
+        return service
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            stats = dict(self._stats)
+
+        builds = stats.get("service_builds", 0)
+        hits = stats.get("service_hits", 0)
+        avg_build = stats.get("service_build_seconds", 0.0) / builds if builds else 0.0
+        stats["service_hit_rate"] = hits / (hits + builds) if hits + builds else 0.0
+        stats["estimated_seconds_saved"] = hits * avg_build
+        pages = stats.get("list_pages", 0)
+        if pages:
+            stats["avg_list_page_bytes"] = stats["list_bytes"] / pages
+            stats["avg_list_page_ms"] = stats["list_seconds"] / pages * 1000
+        return stats
+
+
+calendar_service_manager = CalendarServiceManager()
+
+
+def get_calendar_service():
+    return calendar_service_manager.get_service()
+
+
+def _counting_bytes(postproc):
+    """Wrap an HttpRequest's postproc to count the response body as received, before JSON parsing."""
+    def count(response, content):
+        calendar_service_manager._count("list_bytes", len(content))
+        return postproc(response, content)
+    return count
+
+
+def iter_event_pages(service=None, calendar_id: str = "primary", fields: str = EVENT_LIST_FIELDS,
+                     **params) -> Iterator[dict]:
+    """
+    Yield events().list response pages one at a time, following nextPageToken
+    only when the caller asks for the next page.
+    """
+    service = service or get_calendar_service()
+    page_token = None
+    while True:
+        started = time.perf_counter()
+        request = service.events().list(calendarId=calendar_id, pageToken=page_token, fields=fields, **params)
+        request.postproc = _counting_bytes(request.postproc)
+        page = request.execute()
+        calendar_service_manager._count("list_pages")
+        calendar_service_manager._count("list_items", len(page.get("items", [])))
+        calendar_service_manager._count("list_seconds", time.perf_counter() - started)
+        yield page
+
+        page_token = page.get("nextPageToken")
+        if not page_token:
+            return
+
+
+def iter_events(service=None, calendar_id: str = "primary", fields: str = EVENT_LIST_FIELDS,
+                **params) -> Iterator[dict]:
+    for page in iter_event_pages(service, calendar_id, fields, **params):
+        yield from page.get("items", [])
@@ -1,48 +1,358 @@
-from calendar_ai_agent_web_app.backend.schemas.models import EventConfirmation, EventDetails, EventUpdateDetails, ListedEvents, EventListConfirmation
-from calendar_ai_agent_web_app.backend.utils.logger import logger
-from calendar_ai_agent_web_app.backend.config import client, model
+import asyncio
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Optional, Type, TypeVar
+from pydantic import BaseModel
+from calendar_ai_agent_web_app.backend.schemas.models import (
+    EventConfirmation, EventDetails, EventUpdateDetails, ListedEvents, EventListConfirmation, FindTimeRequest, AvailableSlots
+)
+from calendar_ai_agent_web_app.backend.utils.logger import logger, in_current_trace
+from calendar_ai_agent_web_app.backend.utils.metrics import instrumented, stage
+from calendar_ai_agent_web_app.backend.logic.llm import parse_completion, parse_completion_async, stream_completion_async
+from calendar_ai_agent_web_app.backend.logic.temporal import DEFAULT_TZ
+from calendar_ai_agent_web_app.backend.config import confirmation_mode, confirmation_polish_deadline
 
+T = TypeVar("T", bound=BaseModel)
+
+SIGN_OFF = "Best,\nSusie"
+
+_polish_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="confirmation-polish")
+# Async polishes that missed their deadline; held so they can finish and report their latency
+_late_polishes: set[asyncio.Task] = set()
+
+
+def _confirmation_messages(event_details: EventDetails, calendar_link: str) -> list[dict]:
+    return [
+        {"role": "system", "content": f"Generate a confirmation email. Sign off as Susie. Include this calendar link: {calendar_link}"},
+        {"role": "user", "content": str(event_details.model_dump())},
+    ]
+
+
+def _modify_confirmation_messages(event_details: EventUpdateDetails, calendar_link: str) -> list[dict]:
+    return [
+        {"role": "system", "content": f"Generate a calendar event modified confirmation email. Sign off as Susie. Include this calendar link: {calendar_link}"},
+        {"role": "user", "content": str(event_details.model_dump())},
+    ]
+
+
+def _matched_events_messages(matched_events: ListedEvents) -> list[dict]:
+    return [
+        {"role": "system", "content": (
+            "You are an assistant generating a summary of upcoming calendar events for a user. "
+            "Take the JSON input of matched events and generate a friendly, formatted message summarizing the events. "
+            "Use bullet points and emojis when helpful. Keep it concise and helpful."
+        )},
+        {"role": "user", "content": str(matched_events.model_dump())}
+    ]
+
+
+# ----------------------------- Templates -----------------------------
+def _local(value) -> Optional[datetime]:
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=DEFAULT_TZ)
+    return value.astimezone(DEFAULT_TZ)
+
+
+def _clock(dt: datetime) -> str:
+    return dt.strftime("%I:%M %p").lstrip("0")
+
+
+def _format_span(start: datetime, end: datetime) -> str:
+    """'Thursday, October 23, 3:00 PM – 4:00 PM PDT'"""
+    day = f"{start:%A, %B} {start.day}"
+    if end.date() == start.date():
+        return f"{day}, {_clock(start)} – {_clock(end)} {end:%Z}"
+    return f"{day}, {_clock(start)} – {end:%A, %B} {end.day}, {_clock(end)} {end:%Z}"
+
+
+def _when(iso_date: str, duration_minutes: int) -> str:
+    start = _local(iso_date)
+    if start is None:
+        # Not ISO 8601; show it the way the parser returned it
+        return iso_date
+    return _format_span(start, start + timedelta(minutes=duration_minutes))
+
+
+def _detail_lines(location: Optional[str], participants: list[str], description: Optional[str], name: str) -> list[str]:
+    lines = []
+    if location:
+        lines.append(f"📍 Location: {location}")
+    if participants:
+        lines.append(f"👥 Participants: {', '.join(participants)}")
+    if description and description.strip().lower() != name.strip().lower():
+        lines.append(f"📝 {description.strip()}")
+    return lines
+
+
+def render_confirmation(event_details: EventDetails, calendar_link: str) -> EventConfirmation:
+    lines = [
+        "Hi,",
+        "",
+        f"Your event \"{event_details.name}\" is scheduled for {_when(event_details.date, event_details.duration_minutes)}.",
+        *_detail_lines(event_details.location, event_details.participants, event_details.description, event_details.name),
+    ]
+    if calendar_link:
+        lines += ["", f"View it on your calendar: {calendar_link}"]
+    lines += ["", SIGN_OFF]
+    return EventConfirmation(confirmation_message="\n".join(lines), calendar_link=calendar_link)
+
+
+def render_modify_confirmation(event_details: EventUpdateDetails, calendar_link: str) -> EventConfirmation:
+    lines = [
+        "Hi,",
+        "",
+        f"Your event \"{event_details.name}\" has been moved.",
+        f"🕒 Was: {_when(event_details.original_date, event_details.duration_minutes)}",
+        f"🕒 Now: {_when(event_details.new_date, event_details.duration_minutes)}",
+        *_detail_lines(event_details.location, event_details.participants, event_details.description, event_details.name),
+    ]
+    if calendar_link:
+        lines += ["", f"View the updated event: {calendar_link}"]
+    lines += ["", SIGN_OFF]
+    return EventConfirmation(confirmation_message="\n".join(lines), calendar_link=calendar_link)
+
+
+def render_matched_events(matched_events: ListedEvents) -> EventListConfirmation:
+    events = matched_events.matched_events
+    if not events:
+        return EventListConfirmation(message=f"No events found for \"{matched_events.query_summary}\".")
+
+    count = f"{len(events)} event" + ("" if len(events) == 1 else "s")
+    lines = [f"📅 {matched_events.query_summary} ({count}):", ""]
+    for event in sorted(events, key=lambda e: e.start_time):
+        lines.append(f"• {event.title} — {_format_span(_local(event.start_time), _local(event.end_time))}")
+        if event.location:
+            lines.append(f"   📍 {event.location}")
+        if event.participants:
+            lines.append(f"   👥 {', '.join(event.participants)}")
+    return EventListConfirmation(message="\n".join(lines))
+
+
+def render_time_slots(request: FindTimeRequest, result: AvailableSlots) -> str:
+    # Template only: the slot list is the whole answer, so there is nothing for the LLM to polish
+    length = f"{request.duration_minutes} minutes"
+    if not result.slots:
+        lines = [f"I couldn't find {length} that works between "
+                 f"{_local(request.window_start):%A, %B} {_local(request.window_start).day} and "
+                 f"{_local(request.window_end):%A, %B} {_local(request.window_end).day}."]
+    else:
+        everyone = all(not slot.unavailable for slot in result.slots)
+        lines = [f"🗓️ Suggested times for {length}" + (" — everyone is free:" if everyone else ":"), ""]
+        for slot in result.slots:
+            lines.append(f"• {_format_span(_local(slot.start_time), _local(slot.end_time))}")
+            if slot.unavailable:
+                lines.append(f"   ⚠️ Busy: {', '.join(slot.unavailable)}")
+    if result.unknown_participants:
+        lines += ["", f"ℹ️ Couldn't check availability for: {', '.join(result.unknown_participants)}"]
+    return "\n".join(lines)
+
+
+# ----------------------------- Latency stats -----------------------------
+class ConfirmationStats:
+    """Template vs. LLM confirmation latency per kind (create / modify / list)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: defaultdict[str, Counter] = defaultdict(Counter)
+
+    def record(self, kind: str, path: str, seconds: float) -> None:
+        with self._lock:
+            self._counts[kind][f"{path}_calls"] += 1
+            self._counts[kind][f"{path}_seconds"] += seconds
+
+    def count(self, kind: str, key: str) -> None:
+        with self._lock:
+            self._counts[kind][key] += 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            kinds = {kind: dict(counts) for kind, counts in self._counts.items()}
+        for counts in kinds.values():
+            for path in ("template", "llm", "stream_first_token", "stream"):
+                calls = counts.get(f"{path}_calls", 0)
+                counts[f"avg_{path}_ms"] = counts.pop(f"{path}_seconds", 0.0) / calls * 1000 if calls else 0.0
+        return {"mode": confirmation_mode, "polish_deadline_seconds": confirmation_polish_deadline, **kinds}
+
+
+confirmation_stats = ConfirmationStats()
+
+
+def _render(kind: str, render, *args):
+    started = time.perf_counter()
+    draft = render(*args)
+    confirmation_stats.record(kind, "template", time.perf_counter() - started)
+    return draft
+
+
+def _llm(kind: str, messages: list[dict], response_format: Type[T]) -> T:
+    started = time.perf_counter()
+    result = parse_completion(messages, response_format)
+    confirmation_stats.record(kind, "llm", time.perf_counter() - started)
+    return result
+
+
+async def _llm_async(kind: str, messages: list[dict], response_format: Type[T]) -> T:
+    started = time.perf_counter()
+    result = await parse_completion_async(messages, response_format)
+    confirmation_stats.record(kind, "llm", time.perf_counter() - started)
+    return result
+
+
+def _finish(kind: str, draft: T, messages: list[dict], response_format: Type[T]) -> T:
+    """
+    CONFIRMATION_MODE "template" returns the draft, "llm" the model's text as before, and
+    "polish" the model's text if it arrives within the deadline, otherwise the draft.
+    """
+    if confirmation_mode == "llm":
+        return _llm(kind, messages, response_format)
+    if confirmation_mode != "polish":
+        return draft
+
+    future = _polish_executor.submit(in_current_trace(_llm), kind, messages, response_format)
+    try:
+        polished = future.result(timeout=confirmation_polish_deadline)
+    except FuturesTimeout:
+        # Keeps running in the pool; its latency still lands in the stats
+        confirmation_stats.count(kind, "polish_late")
+        return draft
+    except Exception:
+        logger.exception(f"Confirmation polish failed for {kind}; using template")
+        confirmation_stats.count(kind, "polish_errors")
+        return draft
+    confirmation_stats.count(kind, "polish_used")
+    return polished
+
+
+def _late_polish_done(task: asyncio.Task) -> None:
+    _late_polishes.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Late confirmation polish failed: {task.exception()}")
+
+
+async def _finish_async(kind: str, draft: T, messages: list[dict], response_format: Type[T]) -> T:
+    if confirmation_mode == "llm":
+        return await _llm_async(kind, messages, response_format)
+    if confirmation_mode != "polish":
+        return draft
+
+    task = asyncio.create_task(_llm_async(kind, messages, response_format))
+    done, _ = await asyncio.wait({task}, timeout=confirmation_polish_deadline)
+    if not done:
+        _late_polishes.add(task)
+        task.add_done_callback(_late_polish_done)
+        confirmation_stats.count(kind, "polish_late")
+        return draft
+    if task.exception() is not None:
+        logger.error(f"Confirmation polish failed for {kind}; using template: {task.exception()}")
+        confirmation_stats.count(kind, "polish_errors")
+        return draft
+    confirmation_stats.count(kind, "polish_used")
+    return task.result()
+
+
+async def _stream(kind: str, draft_text: str, messages: list[dict]) -> AsyncIterator[str]:
+    """
+    Confirmation text for /process/stream. "template" yields the draft in one piece; otherwise
+    tokens come straight from the LLM. The draft stands in if the first token misses the polish
+    deadline or the call fails before producing anything.
+    """
+    with stage(f"confirmation_{kind}_stream"):
+        if confirmation_mode not in ("llm", "polish"):
+            yield draft_text
+            return
+
+        started = time.perf_counter()
+        tokens = stream_completion_async(messages)
+        deadline = confirmation_polish_deadline if confirmation_mode == "polish" else None
+        try:
+            first = await asyncio.wait_for(anext(tokens), deadline)
+        except asyncio.TimeoutError:
+            confirmation_stats.count(kind, "polish_late")
+            await tokens.aclose()
+            yield draft_text
+            return
+        except Exception as e:
+            logger.error(f"Confirmation stream failed for {kind}; using template: {e}")
+            confirmation_stats.count(kind, "polish_errors")
+            await tokens.aclose()
+            yield draft_text
+            return
+
+        confirmation_stats.record(kind, "stream_first_token", time.perf_counter() - started)
+        yield first
+        async for token in tokens:
+            yield token
+        confirmation_stats.record(kind, "stream", time.perf_counter() - started)
+
+
+def stream_confirmation_async(event_details: EventDetails, calendar_link: str) -> AsyncIterator[str]:
+    draft = _render("create", render_confirmation, event_details, calendar_link)
+    return _stream("create", draft.confirmation_message, _confirmation_messages(event_details, calendar_link))
+
+
+def stream_modify_confirmation_async(event_details: EventUpdateDetails, calendar_link: str) -> AsyncIterator[str]:
+    draft = _render("modify", render_modify_confirmation, event_details, calendar_link)
+    return _stream("modify", draft.confirmation_message, _modify_confirmation_messages(event_details, calendar_link))
+
+
+def stream_matched_calendar_events_message_async(matched_events: ListedEvents) -> AsyncIterator[str]:
+    draft = _render("list", render_matched_events, matched_events)
+    return _stream("list", draft.message, _matched_events_messages(matched_events))
+
+
+@instrumented("confirmation_create")
 def generate_confirmation(event_details: EventDetails, calendar_link: str) -> EventConfirmation:
     logger.info("Generating confirmation message")
 
-    completion = client.beta.chat.completions.parse(
-        model=model,
-        messages=[
-            {"role": "system", "content": f"Generate a confirmation email. Sign off as Susie. Include this calendar link: {calendar_link}"},
-            {"role": "user", "content": str(event_details.model_dump())},
-        ],
-        response_format=EventConfirmation,
-    )
-    return completion.choices[0].message.parsed
+    draft = _render("create", render_confirmation, event_details, calendar_link)
+    return _finish("create", draft, _confirmation_messages(event_details, calendar_link), EventConfirmation)
+
+
+@instrumented("confirmation_create")
+async def generate_confirmation_async(event_details: EventDetails, calendar_link: str) -> EventConfirmation:
+    logger.info("Generating confirmation message")
+
+    draft = _render("create", render_confirmation, event_details, calendar_link)
+    return await _finish_async("create", draft, _confirmation_messages(event_details, calendar_link), EventConfirmation)
 
 
+@instrumented("confirmation_modify")
 def generate_modify_confirmation(event_details: EventUpdateDetails, calendar_link: str) -> EventConfirmation:
     logger.info("Generating modify confirmation message")
 
-    completion = client.beta.chat.completions.parse(
-        model=model,
-        messages=[
-            {"role": "system", "content": f"Generate a calendar event modified confirmation email. Sign off as Susie. Include this calendar link: {calendar_link}"},
-            {"role": "user", "content": str(event_details.model_dump())},
-        ],
-        response_format=EventConfirmation,
-    )
-    return completion.choices[0].message.parsed
+    draft = _render("modify", render_modify_confirmation, event_details, calendar_link)
+    return _finish("modify", draft, _modify_confirmation_messages(event_details, calendar_link), EventConfirmation)
+
+
+@instrumented("confirmation_modify")
+async def generate_modify_confirmation_async(event_details: EventUpdateDetails, calendar_link: str) -> EventConfirmation:
+    logger.info("Generating modify confirmation message")
 
+    draft = _render("modify", render_modify_confirmation, event_details, calendar_link)
+    return await _finish_async("modify", draft, _modify_confirmation_messages(event_details, calendar_link), EventConfirmation)
+
+@instrumented("confirmation_list")
 def generate_matched_calendar_events_message(matched_events: ListedEvents) -> EventListConfirmation:
     logger.info("Generating summary message for matched calendar events")
 
-    completion = client.beta.chat.completions.parse(
-        model=model,
-        messages=[
-            {"role": "system", "content": (
-                "You are an assistant generating a summary of upcoming calendar events for a user. "
-                "Take the JSON input of matched events and generate a friendly, formatted message summarizing the events. "
-                "Use bullet points and emojis when helpful. Keep it concise and helpful."
-            )},
-            {"role": "user", "content": str(matched_events.model_dump())}
-        ],
-        response_format=EventListConfirmation
-    )
-    print(completion.choices[0].message.parsed)
-    return completion.choices[0].message.parsed
\ No newline at end of file
+    draft = _render("list", render_matched_events, matched_events)
+    summary = _finish("list", draft, _matched_events_messages(matched_events), EventListConfirmation)
+    logger.debug(f"List summary: {summary}")
+    return summary
+
+@instrumented("confirmation_list")
+async def generate_matched_calendar_events_message_async(matched_events: ListedEvents) -> EventListConfirmation:
+    logger.info("Generating summary message for matched calendar events")
+
+    draft = _render("list", render_matched_events, matched_events)
+    summary = await _finish_async("list", draft, _matched_events_messages(matched_events), EventListConfirmation)
+    logger.debug(f"List summary: {summary}")
+    return summary
@@ -0,0 +1,230 @@
+import asyncio
+import threading
+import time
+from datetime import datetime
+from typing import Any, Optional
+from googleapiclient.errors import HttpError
+from calendar_ai_agent_web_app.backend.config import conflict_index_days
+from calendar_ai_agent_web_app.backend.logic.calendar_mirror import calendar_mirror
+from calendar_ai_agent_web_app.backend.logic.calendar_service import get_calendar_service
+from calendar_ai_agent_web_app.backend.logic.event_filter import IndexedEvent
+from calendar_ai_agent_web_app.backend.logic.recurrence import day_after
+from calendar_ai_agent_web_app.backend.logic.temporal import DEFAULT_TZ
+from calendar_ai_agent_web_app.backend.schemas.models import EventConflict
+from calendar_ai_agent_web_app.backend.utils.logger import logger
+from calendar_ai_agent_web_app.backend.utils.metrics import instrumented
+
+Interval = tuple[float, float, Any]
+
+
+class _Node:
+    __slots__ = ("center", "by_start", "by_end", "left", "right")
+
+    def __init__(self, center: float, by_start: list[Interval], by_end: list[Interval],
+                 left: Optional["_Node"], right: Optional["_Node"]):
+        self.center = center
+        self.by_start = by_start
+        self.by_end = by_end
+        self.left = left
+        self.right = right
+
+
+class IntervalTree:
+    """
+    Static centered interval tree over half-open [start, end) intervals.
+
+    Every node holds at least one interval containing its center, so an overlap
+    query visits O(log n) nodes off the answer plus the k intervals it reports.
+    """
+
+    def __init__(self, intervals: list[Interval]):
+        # Zero-length intervals can never overlap anything
+        intervals = [interval for interval in intervals if interval[1] > interval[0]]
+        self.size = len(intervals)
+        self.root = self._build(sorted(intervals, key=lambda interval: interval[0]))
+
+    def __len__(self) -> int:
+        return self.size
+
+    @classmethod
+    def _build(cls, intervals: list[Interval]) -> Optional[_Node]:
+        if not intervals:
+            return None
+
+        # Input is sorted by start; the median start always lands inside its own interval
+        center = intervals[len(intervals) // 2][0]
+        left, here, right = [], [], []
+        for interval in intervals:
+            if interval[1] <= center:
+                left.append(interval)
+            elif interval[0] > center:
+                right.append(interval)
+            else:
+                here.append(interval)
+
+        return _Node(
+            center,
+            here,
+            sorted(here, key=lambda interval: interval[1], reverse=True),
+            cls._build(left),
+            cls._build(right),
+        )
+
+    def overlaps(self, start: float, end: float) -> list[Any]:
+        """Payloads of all intervals overlapping [start, end)."""
+        found = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            if end <= node.center:
+                for interval in node.by_start:
+                    if interval[0] >= end:
+                        break
+                    found.append(interval[2])
+                stack.append(node.left)
+            elif start > node.center:
+                for interval in node.by_end:
+                    if interval[1] <= start:
+                        break
+                    found.append(interval[2])
+                stack.append(node.right)
+            else:
+                # Query spans the center, so every interval stored here overlaps it
+                found.extend(interval[2] for interval in node.by_start)
+                stack.append(node.left)
+                stack.append(node.right)
+        return found
+
+
+def _blocking(raw: dict) -> Optional[IndexedEvent]:
+    """The event as the conflict check sees it, or None if it can't block time."""
+    # Events marked "free" don't block time
+    if raw.get("transparency") == "transparent":
+        return None
+    event = IndexedEvent(raw)
+    return event if event.start is not None and not event.all_day else None
+
+
+class CalendarConflictIndex:
+    """
+    Interval tree over the calendar mirror from yesterday to `days` ahead.
+
+    Events written since the build (our own inserts, small incremental syncs) are kept in an
+    overlay checked next to the tree, so a write-through doesn't cost a rebuild. Series changes,
+    large syncs, a full overlay and the window rolling over at midnight rebuild it; checks
+    reaching outside the window go straight to the mirror.
+    """
+
+    def __init__(self, mirror=calendar_mirror, days: int = conflict_index_days, max_overlay: int = 512):
+        self.mirror = mirror
+        self.days = days
+        self.max_overlay = max_overlay
+        self._tree = IntervalTree([])
+        self._overlay: dict[str, Optional[IndexedEvent]] = {}
+        self._window = (0.0, 0.0)
+        self._version = None
+        self._lock = threading.Lock()
+
+    def _rebuild(self) -> None:
+        started = time.perf_counter()
+        window_start, window_end = day_after(-1), day_after(self.days)
+        # Read before the query: anything written meanwhile is replayed from the change log next time
+        version = self.mirror.version
+        intervals = [
+            (event.start.timestamp(), event.end.timestamp(), event)
+            for event in map(_blocking, self.mirror.query(window_start, window_end)) if event
+        ]
+        self._tree = IntervalTree(intervals)
+        self._overlay = {}
+        self._window = (window_start.timestamp(), window_end.timestamp())
+        self._version = version
+        logger.info(f"Built conflict index over {len(self._tree)} events in "
+                    f"{(time.perf_counter() - started) * 1000:.1f}ms")
+
+    def _refresh(self) -> None:
+        if self._window[0] != day_after(-1).timestamp():
+            self._rebuild()
+            return
+        version = self.mirror.version
+        if version == self._version:
+            return
+        changes = self.mirror.changes_since(self._version)
+        if changes is None or len(self._overlay) + len(changes) > self.max_overlay:
+            self._rebuild()
+            return
+        for event_id, raw in changes.items():
+            self._overlay[event_id] = _blocking(raw) if raw else None
+        self._version = version
+
+    def _overlapping(self, start: float, end: float) -> list[IndexedEvent]:
+        window_start, window_end = self._window
+        if start < window_start or end > window_end:
+            return [event for event in map(_blocking, self.mirror.query(
+                datetime.fromtimestamp(start, DEFAULT_TZ), datetime.fromtimestamp(end, DEFAULT_TZ))) if event]
+        # Overlay entries shadow the tree's copy of the same event; None means it was deleted
+        matches = [event for event in self._tree.overlaps(start, end) if event.raw.get("id") not in self._overlay]
+        matches += [event for event in self._overlay.values()
+                    if event and event.start.timestamp() < end and event.end.timestamp() > start]
+        return matches
+
+    def conflicts(self, start: datetime, end: datetime) -> list[EventConflict]:
+        with self._lock:
+            self._refresh()
+            matches = self._overlapping(start.timestamp(), end.timestamp())
+        return [
+            EventConflict(title=event.raw.get("summary") or "(No title)", start_time=event.start, end_time=event.end)
+            for event in sorted(matches, key=lambda event: event.start)
+        ]
+
+
+conflict_index = CalendarConflictIndex()
+
+
+def participant_conflicts(start: datetime, end: datetime, emails: list[str]) -> list[EventConflict]:
+    """Busy blocks from the participants' free/busy, for calendars we are allowed to see."""
+    if not emails:
+        return []
+
+    response = get_calendar_service().freebusy().query(body={
+        "timeMin": start.isoformat(),
+        "timeMax": end.isoformat(),
+        "items": [{"id": email} for email in emails],
+    }).execute()
+
+    conflicts = []
+    for email, calendar in response.get("calendars", {}).items():
+        if calendar.get("errors"):
+            # notFound / no access: nothing to report for this participant
+            continue
+        for busy in calendar.get("busy", []):
+            conflicts.append(EventConflict(
+                title="Busy",
+                start_time=datetime.fromisoformat(busy["start"].replace("Z", "+00:00")).astimezone(DEFAULT_TZ),
+                end_time=datetime.fromisoformat(busy["end"].replace("Z", "+00:00")).astimezone(DEFAULT_TZ),
+                attendee=email,
+            ))
+    return conflicts
+
+
+@instrumented("conflicts")
+def find_conflicts(start: datetime, end: datetime, emails: list[str]) -> list[EventConflict]:
+    started = time.perf_counter()
+    try:
+        calendar_mirror.ensure_fresh()
+    except HttpError as error:
+        logger.error(f"Could not refresh calendar mirror for conflict check: {error}")
+
+    conflicts = conflict_index.conflicts(start, end)
+    try:
+        conflicts += participant_conflicts(start, end, emails)
+    except HttpError as error:
+        logger.error(f"Free/busy lookup failed: {error}")
+
+    logger.info(f"Conflict check found {len(conflicts)} overlaps in {(time.perf_counter() - started) * 1000:.2f}ms")
+    return conflicts
+
+
+async def find_conflicts_async(start: datetime, end: datetime, emails: list[str]) -> list[EventConflict]:
+    return await asyncio.to_thread(find_conflicts, start, end, emails)
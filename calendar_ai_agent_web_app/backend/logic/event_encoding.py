@@ -0,0 +1,126 @@
+from collections import Counter
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+from calendar_ai_agent_web_app.backend.logic.event_filter import IndexedEvent
+from calendar_ai_agent_web_app.backend.logic.temporal import DEFAULT_TZ
+from calendar_ai_agent_web_app.backend.config import model
+from calendar_ai_agent_web_app.backend.utils.logger import logger
+
+try:
+    import tiktoken
+except ImportError:  # optional; fall back to a character estimate
+    tiktoken = None
+
+EVENT_HEADER = "row|title|start|end|participants|location|description"
+MAX_DESCRIPTION_CHARS = 80
+
+encoding_stats = Counter()
+
+# record_savings tokenizes for real on one call in SAVINGS_SAMPLE_EVERY; the calls in between
+# scale the compact prompt's length by the ratios that sample measured
+SAVINGS_SAMPLE_EVERY = 20
+_savings_ratios = {"before_per_char": 1.0, "after_per_char": 0.25}
+
+
+@lru_cache(maxsize=8)
+def _encoding(model_name: str):
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # tiktoken downloads its BPE files on first use, which fails on offline hosts
+        logger.warning(f"tiktoken encoding unavailable ({e}); estimating tokens as len/4")
+        return None
+
+
+def count_tokens(text: str, model_name: str = model) -> int:
+    encoding = _encoding(model_name)
+    if encoding is None:
+        return len(text) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _cell(value: str, limit: int = None) -> str:
+    value = " ".join((value or "").split()).replace("|", "/")
+    if limit and len(value) > limit:
+        value = value[:limit - 1] + "…"
+    return value
+
+
+def encode_event(row: int, event: IndexedEvent) -> str:
+    """One event as a terse pipe-separated row; the row number is how the LLM refers back to it."""
+    raw = event.raw
+    if event.all_day:
+        start, end = event.start.strftime("%Y-%m-%d"), "all day"
+    else:
+        start = event.start.strftime("%Y-%m-%d %a %H:%M")
+        end = event.end.strftime("%H:%M") if event.end.date() == event.start.date() else event.end.strftime("%Y-%m-%d %H:%M")
+    participants = ",".join(sorted(event.emails))
+    return "|".join([
+        str(row),
+        _cell(raw.get("summary")),
+        start,
+        end,
+        participants,
+        _cell(raw.get("location")),
+        _cell(raw.get("description"), MAX_DESCRIPTION_CHARS),
+    ])
+
+
+def encode_events(events: list[dict], tz: ZoneInfo = DEFAULT_TZ) -> tuple[list[IndexedEvent], list[str]]:
+    indexed = [event for event in (IndexedEvent(raw, tz) for raw in events) if event.start is not None]
+    return indexed, [encode_event(row, event) for row, event in enumerate(indexed)]
+
+
+def chunk_rows(rows: list[str], token_budget: int, model_name: str = model) -> list[list[str]]:
+    """Greedily pack rows into chunks whose encoded size stays under `token_budget`."""
+    chunks, current, used = [], [], count_tokens(EVENT_HEADER, model_name)
+    header_tokens = used
+    for row in rows:
+        tokens = count_tokens(row, model_name) + 1
+        if current and used + tokens > token_budget:
+            chunks.append(current)
+            current, used = [], header_tokens
+        current.append(row)
+        used += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def record_savings(events: list[dict], chunks: list[list[str]], model_name: str = model) -> int:
+    """
+    Tokens saved against the old prompt, which inlined repr() of the full event dicts. Only
+    sampled calls build and tokenize that repr; the rest are estimated from character counts.
+    """
+    prompts = [EVENT_HEADER + "\n" + "\n".join(chunk) for chunk in chunks]
+    chars = sum(len(prompt) for prompt in prompts) or 1
+    if encoding_stats["requests"] % SAVINGS_SAMPLE_EVERY == 0:
+        before = count_tokens(str(events), model_name)
+        after = sum(count_tokens(prompt, model_name) for prompt in prompts)
+        _savings_ratios["before_per_char"] = before / chars
+        _savings_ratios["after_per_char"] = after / chars
+        encoding_stats["sampled"] += 1
+    else:
+        before = round(chars * _savings_ratios["before_per_char"])
+        after = round(chars * _savings_ratios["after_per_char"])
+    saved = before - after
+
+    encoding_stats["requests"] += 1
+    encoding_stats["chunks"] += len(chunks)
+    encoding_stats["tokens_before"] += before
+    encoding_stats["tokens_after"] += after
+    logger.info(f"Compact event encoding: {before} -> {after} tokens ({saved} saved) in {len(chunks)} chunk(s)")
+    return saved
+
+
+def encoding_stats_summary() -> dict:
+    stats = dict(encoding_stats)
+    before = stats.get("tokens_before", 0)
+    stats["tokens_saved"] = before - stats.get("tokens_after", 0)
+    stats["reduction"] = stats["tokens_saved"] / before if before else 0.0
+    return stats
@@ -0,0 +1,157 @@
+import re
+from bisect import bisect_left
+from datetime import datetime, time
+from typing import Optional
+from zoneinfo import ZoneInfo
+from calendar_ai_agent_web_app.backend.schemas.models import ListCalendarEventsFilters, ListedEvents, CalendarEvent
+from calendar_ai_agent_web_app.backend.logic.temporal import DEFAULT_TZ
+
+# Local start-hour windows, [start, end)
+TIME_OF_DAY_WINDOWS = {
+    "morning": (5, 12),
+    "afternoon": (12, 17),
+    "evening": (17, 24),
+    "night": (17, 24),
+}
+
+# Words the list parser emits that describe every event rather than narrowing the query
+GENERIC_KEYWORDS = {
+    "meeting", "meetings", "event", "events", "appointment", "appointments", "calendar",
+    "schedule", "anything", "plans", "plan", "things",
+}
+
+_TOKEN_RE = re.compile(r"[a-z]+|\d+")
+
+
+def _tokens(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _stem(token: str) -> str:
+    return token[:-1] if len(token) > 3 and token.endswith("s") else token
+
+
+def _parse_when(value: dict, tz: ZoneInfo) -> tuple[Optional[datetime], bool]:
+    if not value:
+        return None, False
+    if "dateTime" in value:
+        return datetime.fromisoformat(value["dateTime"].replace("Z", "+00:00")).astimezone(tz), False
+    if "date" in value:
+        return datetime.combine(datetime.fromisoformat(value["date"]).date(), time.min, tzinfo=tz), True
+    return None, False
+
+
+def _aware(value: Optional[datetime], tz: ZoneInfo) -> Optional[datetime]:
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=tz)
+
+
+class IndexedEvent:
+    """A Google event dict with its times parsed and text pre-tokenized once."""
+
+    __slots__ = ("raw", "start", "end", "all_day", "_emails", "_sorted_tokens")
+
+    def __init__(self, raw: dict, tz: ZoneInfo = DEFAULT_TZ):
+        self.raw = raw
+        self.start, self.all_day = _parse_when(raw.get("start"), tz)
+        self.end, _ = _parse_when(raw.get("end"), tz)
+        if self.end is None:
+            self.end = self.start
+        # Text indexes are built on first use, so events rejected by time never pay for them
+        self._emails = None
+        self._sorted_tokens = None
+
+    @property
+    def emails(self) -> set[str]:
+        if self._emails is None:
+            raw = self.raw
+            self._emails = {a["email"].lower() for a in raw.get("attendees") or [] if a.get("email")}
+            for key in ("organizer", "creator"):
+                if (raw.get(key) or {}).get("email"):
+                    self._emails.add(raw[key]["email"].lower())
+        return self._emails
+
+    @property
+    def sorted_tokens(self) -> list[str]:
+        if self._sorted_tokens is None:
+            raw = self.raw
+            words = []
+            for key in ("summary", "description", "location"):
+                words += _tokens(raw.get(key) or "")
+            for attendee in raw.get("attendees") or []:
+                words += _tokens(attendee.get("displayName") or "")
+                words += _tokens((attendee.get("email") or "").split("@")[0])
+            self._sorted_tokens = sorted({_stem(word) for word in words})
+        return self._sorted_tokens
+
+    def has_prefix(self, prefix: str) -> bool:
+        tokens = self.sorted_tokens
+        i = bisect_left(tokens, prefix)
+        return i < len(tokens) and tokens[i].startswith(prefix)
+
+    def matches_participant(self, participant: str) -> bool:
+        participant = participant.strip().lower()
+        if "@" in participant:
+            return participant in self.emails
+        # Names match on token prefixes, so "ethan" finds "ethanchiu@..." and "Ethan Chiu"
+        return all(self.has_prefix(token) for token in _tokens(participant))
+
+    def matches_keyword(self, keyword: str) -> bool:
+        return all(self.has_prefix(_stem(token)) for token in _tokens(keyword))
+
+
+def index_events(events: list[dict], tz: ZoneInfo = DEFAULT_TZ) -> list[IndexedEvent]:
+    return [indexed for indexed in (IndexedEvent(event, tz) for event in events) if indexed.start is not None]
+
+
+def to_calendar_event(event: IndexedEvent) -> CalendarEvent:
+    raw = event.raw
+    return CalendarEvent(
+        title=raw.get("summary") or "(No title)",
+        start_time=event.start,
+        end_time=event.end,
+        participants=[a["email"] for a in raw.get("attendees") or [] if a.get("email")],
+        location=raw.get("location"),
+        description=raw.get("description"),
+    )
+
+
+def specific_keywords(filters: ListCalendarEventsFilters) -> list[str]:
+    return [k for k in filters.keywords or [] if k.strip() and k.strip().lower() not in GENERIC_KEYWORDS]
+
+
+def select_events(indexed: list[IndexedEvent], filters: ListCalendarEventsFilters,
+                  tz: ZoneInfo = DEFAULT_TZ, apply_keywords: bool = True) -> list[IndexedEvent]:
+    """Apply the structured filters to pre-indexed events, in start-time order."""
+    start_time = _aware(filters.start_time, tz)
+    end_time = _aware(filters.end_time, tz)
+    window = TIME_OF_DAY_WINDOWS.get((filters.time_of_day or "").strip().lower())
+    participants = [p for p in filters.participants or [] if p.strip()]
+    keywords = specific_keywords(filters) if apply_keywords else []
+
+    selected = []
+    for event in indexed:
+        if start_time and event.end <= start_time:
+            continue
+        if end_time and event.start >= end_time:
+            continue
+        if window and (event.all_day or not window[0] <= event.start.hour < window[1]):
+            continue
+        if participants and not all(event.matches_participant(p) for p in participants):
+            continue
+        if keywords and not any(event.matches_keyword(k) for k in keywords):
+            continue
+        selected.append(event)
+
+    selected.sort(key=lambda event: event.start)
+    return selected
+
+
+def filter_events(events: list[dict], filters: ListCalendarEventsFilters, tz: ZoneInfo = DEFAULT_TZ) -> ListedEvents:
+    """Deterministic replacement for filter_events_with_llm_async over raw Google event dicts."""
+    matched = select_events(index_events(events, tz), filters, tz)
+    return ListedEvents(
+        query_summary=filters.description,
+        matched_events=[to_calendar_event(event) for event in matched],
+    )
@@ -0,0 +1,349 @@
+import csv
+import hashlib
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Iterator, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from pydantic import ValidationError
+from calendar_ai_agent_web_app.backend.schemas.models import EventDetails
+from calendar_ai_agent_web_app.backend.utils.logger import logger
+
+# EventDetails dates are wall-clock times in the calendar's zone (see logic.calendar.event_window)
+CALENDAR_TZ = ZoneInfo("America/Los_Angeles")
+
+# CSV rows with a start but no end or duration
+DEFAULT_DURATION_MINUTES = 60
+
+# Recurrence lines are handed to Google as-is
+RECURRENCE_PROPERTIES = ("RRULE", "RDATE", "EXDATE", "EXRULE")
+
+
+@dataclass
+class ImportRecord:
+    """
+    One VEVENT or CSV row. `number` counts records from the start of the file (what import
+    checkpoints store); `key` identifies the event across re-exports, and `error` is set
+    instead of `details` when the record can't be mapped. All-day events keep `all_day`, with
+    midnight as their `details.date` and whole days as their duration.
+    """
+    number: int
+    line: int
+    key: str
+    details: Optional[EventDetails] = None
+    recurrence: list[str] = field(default_factory=list)
+    all_day: bool = False
+    error: Optional[str] = None
+
+
+def _content_key(*values) -> str:
+    return hashlib.sha256("\x1f".join(str(value) for value in values).encode()).hexdigest()
+
+
+@lru_cache(maxsize=64)
+def _zone(tzid: Optional[str]) -> ZoneInfo:
+    if not tzid:
+        return CALENDAR_TZ
+    try:
+        return ZoneInfo(tzid.strip('"'))
+    except (ZoneInfoNotFoundError, ValueError):
+        # Outlook exports Windows zone names; the calendar's own zone is the best guess
+        logger.warning(f"Unknown time zone {tzid!r}; treating times as {CALENDAR_TZ.key}")
+        return CALENDAR_TZ
+
+
+def _to_calendar_time(value: datetime) -> datetime:
+    """Naive wall-clock time in CALENDAR_TZ; naive inputs are taken to be in it already."""
+    if value.tzinfo is not None:
+        value = value.astimezone(CALENDAR_TZ).replace(tzinfo=None)
+    return value
+
+
+def _details(name: str, description: str, location: str, start: datetime, minutes: int,
+             participants: list[str]) -> EventDetails:
+    return EventDetails(
+        name=name or "(No title)",
+        description=description or "",
+        location=location or "",
+        date=_to_calendar_time(start).isoformat(),
+        duration_minutes=max(minutes, 0),
+        participants=participants,
+    )
+
+
+# ----------------------------- iCalendar -----------------------------
+_DURATION = re.compile(r"^([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$")
+
+
+def _unfold(lines: Iterator[str]) -> Iterator[tuple[int, str]]:
+    """Content lines with RFC 5545 folding undone, each with the line number it starts on."""
+    current, start = None, 0
+    for number, raw in enumerate(lines, 1):
+        raw = raw.rstrip("\r\n")
+        if raw[:1] in (" ", "\t") and current is not None:
+            current += raw[1:]
+            continue
+        if current is not None:
+            yield start, current
+        current, start = raw, number
+    if current is not None:
+        yield start, current
+
+
+def _split_content_line(line: str) -> tuple[str, dict[str, str], str]:
+    # NAME;PARAM=a;PARAM="b:c":value -- the value starts at the first colon outside quotes
+    quoted = False
+    for index, char in enumerate(line):
+        if char == '"':
+            quoted = not quoted
+        elif char == ":" and not quoted:
+            head, value = line[:index], line[index + 1:]
+            break
+    else:
+        head, value = line, ""
+
+    if '"' in head:
+        name, *params = re.split(r';(?=(?:[^"]*"[^"]*")*[^"]*$)', head)
+    else:
+        name, *params = head.split(";")
+    parsed = {}
+    for param in params:
+        key, _, param_value = param.partition("=")
+        parsed[key.upper()] = param_value
+    return name.upper(), parsed, value
+
+
+def _unescape(text: str) -> str:
+    return re.sub(r"\\([\\;,nN])", lambda m: "\n" if m.group(1) in "nN" else m.group(1), text)
+
+
+def _ics_time(value: str, params: dict[str, str]) -> tuple[datetime, bool]:
+    """(start, is_all_day) for a DTSTART / DTEND value."""
+    value = value.strip()
+    if params.get("VALUE", "").upper() == "DATE" or len(value) == 8:
+        day = datetime.strptime(value[:8], "%Y%m%d")
+        return day, True
+    if value.endswith("Z"):
+        return datetime.strptime(value[:-1], "%Y%m%dT%H%M%S").replace(tzinfo=ZoneInfo("UTC")), False
+    parsed = datetime.strptime(value, "%Y%m%dT%H%M%S")
+    if "TZID" in params:
+        parsed = parsed.replace(tzinfo=_zone(params["TZID"]))
+    return parsed, False
+
+
+def _ics_duration(value: str) -> timedelta:
+    match = _DURATION.match(value.strip().upper())
+    if not match:
+        raise ValueError(f"bad DURATION {value!r}")
+    sign, weeks, days, hours, minutes, seconds = match.groups()
+    delta = timedelta(weeks=int(weeks or 0), days=int(days or 0), hours=int(hours or 0),
+                      minutes=int(minutes or 0), seconds=int(seconds or 0))
+    return -delta if sign == "-" else delta
+
+
+def _ics_record(number: int, line: int, properties: list[tuple[str, dict, str, str]]) -> ImportRecord:
+    first = {}
+    attendees, recurrence = [], []
+    for name, params, value, raw in properties:
+        if name == "ATTENDEE":
+            email = value.split(":", 1)[1] if value.lower().startswith("mailto:") else value
+            if "@" in email:
+                attendees.append(email)
+        elif name in RECURRENCE_PROPERTIES:
+            recurrence.append(raw)
+        else:
+            first.setdefault(name, (params, value))
+
+    uid = first.get("UID", ({}, ""))[1]
+    recurrence_id = first.get("RECURRENCE-ID", ({}, ""))[1]
+    summary = _unescape(first.get("SUMMARY", ({}, ""))[1])
+    key = _content_key("ics", uid, recurrence_id) if uid else _content_key(
+        "ics", summary, first.get("DTSTART", ({}, ""))[1]
+    )
+    record = ImportRecord(number=number, line=line, key=key, recurrence=recurrence)
+
+    try:
+        if "DTSTART" not in first:
+            raise ValueError("missing DTSTART")
+        if recurrence_id:
+            # Moved/edited instances of a series need events.import against the parent; not handled here
+            raise ValueError("recurrence override (RECURRENCE-ID) skipped")
+        if first.get("STATUS", ({}, ""))[1].upper() == "CANCELLED":
+            raise ValueError("cancelled event skipped")
+
+        start, all_day = _ics_time(first["DTSTART"][1], first["DTSTART"][0])
+        if "DTEND" in first:
+            end, _ = _ics_time(first["DTEND"][1], first["DTEND"][0])
+            if end.tzinfo is None and start.tzinfo is not None:
+                end = end.replace(tzinfo=start.tzinfo)
+            elif start.tzinfo is None and end.tzinfo is not None:
+                end = _to_calendar_time(end)
+            length = end - start
+        elif "DURATION" in first:
+            length = _ics_duration(first["DURATION"][1])
+        else:
+            # RFC 5545: a date lasts the day, a date-time has no length
+            length = timedelta(days=1) if all_day else timedelta(0)
+
+        record.all_day = all_day
+        record.details = _details(
+            summary, _unescape(first.get("DESCRIPTION", ({}, ""))[1]),
+            _unescape(first.get("LOCATION", ({}, ""))[1]), start, int(length.total_seconds() // 60), attendees
+        )
+    except (ValueError, ValidationError) as e:
+        record.error = str(e)
+    return record
+
+
+def iter_ics(lines: Iterator[str]) -> Iterator[ImportRecord]:
+    """VEVENTs from an iCalendar stream, one at a time; nothing but the current event is held."""
+    depth_names: list[str] = []
+    properties: list[tuple[str, dict, str, str]] = []
+    number = 0
+    event_line = 0
+
+    for line_number, line in _unfold(lines):
+        if not line:
+            continue
+        name, params, value = _split_content_line(line)
+        if name == "BEGIN":
+            depth_names.append(value.upper())
+            if depth_names[-1] == "VEVENT":
+                properties, event_line = [], line_number
+        elif name == "END":
+            if depth_names and depth_names[-1] == "VEVENT" and value.upper() == "VEVENT":
+                yield _ics_record(number, event_line, properties)
+                number += 1
+            if depth_names:
+                depth_names.pop()
+        elif depth_names and depth_names[-1] == "VEVENT":
+            # Properties of nested components (VALARM) are skipped by the check above
+            properties.append((name, params, value, line))
+
+
+# ----------------------------- CSV -----------------------------
+# Normalized header -> field. Covers the Google Calendar / Outlook export columns and a plain
+# name,date,duration_minutes,... layout
+CSV_COLUMNS = {
+    "subject": "name", "summary": "name", "title": "name", "name": "name", "event": "name",
+    "start": "start", "startdatetime": "start", "date": "start", "dtstart": "start",
+    "startdate": "start_date", "starttime": "start_time",
+    "end": "end", "enddatetime": "end", "dtend": "end",
+    "enddate": "end_date", "endtime": "end_time",
+    "durationminutes": "duration_minutes", "duration": "duration_minutes",
+    "alldayevent": "all_day", "allday": "all_day",
+    "location": "location", "description": "description", "notes": "description",
+    "participants": "participants", "attendees": "participants", "guests": "participants",
+    "uid": "uid", "id": "uid",
+}
+
+_CSV_DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%m/%d/%y")
+_CSV_TIME_FORMATS = ("%H:%M", "%H:%M:%S", "%I:%M %p", "%I:%M:%S %p", "%I:%M%p")
+
+
+def _normalize_header(header: str) -> str:
+    return re.sub(r"[^a-z]", "", header.lower())
+
+
+def _csv_datetime(value: str) -> datetime:
+    value = value.strip()
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        pass
+    day_part, _, time_part = value.partition(" ")
+    try:
+        return datetime.combine(_csv_date(day_part), _csv_time(time_part) if time_part else datetime.min.time())
+    except ValueError:
+        raise ValueError(f"unrecognized date/time {value!r}") from None
+
+
+def _csv_date(value: str) -> date:
+    for fmt in _CSV_DATE_FORMATS:
+        try:
+            return datetime.strptime(value.strip(), fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"unrecognized date {value!r}")
+
+
+def _csv_time(value: str):
+    for fmt in _CSV_TIME_FORMATS:
+        try:
+            return datetime.strptime(value.strip().upper(), fmt).time()
+        except ValueError:
+            continue
+    raise ValueError(f"unrecognized time {value!r}")
+
+
+def _csv_when(row: dict, prefix: str) -> Optional[datetime]:
+    if row.get(prefix):
+        return _csv_datetime(row[prefix])
+    if row.get(f"{prefix}_date"):
+        day = _csv_date(row[f"{prefix}_date"])
+        when = row.get(f"{prefix}_time")
+        return datetime.combine(day, _csv_time(when) if when else datetime.min.time())
+    return None
+
+
+def _csv_record(number: int, line: int, row: dict) -> ImportRecord:
+    key = _content_key("csv", row["uid"]) if row.get("uid") else _content_key(
+        "csv", row.get("name"), row.get("start"), row.get("start_date"), row.get("start_time"),
+        row.get("location")
+    )
+    record = ImportRecord(number=number, line=line, key=key)
+    try:
+        start = _csv_when(row, "start")
+        if start is None:
+            raise ValueError("missing start")
+        all_day = (row.get("all_day") or "").strip().lower() in ("true", "yes", "1")
+
+        end = _csv_when(row, "end")
+        if row.get("duration_minutes"):
+            minutes = int(float(row["duration_minutes"]))
+        elif end is not None:
+            # All-day exports give the last day itself as the end date
+            minutes = int(((end + timedelta(days=1) if all_day else end) - start).total_seconds() // 60)
+        else:
+            minutes = 24 * 60 if all_day else DEFAULT_DURATION_MINUTES
+
+        participants = [p.strip() for p in re.split(r"[;,]", row.get("participants") or "") if "@" in p]
+        record.all_day = all_day
+        record.details = _details(row.get("name", ""), row.get("description", ""), row.get("location", ""),
+                                  start, minutes, participants)
+    except (ValueError, ValidationError) as e:
+        record.error = str(e)
+    return record
+
+
+def iter_csv(lines: Iterator[str]) -> Iterator[ImportRecord]:
+    """Rows of a CSV stream with a header row, mapped by CSV_COLUMNS; read one row at a time."""
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        return
+    fields = [CSV_COLUMNS.get(_normalize_header(column)) for column in header]
+    if "name" not in fields or not {"start", "start_date"} & set(fields):
+        raise ValueError(f"CSV header needs a title and a start column, got {header}")
+
+    number = 0
+    line = reader.line_num + 1
+    for values in reader:
+        if any(value.strip() for value in values):
+            row = {name: value for name, value in zip(fields, values) if name}
+            yield _csv_record(number, line, row)
+            number += 1
+        line = reader.line_num + 1
+
+
+def detect_format(path: str) -> str:
+    return "csv" if path.lower().endswith(".csv") else "ics"
+
+
+def iter_records(path: str, fmt: Optional[str] = None) -> Iterator[ImportRecord]:
+    """Stream the records of an .ics or .csv file."""
+    fmt = fmt or detect_format(path)
+    # newline="" keeps quoted newlines inside CSV fields intact
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        yield from (iter_csv(f) if fmt == "csv" else iter_ics(f))
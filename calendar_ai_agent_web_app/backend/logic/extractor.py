@@ -1,12 +1,23 @@
 from datetime import datetime
 from calendar_ai_agent_web_app.backend.schemas.models import EventExtraction
 from calendar_ai_agent_web_app.backend.utils.logger import logger
-from calendar_ai_agent_web_app.backend.config import client, model, model_list_event, model_calendar
+from calendar_ai_agent_web_app.backend.utils.metrics import instrumented
+from calendar_ai_agent_web_app.backend.config import model_list_event, model_calendar
+from calendar_ai_agent_web_app.backend.logic.llm import parse_completion_async
+from calendar_ai_agent_web_app.backend.logic.llm_cache import llm_cache
 
 
-def extract_event_info(user_input: str) -> EventExtraction:
-    logger.info("Starting event extraction analysis")
+def _failed_extraction(user_input: str) -> EventExtraction:
+    return EventExtraction(
+        description=user_input,
+        is_calendar_event=False,
+        is_calendar_modify_event=False,
+        is_list_events=False,
+        confidence_score=0.0
+    )
+
 
+def _event_info_messages(user_input: str) -> list[dict]:
     date_context = f"Today is {datetime.now().strftime('%A, %B %d, %Y')}."
 
     messages = [
@@ -35,79 +46,75 @@ def extract_event_info(user_input: str) -> EventExtraction:
         }
     ]
 
+    return messages
+
+
+def _validate_event_extraction(parsed: EventExtraction, user_input: str) -> EventExtraction:
+    desc = parsed.description.strip()
+    desc_lower = desc.lower()
+
+    # 🚨 Reject or patch hallucinated "guide" outputs
+    if "guide" in desc_lower:
+        logger.warning(f"LLM hallucinated instructional phrasing: '{desc}'")
+
+        # Normalize common hallucinations
+        guide_variants = [
+            "guide user to", "guide to", "guide user on", "guide on",
+            "Guide user to", "Guide to", "Guide user on", "Guide on"
+        ]
+        for variant in guide_variants:
+            if variant in parsed.description:
+                parsed.description = parsed.description.replace(variant, "").strip()
+
+        # Try to recover intent by keyword
+        if "schedule" in parsed.description.lower():
+            parsed.is_calendar_event = True
+            parsed.is_calendar_modify_event = False
+            parsed.is_list_events = False
+            logger.warning("Auto-corrected classification to is_calendar_event=True")
+
+        elif "reschedule" in parsed.description.lower() or "modify" in parsed.description.lower():
+            parsed.is_calendar_event = False
+            parsed.is_calendar_modify_event = True
+            parsed.is_list_events = False
+            logger.warning("Auto-corrected classification to is_calendar_modify_event=True")
+
+        elif "list" in parsed.description.lower() or "show" in parsed.description.lower():
+            parsed.is_calendar_event = False
+            parsed.is_calendar_modify_event = False
+            parsed.is_list_events = True
+            logger.warning("Auto-corrected classification to is_list_events=True")
+
+        else:
+            logger.error("Unrecognized 'guide' phrasing — rejecting output")
+            return _failed_extraction(user_input)
+
+    logger.info(f"Validated event extraction: {parsed}")
+    return parsed
+
+
+@instrumented("extract_event_info")
+async def extract_event_info_async(user_input: str) -> EventExtraction:
+    logger.info("Starting event extraction analysis")
+
+    cached = llm_cache.get("extract_event_info", model_calendar, user_input, EventExtraction)
+    if cached is not None:
+        logger.info(f"Event extraction served from cache: {cached}")
+        return cached
+
     try:
-        response = client.beta.chat.completions.parse(
-            model="ft:gpt-4.1-mini-2025-04-14:personal:is-calendar-event-model:C0isXu9v",
-            messages=messages,
-            response_format=EventExtraction
-        )
-
-        logger.info(f"Using model: ft:gpt-4.1-mini-2025-04-14:personal:is-calendar-event-model:C0isXu9v")
-
-        parsed = response.choices[0].message.parsed
-
-        desc = parsed.description.strip()
-        desc_lower = desc.lower()
-
-        # 🚨 Reject or patch hallucinated "guide" outputs
-        if "guide" in desc_lower:
-            logger.warning(f"LLM hallucinated instructional phrasing: '{desc}'")
-
-            # Normalize common hallucinations
-            guide_variants = [
-                "guide user to", "guide to", "guide user on", "guide on",
-                "Guide user to", "Guide to", "Guide user on", "Guide on"
-            ]
-            for variant in guide_variants:
-                if variant in parsed.description:
-                    parsed.description = parsed.description.replace(variant, "").strip()
-
-            # Try to recover intent by keyword
-            if "schedule" in parsed.description.lower():
-                parsed.is_calendar_event = True
-                parsed.is_calendar_modify_event = False
-                parsed.is_list_events = False
-                logger.warning("Auto-corrected classification to is_calendar_event=True")
-
-            elif "reschedule" in parsed.description.lower() or "modify" in parsed.description.lower():
-                parsed.is_calendar_event = False
-                parsed.is_calendar_modify_event = True
-                parsed.is_list_events = False
-                logger.warning("Auto-corrected classification to is_calendar_modify_event=True")
-
-            elif "list" in parsed.description.lower() or "show" in parsed.description.lower():
-                parsed.is_calendar_event = False
-                parsed.is_calendar_modify_event = False
-                parsed.is_list_events = True
-                logger.warning("Auto-corrected classification to is_list_events=True")
-
-            else:
-                logger.error("Unrecognized 'guide' phrasing — rejecting output")
-                return EventExtraction(
-                    description=user_input,
-                    is_calendar_event=False,
-                    is_calendar_modify_event=False,
-                    is_list_events=False,
-                    confidence_score=0.0
-                )
-
-        logger.info(f"Validated event extraction: {parsed}")
-        return parsed
+        parsed = await parse_completion_async(_event_info_messages(user_input), EventExtraction, model_calendar)
+        logger.info(f"Using model: {model_calendar}")
+        validated = _validate_event_extraction(parsed, user_input)
+        llm_cache.put("extract_event_info", model_calendar, user_input, validated)
+        return validated
 
     except Exception as e:
         logger.exception("Failed to extract event info from LLM response")
-        return EventExtraction(
-            description=user_input,
-            is_calendar_event=False,
-            is_calendar_modify_event=False,
-            is_list_events=False,
-            confidence_score=0.0
-        )
+        return _failed_extraction(user_input)
 
 
-def extract_list_event_info(user_input: str) -> EventExtraction:
-    logger.info("Trying list event extraction with fine tuned model")
-
+def _list_event_info_messages(user_input: str) -> list[dict]:
     date_context = f"Today is {datetime.now().strftime('%A, %B %d, %Y')}."
 
     messages = [
@@ -176,24 +183,25 @@ Only output JSON. Do not explain.
         {"role": "user", "content": user_input}
     ]
 
-    try:
-        response = client.beta.chat.completions.parse(
-            model=model_list_event,
-            messages=messages,
-            response_format=EventExtraction
-        )
+    return messages
+
 
-        parsed = response.choices[0].message.parsed
+@instrumented("extract_list_event_info")
+async def extract_list_event_info_async(user_input: str) -> EventExtraction:
+    logger.info("Trying list event extraction with fine tuned model")
+
+    cached = llm_cache.get("extract_list_event_info", model_list_event, user_input, EventExtraction)
+    if cached is not None:
+        logger.info(f"List event extraction served from cache: {cached}")
+        return cached
+
+    try:
+        parsed = await parse_completion_async(_list_event_info_messages(user_input), EventExtraction, model_list_event)
         logger.info(f"Parsed event extraction: {parsed}")
+        llm_cache.put("extract_list_event_info", model_list_event, user_input, parsed)
 
         return parsed
 
     except Exception as e:
         logger.exception("Failed to extract event info from LLM response")
-        return EventExtraction(
-            description=user_input,
-            is_calendar_event=False,
-            is_calendar_modify_event=False,
-            is_list_events=False,
-            confidence_score=0.0
-        )
+        return _failed_extraction(user_input)
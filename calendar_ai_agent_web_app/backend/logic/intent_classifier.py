@@ -0,0 +1,239 @@
+import argparse
+import json
+import os
+import re
+from collections import Counter
+from typing import Optional
+import numpy as np
+from calendar_ai_agent_web_app.backend.schemas.models import EventExtraction
+from calendar_ai_agent_web_app.backend.utils.logger import logger
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRAINING_FILES = [
+    os.path.join(BASE_DIR, "calendar_training_data.jsonl"),
+    os.path.join(BASE_DIR, "list_calendar_training_data.jsonl"),
+]
+MODEL_PATH = os.path.join(BASE_DIR, "models", "intent_classifier.json")
+
+CLASSES = ["create", "modify", "list"]
+NGRAM_RANGE = (2, 4)
+_WORD_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+
+def _normalize(text: str) -> str:
+    return " ".join(_WORD_RE.findall(text.lower()))
+
+
+def _features(text: str) -> Counter:
+    """Word unigrams plus char n-grams taken inside word boundaries (like sklearn's char_wb)."""
+    normalized = _normalize(text)
+    feats = Counter(f"w:{word}" for word in normalized.split())
+    for word in normalized.split():
+        padded = f" {word} "
+        for n in range(NGRAM_RANGE[0], NGRAM_RANGE[1] + 1):
+            for i in range(len(padded) - n + 1):
+                feats[f"c:{padded[i:i + n]}"] += 1
+    return feats
+
+
+def _label(extraction: dict) -> Optional[str]:
+    if extraction.get("is_calendar_event"):
+        return "create"
+    if extraction.get("is_calendar_modify_event"):
+        return "modify"
+    if extraction.get("is_list_events"):
+        return "list"
+    return None
+
+
+def load_training_data(paths: list[str] = TRAINING_FILES) -> tuple[list[str], list[str]]:
+    """Read the fine-tuning JSONL files and return (user texts, intent labels)."""
+    texts, labels = [], []
+    for path in paths:
+        with open(path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                messages = json.loads(line)["messages"]
+                user = [m["content"] for m in messages if m["role"] == "user"][-1]
+                label = _label(json.loads(messages[-1]["content"]))
+                if label:
+                    texts.append(user)
+                    labels.append(label)
+    return texts, labels
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = logits - logits.max(axis=1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+class LocalIntentClassifier:
+    """
+    TF-IDF (word + char n-gram) multinomial logistic regression over the three
+    calendar intents, with temperature-scaled probabilities.
+
+    Inputs that look nothing like the training data get their confidence scaled
+    down by how far they sit from the nearest class centroid, so off-topic text
+    falls through to the remote models instead of being forced into a class.
+    """
+
+    def __init__(self, vocabulary: dict[str, int], idf: np.ndarray, weights: np.ndarray, bias: np.ndarray,
+                 temperature: float, centroids: np.ndarray, similarity_floor: float, classes: list[str] = CLASSES):
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.weights = weights
+        self.bias = bias
+        self.temperature = temperature
+        self.centroids = centroids
+        self.similarity_floor = similarity_floor
+        self.classes = classes
+
+    # ----------------------------- Vectorization -----------------------------
+    @staticmethod
+    def _fit_vocabulary(texts: list[str]) -> tuple[dict[str, int], np.ndarray]:
+        doc_freq = Counter()
+        for text in texts:
+            doc_freq.update(_features(text).keys())
+        vocabulary = {feat: i for i, feat in enumerate(sorted(doc_freq))}
+        n_docs = len(texts)
+        idf = np.array([np.log((1 + n_docs) / (1 + doc_freq[feat])) + 1 for feat in vocabulary])
+        return vocabulary, idf
+
+    def _vectorize(self, texts: list[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), len(self.vocabulary)))
+        for row, text in enumerate(texts):
+            for feat, count in _features(text).items():
+                col = self.vocabulary.get(feat)
+                if col is not None:
+                    matrix[row, col] = 1 + np.log(count)
+        matrix *= self.idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        return matrix / norms
+
+    # ----------------------------- Training -----------------------------
+    @staticmethod
+    def _fit_weights(X: np.ndarray, y: np.ndarray, n_classes: int, l2: float = 1e-3,
+                     learning_rate: float = 2.0, epochs: int = 500) -> tuple[np.ndarray, np.ndarray]:
+        targets = np.eye(n_classes)[y]
+        weights = np.zeros((X.shape[1], n_classes))
+        bias = np.zeros(n_classes)
+        for _ in range(epochs):
+            probs = _softmax(X @ weights + bias)
+            grad = (probs - targets) / len(X)
+            weights -= learning_rate * (X.T @ grad + l2 * weights)
+            bias -= learning_rate * grad.sum(axis=0)
+        return weights, bias
+
+    @staticmethod
+    def _fit_temperature(logits: np.ndarray, y: np.ndarray) -> float:
+        best_t, best_nll = 1.0, float("inf")
+        for t in np.linspace(0.25, 5.0, 96):
+            probs = _softmax(logits / t)
+            nll = -np.log(probs[np.arange(len(y)), y] + 1e-12).mean()
+            if nll < best_nll:
+                best_t, best_nll = float(t), nll
+        return best_t
+
+    @classmethod
+    def train(cls, texts: list[str], labels: list[str], folds: int = 5, seed: int = 0) -> "LocalIntentClassifier":
+        y = np.array([CLASSES.index(label) for label in labels])
+        vocabulary, idf = cls._fit_vocabulary(texts)
+        model = cls(vocabulary, idf, np.zeros((len(vocabulary), len(CLASSES))), np.zeros(len(CLASSES)),
+                    1.0, np.zeros((len(CLASSES), len(vocabulary))), 0.0)
+        X = model._vectorize(texts)
+
+        # Calibrate the temperature on out-of-fold logits so it reflects unseen inputs
+        order = np.random.default_rng(seed).permutation(len(texts))
+        oof_logits = np.zeros((len(texts), len(CLASSES)))
+        for fold in range(folds):
+            held_out = order[fold::folds]
+            train_idx = np.setdiff1d(order, held_out)
+            weights, bias = cls._fit_weights(X[train_idx], y[train_idx], len(CLASSES))
+            oof_logits[held_out] = X[held_out] @ weights + bias
+        model.temperature = cls._fit_temperature(oof_logits, y)
+
+        model.weights, model.bias = cls._fit_weights(X, y, len(CLASSES))
+
+        centroids = np.stack([X[y == c].mean(axis=0) for c in range(len(CLASSES))])
+        centroids /= np.linalg.norm(centroids, axis=1, keepdims=True)
+        model.centroids = centroids
+        model.similarity_floor = float(np.percentile((X @ centroids.T).max(axis=1), 25))
+        return model
+
+    # ----------------------------- Inference -----------------------------
+    def predict_proba(self, texts: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        X = self._vectorize(texts)
+        probs = _softmax((X @ self.weights + self.bias) / self.temperature)
+        similarity = (X @ self.centroids.T).max(axis=1)
+        return probs, similarity
+
+    def predict(self, user_input: str) -> EventExtraction:
+        probs, similarity = self.predict_proba([user_input])
+        best = int(probs[0].argmax())
+        coverage = min(1.0, float(similarity[0]) / self.similarity_floor) if self.similarity_floor > 0 else 1.0
+        intent = self.classes[best]
+
+        return EventExtraction(
+            description=user_input.strip(),
+            is_calendar_event=intent == "create",
+            is_calendar_modify_event=intent == "modify",
+            is_list_events=intent == "list",
+            confidence_score=round(float(probs[0, best]) * coverage, 4),
+        )
+
+    # ----------------------------- Persistence -----------------------------
+    def save(self, path: str = MODEL_PATH) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        features = sorted(self.vocabulary, key=self.vocabulary.get)
+        artifact = {
+            "classes": self.classes,
+            "features": features,
+            "idf": np.round(self.idf, 6).tolist(),
+            "weights": np.round(self.weights, 6).tolist(),
+            "bias": np.round(self.bias, 6).tolist(),
+            "temperature": self.temperature,
+            "centroids": np.round(self.centroids, 6).tolist(),
+            "similarity_floor": self.similarity_floor,
+        }
+        with open(path, "w") as f:
+            json.dump(artifact, f)
+
+    @classmethod
+    def load(cls, path: str = MODEL_PATH) -> "LocalIntentClassifier":
+        with open(path) as f:
+            artifact = json.load(f)
+        return cls(
+            vocabulary={feat: i for i, feat in enumerate(artifact["features"])},
+            idf=np.array(artifact["idf"]),
+            weights=np.array(artifact["weights"]),
+            bias=np.array(artifact["bias"]),
+            temperature=artifact["temperature"],
+            centroids=np.array(artifact["centroids"]),
+            similarity_floor=artifact["similarity_floor"],
+            classes=artifact["classes"],
+        )
+
+
+def load_intent_classifier(path: str = MODEL_PATH) -> Optional[LocalIntentClassifier]:
+    if not os.path.exists(path):
+        logger.warning(f"No local intent classifier at {path}; using remote models only")
+        return None
+    classifier = LocalIntentClassifier.load(path)
+    logger.info(f"Loaded local intent classifier ({len(classifier.vocabulary)} features)")
+    return classifier
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the local intent classifier.")
+    parser.add_argument("--output", default=MODEL_PATH)
+    args = parser.parse_args()
+
+    texts, labels = load_training_data()
+    LocalIntentClassifier.train(texts, labels).save(args.output)
+    print(f"Trained on {len(texts)} examples, saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import AsyncIterator, Optional, Type, TypeVar
+from pydantic import BaseModel
+from calendar_ai_agent_web_app.backend.config import client, async_client, model
+from calendar_ai_agent_web_app.backend.utils.metrics import record_llm_call
+
+T = TypeVar("T", bound=BaseModel)
+
+# Token usage of the calls made in the current context (e.g. one speculative branch)
+_usage: ContextVar[Optional[Counter]] = ContextVar("llm_usage", default=None)
+
+
+def track_usage() -> Counter:
+    """Start counting token usage for calls made from the current context (task/thread) onward."""
+    usage = Counter()
+    _usage.set(usage)
+    return usage
+
+
+def _record_usage(completion) -> None:
+    usage = _usage.get()
+    if usage is None or completion.usage is None:
+        return
+    usage["calls"] += 1
+    usage["prompt_tokens"] += completion.usage.prompt_tokens
+    usage["completion_tokens"] += completion.usage.completion_tokens
+
+
+def _observe(model_name: str, started: float, completion=None, ok: bool = True) -> None:
+    """Latency, outcome and token counts for /metrics."""
+    usage = getattr(completion, "usage", None)
+    record_llm_call(model_name, time.perf_counter() - started, ok,
+                    usage.prompt_tokens if usage else 0, usage.completion_tokens if usage else 0)
+
+
+def parse_completion(messages: list[dict], response_format: Type[T], model_name: str = model) -> T:
+    started = time.perf_counter()
+    try:
+        completion = client.beta.chat.completions.parse(
+            model=model_name,
+            messages=messages,
+            response_format=response_format,
+        )
+    except Exception:
+        _observe(model_name, started, ok=False)
+        raise
+    _observe(model_name, started, completion)
+    _record_usage(completion)
+    return completion.choices[0].message.parsed
+
+
+async def parse_completion_async(messages: list[dict], response_format: Type[T], model_name: str = model) -> T:
+    started = time.perf_counter()
+    try:
+        completion = await async_client.beta.chat.completions.parse(
+            model=model_name,
+            messages=messages,
+            response_format=response_format,
+        )
+    except Exception:
+        _observe(model_name, started, ok=False)
+        raise
+    _observe(model_name, started, completion)
+    _record_usage(completion)
+    return completion.choices[0].message.parsed
+
+
+async def stream_completion_async(messages: list[dict], model_name: str = model) -> AsyncIterator[str]:
+    """Plain-text completion, yielded as content deltas as they arrive."""
+    started = time.perf_counter()
+    last = None
+    try:
+        stream = await async_client.chat.completions.create(
+            model=model_name,
+            messages=messages,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        async with stream:
+            async for chunk in stream:
+                # The usage-only chunk comes last, with no choices
+                _record_usage(chunk)
+                last = chunk
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+    except Exception:
+        _observe(model_name, started, ok=False)
+        raise
+    _observe(model_name, started, last)
@@ -0,0 +1,204 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+from datetime import date, datetime
+from typing import Optional, Type, TypeVar
+from pydantic import BaseModel, ValidationError
+from calendar_ai_agent_web_app.backend.logic.temporal import DEFAULT_TZ
+from calendar_ai_agent_web_app.backend.config import (
+    llm_cache_enabled, llm_cache_size, llm_cache_ttl, llm_cache_path, llm_cache_disk_size
+)
+from calendar_ai_agent_web_app.backend.utils.logger import logger
+
+T = TypeVar("T", bound=BaseModel)
+
+_SPACE_RE = re.compile(r"\s+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    stage TEXT NOT NULL,
+    day TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS llm_cache_by_expiry ON llm_cache (expires_at);
+"""
+
+
+def normalize(text: str) -> str:
+    """Case, whitespace and trailing punctuation don't change what the model returns."""
+    return _SPACE_RE.sub(" ", text.strip().lower()).rstrip(" ?.!")
+
+
+def _day_context() -> str:
+    # Prompts embed "Today is ..." from both the server clock and Los Angeles time
+    return f"{date.today().isoformat()}|{datetime.now(DEFAULT_TZ).date().isoformat()}"
+
+
+class LLMResponseCache:
+    """
+    Structured-output responses keyed by (stage, model, day, normalized input).
+
+    The memory tier is an LRU bounded by `max_entries` with a per-entry TTL. The
+    optional SQLite tier at `path` survives restarts; it sheds expired rows when
+    opened and on every write, and keeps at most `max_disk_entries` rows. Every
+    entry belongs to the day it was computed on, and both tiers drop earlier days
+    as soon as the date rolls over, because the prompts' date context has changed.
+    """
+
+    def __init__(self, max_entries: int = llm_cache_size, ttl: float = llm_cache_ttl,
+                 path: Optional[str] = llm_cache_path, enabled: bool = llm_cache_enabled,
+                 max_disk_entries: int = llm_cache_disk_size):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.enabled = enabled
+        self.max_disk_entries = max_disk_entries
+
+        self._entries: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._day = _day_context()
+        self._stats = Counter()
+        self._stage_stats: defaultdict[str, Counter] = defaultdict(Counter)
+
+        self._conn = None
+        # Upper bound on the SQLite tier's row count, so the cap is only enforced when it may be exceeded
+        self._disk_rows = 0
+        if enabled and path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.executescript(_SCHEMA)
+            with self._lock:
+                # Rows left over from earlier days or past their TTL were never going to be read
+                with self._conn:
+                    self._conn.execute("DELETE FROM llm_cache WHERE day != ?", (self._day,))
+                self._prune_disk_locked(exact=True)
+
+    def _key(self, stage: str, model_name: str, text: str) -> str:
+        raw = json.dumps([stage, model_name, self._day, normalize(text)])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _roll_day_locked(self) -> None:
+        today = _day_context()
+        if today == self._day:
+            return
+        self._day = today
+        self._entries.clear()
+        if self._conn is not None:
+            with self._conn:
+                self._conn.execute("DELETE FROM llm_cache WHERE day != ?", (today,))
+        self._stats["day_rollovers"] += 1
+        logger.info("Date changed; cleared LLM response cache")
+
+    def get(self, stage: str, model_name: str, text: str, response_format: Type[T]) -> Optional[T]:
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        with self._lock:
+            self._roll_day_locked()
+            key = self._key(stage, model_name, text)
+
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self._stage_stats[stage]["memory_hits"] += 1
+                value = entry[1]
+            else:
+                if entry is not None:
+                    del self._entries[key]
+                value = None
+                if self._conn is not None:
+                    row = self._conn.execute(
+                        "SELECT expires_at, value FROM llm_cache WHERE key = ? AND expires_at > ?", (key, now)
+                    ).fetchone()
+                    if row:
+                        # Promote to memory for the rest of its lifetime
+                        self._entries[key] = row
+                        self._evict_locked()
+                        self._stage_stats[stage]["disk_hits"] += 1
+                        value = row[1]
+                if value is None:
+                    self._stage_stats[stage]["misses"] += 1
+                    return None
+
+        try:
+            return response_format.model_validate_json(value)
+        except ValidationError:
+            # Schema changed since the entry was written
+            logger.warning(f"Dropping stale {stage} cache entry")
+            with self._lock:
+                self._entries.pop(key, None)
+                if self._conn is not None:
+                    with self._conn:
+                        self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._stats["stale_dropped"] += 1
+            return None
+
+    def put(self, stage: str, model_name: str, text: str, value: BaseModel) -> None:
+        if not self.enabled:
+            return
+
+        expires_at = time.time() + self.ttl
+        payload = value.model_dump_json()
+        with self._lock:
+            self._roll_day_locked()
+            key = self._key(stage, model_name, text)
+            self._entries[key] = (expires_at, payload)
+            self._entries.move_to_end(key)
+            self._evict_locked()
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO llm_cache (key, stage, day, expires_at, value) VALUES (?, ?, ?, ?, ?)",
+                        (key, stage, self._day, expires_at, payload),
+                    )
+                self._disk_rows += 1
+                self._prune_disk_locked(exact=self._disk_rows > self.max_disk_entries)
+
+    def _evict_locked(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _prune_disk_locked(self, exact: bool) -> None:
+        """
+        Delete expired rows (a range scan on the expiry index). With `exact`, count the rest
+        and drop the soonest-expiring ones beyond `max_disk_entries`.
+        """
+        with self._conn:
+            expired = self._conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),)).rowcount
+            self._disk_rows -= expired
+            self._stats["disk_expired"] += expired
+            if not exact:
+                return
+            (self._disk_rows,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+            excess = self._disk_rows - self.max_disk_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY expires_at LIMIT ?)",
+                    (excess,),
+                )
+                self._disk_rows -= excess
+                self._stats["disk_evictions"] += excess
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stages = {stage: dict(counts) for stage, counts in self._stage_stats.items()}
+
+        for counts in stages.values():
+            hits = counts.get("memory_hits", 0) + counts.get("disk_hits", 0)
+            lookups = hits + counts.get("misses", 0)
+            counts["hit_rate"] = hits / lookups if lookups else 0.0
+        stats["enabled"] = self.enabled
+        stats["disk_tier"] = self._conn is not None
+        stats["disk_entries"] = self._disk_rows
+        stats["stages"] = stages
+        return stats
+
+llm_cache = LLMResponseCache()
@@ -1,12 +1,138 @@
-from datetime import datetime
-from calendar_ai_agent_web_app.backend.schemas.models import EventDetails, EventUpdateDetails, ListCalendarEventsFilters
+import json
+import re
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Optional
+from calendar_ai_agent_web_app.backend.schemas.models import (
+    EventDetails, EventUpdateDetails, ListCalendarEventsFilters, FindTimeRequest
+)
 from calendar_ai_agent_web_app.backend.utils.logger import logger
-from calendar_ai_agent_web_app.backend.config import client, model
+from calendar_ai_agent_web_app.backend.utils.metrics import instrumented
+from calendar_ai_agent_web_app.backend.logic.llm import parse_completion_async
+from calendar_ai_agent_web_app.backend.logic.llm_cache import llm_cache
+from calendar_ai_agent_web_app.backend.config import model, scheduler_horizon_days
+from calendar_ai_agent_web_app.backend.logic.temporal import (
+    TemporalResolution, DEFAULT_TZ, NUMBER_WORDS, resolve, event_fields, modify_fields, week_range
+)
 from zoneinfo import ZoneInfo
 
-def parse_calendar_event_details(description: str) -> EventDetails:
-    logger.info("Starting calendar event parsing")
+# Resolver vs. LLM call counts and time spent, for comparing the two paths
+parser_stats = Counter()
+
+CREATE_VERBS = re.compile(r"^(?:please\s+)?(?:schedule|book|add|create|set\s+up|arrange|plan|put)\s+(?:in\s+)?(?:a|an|the|my)?\s*", re.I)
+MODIFY_VERBS = re.compile(r"^(?:please\s+)?(?:reschedule|move|change|shift|push|update|modify)\s+(?:the|my)?\s*", re.I)
+_LEADING_PREPOSITION = re.compile(r"\b(?:on|at|for|from|to|by|between)\s*$", re.I)
+_TITLE_STOPWORDS = {"to", "about", "for", "regarding", "re", "on", "at", "in", "from", "and", "so", "because", "that"}
+# Leftovers the shortcut can't interpret: negations, and punctuation outside a "with A, B and C" list
+_NEGATION = re.compile(r"\b(?:not|no|never|without|except|instead|unless|cancel(?:led)?|(?:do|does|is|wo)n'?t)\b", re.I)
+_STRAY_PUNCTUATION = re.compile(r"[,;:!?()\[\]{}\"/\\|]|(?:^|\s)[-.'&](?:\s|$)")
+_PARTICIPANT = re.compile(r"[\w.'@+-]+(?:\s+[\w.'@+-]+){0,2}")
+
+
+def _strip_temporal(description: str, resolution: TemporalResolution) -> str:
+    chars = list(description)
+    for start, end in resolution.matched:
+        # Drop the preposition that introduced the expression too ("on Thursday")
+        prefix = _LEADING_PREPOSITION.search(description[:start])
+        if prefix:
+            start = prefix.start()
+        chars[start:end] = " " * (end - start)
+    return re.sub(r"\s+", " ", "".join(chars)).strip(" .,!?;:")
+
+
+def _describe_event(description: str, resolution: TemporalResolution, verbs: re.Pattern) -> Optional[dict]:
+    """
+    Pull name / location / participants out of short commands like
+    "Book lunch with Sarah at Cafe Luna on Thursday at noon". Anything less
+    regular returns None and goes to the LLM.
+    """
+    remainder = _strip_temporal(description, resolution)
+    verb = verbs.match(remainder)
+    if not verb:
+        return None
+    body = remainder[verb.end():]
+    if _NEGATION.search(body):
+        return None
+
+    location = ""
+    place = re.match(r"^(?P<body>.+?)\s+(?:at|in)\s+(?P<loc>[A-Z][\w'&.-]*(?:\s+[A-Z0-9][\w'&.-]*)*)$", body)
+    if place:
+        body, location = place["body"], place["loc"]
+
+    what, participants = body, []
+    company = re.match(r"^(?P<what>.+?)\s+with\s+(?P<who>.+)$", body, re.I)
+    if company:
+        what = company["what"]
+        participants = [p.strip() for p in re.split(r",\s*|\s+and\s+", company["who"]) if p.strip()]
+
+    words = what.split()
+    if not 1 <= len(words) <= 4 or _TITLE_STOPWORDS & {w.lower() for w in words}:
+        return None
+    if _STRAY_PUNCTUATION.search(what) or _STRAY_PUNCTUATION.search(location):
+        return None
+    if not all(_PARTICIPANT.fullmatch(p) for p in participants):
+        return None
+
+    return {
+        "name": body[0].upper() + body[1:],
+        "description": description.strip(),
+        "location": location,
+        "participants": participants,
+    }
+
+
+def _resolved_hint(fields: dict) -> str:
+    if not fields:
+        return ""
+    return (
+        "\n- These fields were already resolved from the text using the rules above; "
+        f"copy them exactly: {json.dumps(fields)}"
+    )
+
+
+def _resolve_event_details(description: str) -> tuple[dict, Optional[EventDetails]]:
+    started = time.perf_counter()
+    resolution = resolve(description)
+    fields = event_fields(resolution)
 
+    resolved = None
+    if {"date", "duration_minutes"} <= fields.keys():
+        described = _describe_event(description, resolution, CREATE_VERBS)
+        if described:
+            resolved = EventDetails(**described, **fields)
+
+    parser_stats["resolver_calls"] += 1
+    parser_stats["resolver_seconds"] += time.perf_counter() - started
+    return fields, resolved
+
+
+def _resolve_modify_details(description: str) -> tuple[dict, Optional[EventUpdateDetails]]:
+    started = time.perf_counter()
+    resolution = resolve(description)
+    fields = modify_fields(resolution)
+
+    resolved = None
+    if {"original_date", "new_date", "duration_minutes"} <= fields.keys():
+        described = _describe_event(description, resolution, MODIFY_VERBS)
+        if described:
+            resolved = EventUpdateDetails(**described, **fields)
+
+    parser_stats["resolver_calls"] += 1
+    parser_stats["resolver_seconds"] += time.perf_counter() - started
+    return fields, resolved
+
+
+def parser_latency_stats() -> dict:
+    stats = dict(parser_stats)
+    resolver_calls = stats.get("resolver_calls", 0)
+    llm_calls = stats.get("llm_calls", 0)
+    stats["avg_resolver_ms"] = stats.get("resolver_seconds", 0.0) / resolver_calls * 1000 if resolver_calls else 0.0
+    stats["avg_llm_ms"] = stats.get("llm_seconds", 0.0) / llm_calls * 1000 if llm_calls else 0.0
+    return stats
+
+
+def _event_details_messages(description: str, resolved_fields: Optional[dict] = None) -> list[dict]:
     now = datetime.now(ZoneInfo("America/Los_Angeles"))
     date_context = f"Today is {now.strftime('%A, %B %d, %Y')}."
 
@@ -20,22 +146,32 @@ def parse_calendar_event_details(description: str) -> EventDetails:
         "- All times must be returned in ISO 8601 format **with timezone** (America/Los_Angeles).\n"
         "- Include fields: name, description, location (if available), date/time, duration in minutes, participants.\n"
         "- Return output as a strict JSON object matching the EventDetails schema."
+        f"{_resolved_hint(resolved_fields)}"
     )
 
-    completion = client.beta.chat.completions.parse(
-        model=model,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": description}
-        ],
-        response_format=EventDetails
-    )
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": description}
+    ]
 
-    return completion.choices[0].message.parsed
+@instrumented("parse_create")
+async def parse_calendar_event_details_async(description: str) -> EventDetails:
+    logger.info("Starting calendar event parsing")
 
-def parse_calendar_modify_details(description: str) -> EventUpdateDetails:
-    logger.info("Starting calendar modify parsing")
+    fields, resolved = _resolve_event_details(description)
+    if resolved:
+        logger.info(f"Event details resolved without LLM: {resolved}")
+        parser_stats["llm_skipped"] += 1
+        return resolved
 
+    started = time.perf_counter()
+    parsed = await parse_completion_async(_event_details_messages(description, fields), EventDetails)
+    parser_stats["llm_calls"] += 1
+    parser_stats["llm_seconds"] += time.perf_counter() - started
+
+    return parsed.model_copy(update=fields)
+
+def _modify_details_messages(description: str, resolved_fields: Optional[dict] = None) -> list[dict]:
     now = datetime.now(ZoneInfo("America/Los_Angeles"))
     date_context = (
         f"Today is {now.strftime('%A, %B %d, %Y')}.\n"
@@ -54,122 +190,258 @@ def parse_calendar_modify_details(description: str) -> EventUpdateDetails:
         "- The new date and time (when the meeting should be rescheduled to) → `new_date`\n"
         "If two time ranges are mentioned, treat the earlier one as `original_date` and the later one as `new_date`.\n"
         "Also include unchanged fields like `name`, `description`, `location`, `participants`, and `duration_minutes` if possible."
+        f"{_resolved_hint(resolved_fields)}"
     )
 
-    completion = client.beta.chat.completions.parse(
-        model=model,
-        messages=[
-            {
-                "role": "system",
-                "content": system_prompt
-            },
-            {
-                "role": "user",
-                "content": "Reschedule the meeting with Ethan to discuss the project roadmap from next Wednesday 8–9am to next Friday 7–8am."
-            },
-            {
-                "role": "assistant",
-                "content": (
-                    '{"name": "Project Roadmap Discussion with Ethan", '
-                    '"description": "Discuss the project roadmap with Ethan.", '
-                    '"location": "Company Meeting Room A", '
-                    '"original_date": "2025-07-30T08:00:00-04:00", '
-                    '"new_date": "2025-08-01T07:00:00-04:00", '
-                    '"duration_minutes": 60, '
-                    '"participants": ["ethan@example.com"]}'
-                )
-            },
-            {
-                "role": "user",
-                "content": description
-            },
-        ],
-        response_format=EventUpdateDetails
-    )
+    return [
+        {
+            "role": "system",
+            "content": system_prompt
+        },
+        {
+            "role": "user",
+            "content": "Reschedule the meeting with Ethan to discuss the project roadmap from next Wednesday 8–9am to next Friday 7–8am."
+        },
+        {
+            "role": "assistant",
+            "content": (
+                '{"name": "Project Roadmap Discussion with Ethan", '
+                '"description": "Discuss the project roadmap with Ethan.", '
+                '"location": "Company Meeting Room A", '
+                '"original_date": "2025-07-30T08:00:00-04:00", '
+                '"new_date": "2025-08-01T07:00:00-04:00", '
+                '"duration_minutes": 60, '
+                '"participants": ["ethan@example.com"]}'
+            )
+        },
+        {
+            "role": "user",
+            "content": description
+        },
+    ]
 
-    return completion.choices[0].message.parsed
+@instrumented("parse_modify")
+async def parse_calendar_modify_details_async(description: str) -> EventUpdateDetails:
+    logger.info("Starting calendar modify parsing")
 
-def parse_list_calendar_events(description: str) -> ListCalendarEventsFilters:
-    logger.info("Starting list calendar events parsing")
+    fields, resolved = _resolve_modify_details(description)
+    if resolved:
+        logger.info(f"Modify details resolved without LLM: {resolved}")
+        parser_stats["llm_skipped"] += 1
+        return resolved
+
+    started = time.perf_counter()
+    parsed = await parse_completion_async(_modify_details_messages(description, fields), EventUpdateDetails)
+    parser_stats["llm_calls"] += 1
+    parser_stats["llm_seconds"] += time.perf_counter() - started
+
+    return parsed.model_copy(update=fields)
 
+def _list_events_messages(description: str) -> list[dict]:
     now = datetime.now(ZoneInfo("America/Los_Angeles"))
     date_context = f"Today is {now.strftime('%A, %B, %d, %Y')}"
 
-    completion = client.beta.chat.completions.parse(
-        model = model,
-        messages = [
-            {
-                "role": "system",
-                "content": (
-                    f"{date_context}\n"
-                    "You are a calendar assistant that extracts filters for listing existing events — NOT creating or editing them.\n\n"
-                    "Your goal is to extract:\n"
-                    "- A cleaned-up description summarizing the user's request.\n"
-                    "- Optional structured fields:\n"
-                    "   - 'start_time' and 'end_time': ISO 8601 datetimes in America/Los_Angeles time.\n"
-                    "   - 'participants': names or emails mentioned.\n"
-                    "   - 'time_of_day': 'morning', 'afternoon', or 'evening'.\n"
-                    "   - 'keywords': event-related words (e.g., 'meeting', 'call', etc.)\n\n"
-                    "Use today's actual date from context. Only return structured JSON. Do not explain."
-                )
-            },
-            {
-                "role":"user",
-                "content": "Show me all meetings with Ethan next week in the morning"
-            },
-            {
-                "role": "assistant",
-                "content": (
-                    '{'
-                    '"description": "List all meetings with Ethan next week in the morning", '
-                    '"start_time": "2025-07-29T00:00:00-07:00", '
-                    '"end_time": "2025-08-02T23:59:59-07:00", '
-                    '"participants": ["Ethan"], '
-                    '"time_of_day": "morning", '
-                    '"keywords": ["meeting"]'
-                    '}'
-                )
-            },
-            {
-                "role": "user",
-                "content": "Show me all meetings with chiuetha@usc.edu today"
-            },
-            {
-                "role": "assistant",
-                "content": (
-                    '{'
-                    '"description": "List all meetings with Ethan today", '
-                    '"start_time": "2025-07-25T00:00:00-07:00", '
-                    '"end_time": "2025-07-25T23:59:59-07:00", '
-                    '"participants": ["chiuetha@usc.edu"], '
-                    '"keywords": ["meeting"]'
-                    '}'
-                )
-            },
-            {
-                "role": "user",
-                "content": "Tell me all meetings I had yesterday"
-            },
-            {
-                "role": "assistant",
-                "content": (
-                    '{'
-                    '"description": "List all meetings from yesterday", '
-                    '"start_time": "2025-07-24T00:00:00-07:00", '
-                    '"end_time": "2025-07-24T23:59:59-07:00", '
-                    '"participants": ["Ethan"], '
-                    '"time_of_day": "morning", '
-                    '"keywords": ["meeting"]'
-                    '}'
-                )
-            },
-            {
-                "role": "user",
-                "content": description
-            }
-        ],
-        response_format=ListCalendarEventsFilters
+    return [
+        {
+            "role": "system",
+            "content": (
+                f"{date_context}\n"
+                "You are a calendar assistant that extracts filters for listing existing events — NOT creating or editing them.\n\n"
+                "Your goal is to extract:\n"
+                "- A cleaned-up description summarizing the user's request.\n"
+                "- Optional structured fields:\n"
+                "   - 'start_time' and 'end_time': ISO 8601 datetimes in America/Los_Angeles time.\n"
+                "   - 'participants': names or emails mentioned.\n"
+                "   - 'time_of_day': 'morning', 'afternoon', or 'evening'.\n"
+                "   - 'keywords': event-related words (e.g., 'meeting', 'call', etc.)\n\n"
+                "Use today's actual date from context. Only return structured JSON. Do not explain."
+            )
+        },
+        {
+            "role":"user",
+            "content": "Show me all meetings with Ethan next week in the morning"
+        },
+        {
+            "role": "assistant",
+            "content": (
+                '{'
+                '"description": "List all meetings with Ethan next week in the morning", '
+                '"start_time": "2025-07-29T00:00:00-07:00", '
+                '"end_time": "2025-08-02T23:59:59-07:00", '
+                '"participants": ["Ethan"], '
+                '"time_of_day": "morning", '
+                '"keywords": ["meeting"]'
+                '}'
+            )
+        },
+        {
+            "role": "user",
+            "content": "Show me all meetings with chiuetha@usc.edu today"
+        },
+        {
+            "role": "assistant",
+            "content": (
+                '{'
+                '"description": "List all meetings with Ethan today", '
+                '"start_time": "2025-07-25T00:00:00-07:00", '
+                '"end_time": "2025-07-25T23:59:59-07:00", '
+                '"participants": ["chiuetha@usc.edu"], '
+                '"keywords": ["meeting"]'
+                '}'
+            )
+        },
+        {
+            "role": "user",
+            "content": "Tell me all meetings I had yesterday"
+        },
+        {
+            "role": "assistant",
+            "content": (
+                '{'
+                '"description": "List all meetings from yesterday", '
+                '"start_time": "2025-07-24T00:00:00-07:00", '
+                '"end_time": "2025-07-24T23:59:59-07:00", '
+                '"participants": ["Ethan"], '
+                '"time_of_day": "morning", '
+                '"keywords": ["meeting"]'
+                '}'
+            )
+        },
+        {
+            "role": "user",
+            "content": description
+        }
+    ]
+
+@instrumented("parse_list")
+async def parse_list_calendar_events_async(description: str) -> ListCalendarEventsFilters:
+    logger.info("Starting list calendar events parsing")
+
+    filters = llm_cache.get("parse_list_calendar_events", model, description, ListCalendarEventsFilters)
+    if filters is None:
+        filters = await parse_completion_async(_list_events_messages(description), ListCalendarEventsFilters)
+        llm_cache.put("parse_list_calendar_events", model, description, filters)
+    logger.debug(f"List filters: {filters}")
+
+    return filters
+
+
+# ----------------------------- Find a time -----------------------------
+# The classifiers only know create / modify / list, so "find a time" requests are told apart
+# from new events by their phrasing once the classifier has had its say (see is_find_time_request)
+FIND_TIME = re.compile(
+    r"\b(?:find|suggest|pick|get)\s+(?:us\s+|me\s+)?(?:a|an|some)?\s*(?:good\s+|free\s+|common\s+)?"
+    r"(?:time|slot|window|hour|\d+\s*(?:min|minute)s?)\b"
+    r"|\bwhen\s+(?:can|could|are|is|do)\b.*\b(?:meet|free|available)\b"
+    r"|\bwhat\s+times?\s+(?:works?|suits?)\b"
+    r"|\b(?:common\s+)?availability\b|\bfree\s+slots?\b",
+    re.I,
+)
+_WEEK = re.compile(r"\b(this|next)\s+week\b", re.I)
+_NEXT_PERIOD = re.compile(r"\b(?:in\s+|over\s+|within\s+)?the\s+next\s+(\d{1,3}|two|three|four)\s+(days?|weeks?|months?)\b", re.I)
+_TIME_OF_DAY = re.compile(r"\b(morning|afternoon|evening)s?\b", re.I)
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_PERSON = r"(?:[\w.+-]+@[\w-]+(?:\.[\w-]+)+|[A-Z][\w'-]*)"
+_PEOPLE = re.compile(rf"\b(?:with|for|can|between)\s+(?P<who>{_PERSON}(?:\s*(?:,|\band\b|&)\s*{_PERSON})*)")
+_PERIOD_DAYS = {"day": 1, "week": 7, "month": 30}
+
+
+def looks_like_find_time(text: str) -> bool:
+    return bool(FIND_TIME.search(text))
+
+
+def is_find_time_request(text: str, intent: Optional[str]) -> bool:
+    """
+    Tie-breaker on top of classification: a request the classifier took for a new event, or
+    couldn't place at all (`intent` None), is a search for a slot when it is phrased like one
+    and doesn't already name a clock time. Lists and modifications are never rerouted.
+    """
+    if intent not in (None, "create") or not looks_like_find_time(text):
+        return False
+    return not resolve(text, datetime.now(DEFAULT_TZ)).timed_spans
+
+
+def _find_time_window(description: str, resolution: TemporalResolution, now: datetime) -> Optional[tuple[datetime, datetime]]:
+    """The search window, or None when the text names a time we can't place."""
+    week = _WEEK.search(description)
+    if week:
+        return week_range(week.group(1).lower(), now)
+
+    period = _NEXT_PERIOD.search(description)
+    if period:
+        amount = int(period.group(1)) if period.group(1).isdigit() else NUMBER_WORDS[period.group(1).lower()]
+        return now, now + timedelta(days=amount * _PERIOD_DAYS[period.group(2).lower().rstrip("s")])
+
+    days = sorted(span.start for span in resolution.spans)
+    if days:
+        # One day, or every day from the first to the last one mentioned
+        first = days[0].replace(hour=0, minute=0)
+        return first, days[-1].replace(hour=0, minute=0) + timedelta(days=1)
+    # Anything matched besides the meeting length is a day we couldn't pin down ("this Monday" on a Tuesday)
+    if len(resolution.matched) > (1 if resolution.duration_minutes else 0):
+        return None
+    return now, now + timedelta(days=scheduler_horizon_days)
+
+
+def _find_time_participants(text: str) -> list[str]:
+    people = []
+    for match in _PEOPLE.finditer(text):
+        people += [p.strip() for p in re.split(r",|\band\b|&", match["who"]) if p.strip()]
+    people += _EMAIL.findall(text)
+    return list(dict.fromkeys(person for person in people if person.lower() not in {"i", "we"}))
+
+
+def _resolve_find_time(description: str) -> tuple[dict, Optional[FindTimeRequest]]:
+    started = time.perf_counter()
+    now = datetime.now(DEFAULT_TZ)
+    resolution = resolve(description, now)
+    fields = {"duration_minutes": resolution.duration_minutes or 60}
+    time_of_day = _TIME_OF_DAY.search(description)
+    if time_of_day:
+        fields["time_of_day"] = time_of_day.group(1).lower()
+
+    resolved = None
+    window = _find_time_window(description, resolution, now)
+    if window:
+        fields["window_start"], fields["window_end"] = window
+        resolved = FindTimeRequest(
+            description=description.strip(),
+            participants=_find_time_participants(_strip_temporal(description, resolution)),
+            **fields,
+        )
+
+    parser_stats["resolver_calls"] += 1
+    parser_stats["resolver_seconds"] += time.perf_counter() - started
+    return fields, resolved
+
+
+def _find_time_messages(description: str, resolved_fields: dict) -> list[dict]:
+    now = datetime.now(DEFAULT_TZ)
+    system_prompt = (
+        f"Today is {now.strftime('%A, %B %d, %Y')}. The calendar week runs from Sunday to Saturday.\n"
+        "The user wants to find a time when several people can meet. Extract:\n"
+        "- `participants`: everyone named or emailed, as written.\n"
+        "- `duration_minutes`: length of the meeting (60 if not stated).\n"
+        "- `window_start` / `window_end`: the period to search, as ISO 8601 datetimes in America/Los_Angeles.\n"
+        "- `time_of_day`: 'morning', 'afternoon' or 'evening' if the user prefers one.\n"
+        "Return output as a strict JSON object matching the FindTimeRequest schema."
+        f"{_resolved_hint({k: v for k, v in resolved_fields.items() if k in ('duration_minutes', 'time_of_day')})}"
     )
-    print(completion.choices[0].message.parsed)
+    return [{"role": "system", "content": system_prompt}, {"role": "user", "content": description}]
+
+@instrumented("parse_find_time")
+async def parse_find_time_request_async(description: str) -> FindTimeRequest:
+    logger.info("Starting find-time parsing")
+
+    fields, resolved = _resolve_find_time(description)
+    if resolved:
+        logger.info(f"Find-time request resolved without LLM: {resolved}")
+        parser_stats["llm_skipped"] += 1
+        return resolved
+
+    started = time.perf_counter()
+    parsed = await parse_completion_async(_find_time_messages(description, fields), FindTimeRequest)
+    parser_stats["llm_calls"] += 1
+    parser_stats["llm_seconds"] += time.perf_counter() - started
 
-    return completion.choices[0].message.parsed
+    return parsed.model_copy(update=fields)
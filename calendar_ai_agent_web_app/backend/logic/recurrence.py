@@ -0,0 +1,136 @@
+import re
+from datetime import datetime, timedelta, timezone, time as clock
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from dateutil.rrule import rrulestr
+from calendar_ai_agent_web_app.backend.logic.temporal import DEFAULT_TZ
+
+# Instance ids are "<series id>_<original start>": 20250106T170000Z (UTC) for timed series, 20250106 for all-day ones
+_INSTANCE_SUFFIX = re.compile(r"_\d{8}(?:T\d{6}Z)?$")
+# RRULE UNTIL given as a date or local time instead of UTC
+_UNTIL = re.compile(r"(UNTIL=)(\d{8})(?:T(\d{6}))?(?!\d|Z)", re.I)
+
+
+def is_recurring_master(event: dict) -> bool:
+    return bool(event.get("recurrence")) and not event.get("recurringEventId")
+
+
+def series_id_of(event: dict) -> Optional[str]:
+    """The series a modified or cancelled occurrence belongs to; None for anything else."""
+    if event.get("recurringEventId"):
+        return event["recurringEventId"]
+    # Cancelled occurrences can arrive as just id + status
+    match = _INSTANCE_SUFFIX.search(event.get("id", ""))
+    return event["id"][:match.start()] if match else None
+
+
+def _zone(name: Optional[str]) -> Optional[ZoneInfo]:
+    try:
+        return ZoneInfo(name) if name else None
+    except ZoneInfoNotFoundError:
+        return None
+
+
+def _anchor(line: str, zone: ZoneInfo) -> str:
+    """Floating dates on a zoned series mean the series' own clock; dateutil wants them explicit."""
+    name, sep, values = line.partition(":")
+    params = name.upper().split(";")
+    if params[0] == "RRULE":
+        def to_utc(match: re.Match) -> str:
+            local = datetime.strptime(match.group(2) + (match.group(3) or "235959"), "%Y%m%d%H%M%S")
+            return f"{match.group(1)}{local.replace(tzinfo=zone).astimezone(timezone.utc):%Y%m%dT%H%M%SZ}"
+        return _UNTIL.sub(to_utc, line)
+    if (params[0] in ("EXDATE", "RDATE") and "VALUE=DATE" not in params
+            and not any(param.startswith("TZID=") for param in params) and not values.upper().endswith("Z")):
+        return f"{name};TZID={zone.key}{sep}{values}"
+    return line
+
+
+class Series:
+    """
+    A recurring master event with its RRULE / RDATE / EXDATE lines parsed once.
+    Occurrences are generated on the series' own clock (start.timeZone), so a 9:00 meeting
+    stays at 9:00 across DST changes, as it does in Google Calendar. All-day series use
+    floating dates, placed on the America/Los_Angeles clock like IndexedEvent does.
+    Raises ValueError for a recurrence dateutil can't read.
+    """
+
+    __slots__ = ("raw", "all_day", "start", "duration", "rules", "open_ended")
+
+    def __init__(self, raw: dict):
+        self.raw = raw
+        start, end = raw["start"], raw.get("end") or raw["start"]
+        self.all_day = "date" in start
+        if self.all_day:
+            self.start = datetime.fromisoformat(start["date"])
+            finish = datetime.fromisoformat(end["date"])
+        else:
+            self.start = datetime.fromisoformat(start["dateTime"].replace("Z", "+00:00"))
+            finish = datetime.fromisoformat(end["dateTime"].replace("Z", "+00:00"))
+            zone = _zone(start.get("timeZone")) or DEFAULT_TZ
+            self.start = self.start.astimezone(zone)
+        self.duration = finish - self.start
+
+        lines = raw["recurrence"]
+        if not self.all_day:
+            lines = [_anchor(line, self.start.tzinfo) for line in lines]
+        self.rules = rrulestr("\n".join(lines), dtstart=self.start, forceset=True)
+        try:
+            # Floating and zoned dates can't be compared; find out now rather than mid-query
+            next(iter(self.rules), None)
+        except TypeError as error:
+            raise ValueError(f"Inconsistent recurrence dates: {error}") from error
+        self.open_ended = any(
+            line.upper().startswith("RRULE") and "COUNT=" not in line.upper() and "UNTIL=" not in line.upper()
+            for line in lines
+        )
+
+    def timestamp(self, start: datetime) -> float:
+        return (start.replace(tzinfo=DEFAULT_TZ) if self.all_day else start).timestamp()
+
+    def _floating(self, moment: datetime) -> datetime:
+        return moment.astimezone(DEFAULT_TZ).replace(tzinfo=None) if self.all_day else moment
+
+    def last_end(self) -> Optional[float]:
+        """When the last occurrence ends, or None for a series that repeats forever."""
+        if self.open_ended:
+            return None
+        last = None
+        for last in self.rules:
+            pass
+        return self.timestamp((last or self.start) + self.duration)
+
+    def occurrences(self, after: datetime, before: datetime) -> list[datetime]:
+        """Starts of the occurrences overlapping [after, before); both bounds timezone-aware."""
+        return self.rules.between(self._floating(after) - self.duration, self._floating(before))
+
+    def instance_id(self, start: datetime) -> str:
+        suffix = f"{start:%Y%m%d}" if self.all_day else start.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        return f"{self.raw['id']}_{suffix}"
+
+    def instance(self, start: datetime) -> dict:
+        """The occurrence as events().list(singleEvents=True) would return it."""
+        event = {key: value for key, value in self.raw.items() if key != "recurrence"}
+        end = start + self.duration
+        if self.all_day:
+            event["start"] = {"date": start.date().isoformat()}
+            event["end"] = {"date": end.date().isoformat()}
+        else:
+            start_zone = self.raw["start"].get("timeZone")
+            end_zone = (self.raw.get("end") or {}).get("timeZone") or start_zone
+            event["start"] = {"dateTime": start.isoformat(), **({"timeZone": start_zone} if start_zone else {})}
+            event["end"] = {"dateTime": end.isoformat(), **({"timeZone": end_zone} if end_zone else {})}
+        event["id"] = self.instance_id(start)
+        event["recurringEventId"] = self.raw["id"]
+        event["originalStartTime"] = dict(event["start"])
+        return event
+
+    def expand(self, after: datetime, before: datetime) -> list[tuple[float, dict]]:
+        """(start timestamp, instance) for each occurrence overlapping [after, before)."""
+        return [(self.timestamp(start), self.instance(start)) for start in self.occurrences(after, before)]
+
+
+def day_after(days: int, now: Optional[datetime] = None) -> datetime:
+    """Local midnight `days` from now; a stable bound for expanding open-ended series."""
+    now = now or datetime.now(DEFAULT_TZ)
+    return datetime.combine(now.date() + timedelta(days=days), clock(), tzinfo=DEFAULT_TZ)
@@ -0,0 +1,318 @@
+import math
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, time as clock
+from typing import Optional
+import numpy as np
+from googleapiclient.errors import HttpError
+from calendar_ai_agent_web_app.backend.logic.calendar_mirror import calendar_mirror
+from calendar_ai_agent_web_app.backend.logic.calendar_service import get_calendar_service
+from calendar_ai_agent_web_app.backend.logic.event_filter import IndexedEvent, TIME_OF_DAY_WINDOWS
+from calendar_ai_agent_web_app.backend.logic.temporal import DEFAULT_TZ
+from calendar_ai_agent_web_app.backend.logic.confirmation import render_time_slots
+from calendar_ai_agent_web_app.backend.schemas.models import FindTimeRequest, TimeSlot, AvailableSlots
+from calendar_ai_agent_web_app.backend.config import (
+    scheduler_resolution_minutes, working_hours_start, working_hours_end, working_days, scheduler_max_slots
+)
+from calendar_ai_agent_web_app.backend.utils.logger import logger, in_current_trace
+from calendar_ai_agent_web_app.backend.utils.metrics import instrumented
+
+# The calendar owner always has to attend; their busy time comes from the local mirror
+OWNER = "you"
+
+# freebusy.query takes at most 50 calendars, and long ranges are split to stay under its span limit
+FREEBUSY_MAX_CALENDARS = 50
+FREEBUSY_MAX_DAYS = 60
+FREEBUSY_WORKERS = 4
+
+# Suggested slots are spread out: no more than this many on one day
+MAX_SLOTS_PER_DAY = 2
+
+Busy = list[tuple[float, float]]
+
+
+# ----------------------------- Free/busy -----------------------------
+def _owner_busy(start: datetime, end: datetime) -> Busy:
+    try:
+        calendar_mirror.ensure_fresh()
+    except HttpError as error:
+        logger.error(f"Could not refresh calendar mirror for find-time: {error}")
+
+    busy = []
+    for raw in calendar_mirror.query(start, end):
+        # Same rule as the conflict index: "free" and all-day events don't block time
+        if raw.get("transparency") == "transparent":
+            continue
+        event = IndexedEvent(raw)
+        if event.start is not None and not event.all_day:
+            busy.append((event.start.timestamp(), event.end.timestamp()))
+    return busy
+
+
+def _query_freebusy(emails: list[str], start: datetime, end: datetime) -> dict:
+    return get_calendar_service().freebusy().query(body={
+        "timeMin": start.isoformat(),
+        "timeMax": end.isoformat(),
+        "items": [{"id": email} for email in emails],
+    }).execute().get("calendars", {})
+
+
+def fetch_busy(emails: list[str], start: datetime, end: datetime) -> tuple[dict[str, Busy], list[str]]:
+    """
+    Busy intervals (epoch seconds) for each email, plus the emails whose free/busy we can't
+    read. Queries are split by calendar count and time span and run concurrently.
+    """
+    busy: dict[str, Busy] = {email: [] for email in emails}
+    unknown: set[str] = set()
+    if not emails:
+        return busy, []
+
+    spans = []
+    span_start = start
+    while span_start < end:
+        span_end = min(end, span_start + timedelta(days=FREEBUSY_MAX_DAYS))
+        spans.append((span_start, span_end))
+        span_start = span_end
+    queries = [
+        (emails[offset:offset + FREEBUSY_MAX_CALENDARS], span_start, span_end)
+        for offset in range(0, len(emails), FREEBUSY_MAX_CALENDARS)
+        for span_start, span_end in spans
+    ]
+
+    @in_current_trace
+    def run(query):
+        group = query[0]
+        try:
+            return group, _query_freebusy(*query)
+        except HttpError as error:
+            logger.error(f"Free/busy lookup failed for {len(group)} calendars: {error}")
+            return group, None
+
+    with ThreadPoolExecutor(max_workers=min(FREEBUSY_WORKERS, len(queries))) as executor:
+        for group, calendars in executor.map(run, queries):
+            if calendars is None:
+                unknown.update(group)
+                continue
+            for email in group:
+                calendar = calendars.get(email, {})
+                if calendar.get("errors") or email not in calendars:
+                    # notFound / no access
+                    unknown.add(email)
+                    continue
+                busy[email].extend(
+                    (datetime.fromisoformat(block["start"].replace("Z", "+00:00")).timestamp(),
+                     datetime.fromisoformat(block["end"].replace("Z", "+00:00")).timestamp())
+                    for block in calendar.get("busy", [])
+                )
+
+    return {email: blocks for email, blocks in busy.items() if email not in unknown}, sorted(unknown)
+
+
+# ----------------------------- Bitmaps -----------------------------
+def busy_bitmap(busy: list[Busy], origin: float, n_slots: int, resolution: int) -> np.ndarray:
+    """
+    (participants, slots) boolean array, True where a participant is busy for any part of
+    the slot. Built from a difference array, so the cost is one pass over the intervals
+    plus one cumulative sum, however long the intervals are.
+    """
+    step = resolution * 60
+    counts = [len(blocks) for blocks in busy]
+    if not sum(counts):
+        return np.zeros((len(busy), n_slots), dtype=bool)
+
+    rows = np.repeat(np.arange(len(busy)), counts)
+    bounds = np.array([interval for blocks in busy for interval in blocks], dtype=np.float64)
+    starts = np.clip(np.floor((bounds[:, 0] - origin) / step), 0, n_slots).astype(np.int64)
+    ends = np.clip(np.ceil((bounds[:, 1] - origin) / step), 0, n_slots).astype(np.int64)
+
+    width = n_slots + 1
+    diff = np.bincount(rows * width + starts, minlength=len(busy) * width).astype(np.int32)
+    diff -= np.bincount(rows * width + ends, minlength=len(busy) * width).astype(np.int32)
+    return np.cumsum(diff.reshape(len(busy), width), axis=1, dtype=np.int32)[:, :n_slots] > 0
+
+
+def allowed_mask(origin: float, n_slots: int, resolution: int, hours: tuple[float, float],
+                 days: tuple[int, ...] = working_days) -> np.ndarray:
+    """Slots inside `hours` (local America/Los_Angeles clock) on `days`; DST-correct per day."""
+    step = resolution * 60
+    mask = np.zeros(n_slots, dtype=bool)
+    first = datetime.fromtimestamp(origin, DEFAULT_TZ).date()
+    last = datetime.fromtimestamp(origin + n_slots * step, DEFAULT_TZ).date()
+    day = first
+    while day <= last:
+        if day.weekday() in days:
+            # Aware-datetime arithmetic is wall-clock, so a DST change day still opens at 9:00
+            midnight = datetime.combine(day, clock(), tzinfo=DEFAULT_TZ)
+            open_at = midnight + timedelta(hours=hours[0])
+            close_at = midnight + timedelta(hours=hours[1])
+            a = max(0, math.ceil((open_at.timestamp() - origin) / step))
+            b = min(n_slots, math.floor((close_at.timestamp() - origin) / step))
+            if a < b:
+                mask[a:b] = True
+        day += timedelta(days=1)
+    return mask
+
+
+def _windows(flags: np.ndarray, width: int) -> np.ndarray:
+    """For each start index, how many of the `width` slots from there are set (last axis)."""
+    totals = np.cumsum(flags, axis=-1, dtype=np.int32)
+    zeros = np.zeros(flags.shape[:-1] + (1,), dtype=np.int32)
+    totals = np.concatenate([zeros, totals], axis=-1)
+    return totals[..., width:] - totals[..., :-width]
+
+
+def rank_slots(busy: np.ndarray, allowed: np.ndarray, duration_slots: int, align_slots: int = 1,
+               first_slot: int = 0, limit: int = scheduler_max_slots, slots_per_day: Optional[int] = None,
+               day_of_slot: Optional[np.ndarray] = None, required: tuple[int, ...] = ()) -> list[tuple[int, np.ndarray]]:
+    """
+    Best start slots for a meeting `duration_slots` long, as (start index, free mask over
+    participants). Only slots where every `required` participant (row index) is free qualify.
+    Slots where more participants are free rank first, then earlier ones; returned slots
+    never overlap, and at most `slots_per_day` share a `day_of_slot`.
+    """
+    n_slots = busy.shape[1]
+    if duration_slots > n_slots:
+        return []
+
+    # Only aligned starts inside the allowed hours are candidates, so per-participant window
+    # sums are taken at those few columns rather than at every slot
+    starts = np.arange(n_slots - duration_slots + 1)
+    fits = _windows(allowed, duration_slots) == duration_slots
+    index = starts[fits & (starts % align_slots == 0) & (starts >= first_slot)]
+
+    totals = np.zeros((busy.shape[0], n_slots + 1), dtype=np.int32)
+    np.cumsum(busy, axis=1, dtype=np.int32, out=totals[:, 1:])
+    free_for = (totals[:, index + duration_slots] - totals[:, index]) == 0   # (participants, candidates)
+    available = free_for.sum(axis=0)
+    eligible = available > 0
+    if required:
+        eligible &= free_for[list(required)].all(axis=0)
+    order = np.lexsort((index, -available))
+    order = order[eligible[order]]
+
+    chosen: list[int] = []
+    per_day = Counter()
+    for position in order:
+        start = index[position]
+        if len(chosen) == limit:
+            break
+        if any(abs(start - index[other]) < duration_slots for other in chosen):
+            continue
+        if slots_per_day and day_of_slot is not None:
+            day = day_of_slot[start]
+            if per_day[day] >= slots_per_day:
+                continue
+            per_day[day] += 1
+        chosen.append(position)
+    return [(int(index[position]), free_for[:, position]) for position in chosen]
+
+
+# ----------------------------- Engine -----------------------------
+class SchedulerStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = Counter()
+
+    def record(self, participants: int, fetch_seconds: float, solve_seconds: float) -> None:
+        with self._lock:
+            self._counts["requests"] += 1
+            self._counts["participants"] += participants
+            self._counts["fetch_seconds"] += fetch_seconds
+            self._counts["solve_seconds"] += solve_seconds
+
+    def summary(self) -> dict:
+        with self._lock:
+            stats = dict(self._counts)
+        requests = stats.get("requests", 0)
+        stats["avg_fetch_ms"] = stats.pop("fetch_seconds", 0.0) / requests * 1000 if requests else 0.0
+        stats["avg_solve_ms"] = stats.pop("solve_seconds", 0.0) / requests * 1000 if requests else 0.0
+        stats["resolution_minutes"] = scheduler_resolution_minutes
+        return stats
+
+
+scheduler_stats = SchedulerStats()
+
+
+def _hours(time_of_day: Optional[str]) -> tuple[float, float]:
+    work = (working_hours_start, working_hours_end)
+    if not time_of_day or time_of_day not in TIME_OF_DAY_WINDOWS:
+        return work
+    window = TIME_OF_DAY_WINDOWS[time_of_day]
+    overlap = (max(work[0], window[0]), min(work[1], window[1]))
+    # "Evening" lies outside working hours; asking for it explicitly overrides them
+    return overlap if overlap[0] < overlap[1] else window
+
+
+def solve(busy: dict[str, Busy], window_start: datetime, window_end: datetime, duration_minutes: int,
+          hours: tuple[float, float], resolution: int = scheduler_resolution_minutes,
+          limit: int = scheduler_max_slots, days: tuple[int, ...] = working_days,
+          required: tuple[str, ...] = (OWNER,)) -> list[TimeSlot]:
+    """
+    Ranked, non-overlapping slots for everyone in `busy` between the two datetimes; `required`
+    people (the owner by default) must be free in every slot.
+    """
+    step = resolution * 60
+    duration_slots = max(1, math.ceil(duration_minutes / resolution))
+    # Start on the half hour (quarter hour for short meetings) when the resolution allows. Slot 0
+    # sits on such a boundary (Los Angeles offsets are whole hours), so aligned starts are index multiples
+    align_slots = max(1, (30 if duration_minutes >= 30 else 15) // resolution)
+    origin = math.floor(window_start.timestamp() / (step * align_slots)) * step * align_slots
+    n_slots = max(0, math.ceil((window_end.timestamp() - origin) / step))
+
+    names = list(busy)
+    bitmap = busy_bitmap([busy[name] for name in names], origin, n_slots, resolution)
+    allowed = allowed_mask(origin, n_slots, resolution, hours, days)
+    # Local day of each slot, for spreading suggestions across days
+    utc_offset = window_start.astimezone(DEFAULT_TZ).utcoffset().total_seconds()
+    day_of_slot = ((origin + np.arange(n_slots) * step + utc_offset) // 86400).astype(np.int64)
+    first_slot = max(0, math.ceil((window_start.timestamp() - origin) / step))
+
+    must_attend = tuple(names.index(name) for name in required if name in busy)
+
+    ranked = rank_slots(bitmap, allowed, duration_slots, align_slots, first_slot, limit,
+                        MAX_SLOTS_PER_DAY, day_of_slot, must_attend)
+    slots = []
+    for start, free in ranked:
+        start_time = datetime.fromtimestamp(origin + start * step, DEFAULT_TZ)
+        slots.append(TimeSlot(
+            start_time=start_time,
+            end_time=start_time + timedelta(minutes=duration_minutes),
+            available=[name for name, ok in zip(names, free) if ok],
+            unavailable=[name for name, ok in zip(names, free) if not ok],
+        ))
+    return slots
+
+
+@instrumented("find_time")
+def find_time(request: FindTimeRequest, participants: list[str], now: Optional[datetime] = None) -> AvailableSlots:
+    """Fetch free/busy for everyone involved and suggest ranked slots."""
+    now = now or datetime.now(DEFAULT_TZ)
+    window_start = max(request.window_start, now)
+    window_end = request.window_end
+
+    emails, unknown = [], []
+    for person in [*participants, *request.participants]:
+        person = person.strip()
+        if not person or person in emails or person in unknown:
+            continue
+        # Free/busy needs an address; bare names can't be looked up
+        (emails if "@" in person else unknown).append(person)
+
+    started = time.perf_counter()
+    busy, unreadable = fetch_busy(emails, window_start, window_end) if window_start < window_end else ({}, [])
+    busy = {OWNER: _owner_busy(window_start, window_end), **busy}
+    fetched = time.perf_counter()
+
+    slots = solve(busy, window_start, window_end, request.duration_minutes, _hours(request.time_of_day)) \
+        if window_start < window_end else []
+    solved = time.perf_counter()
+    scheduler_stats.record(len(busy), fetched - started, solved - fetched)
+    logger.info(f"Find-time over {len(busy)} calendars: fetch {(fetched - started) * 1000:.0f}ms, "
+                f"solve {(solved - fetched) * 1000:.1f}ms, {len(slots)} slots")
+
+    result = AvailableSlots(message="", duration_minutes=request.duration_minutes, slots=slots,
+                            unknown_participants=[*unknown, *unreadable])
+    result.message = render_time_slots(request, result)
+    return result
@@ -0,0 +1,84 @@
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Optional, Union
+from calendar_ai_agent_web_app.backend.schemas.models import (
+    SingleShotParse, CreateEventIntent, ModifyEventIntent, ListEventsIntent, NoCalendarIntent
+)
+from calendar_ai_agent_web_app.backend.logic.llm import parse_completion_async
+from calendar_ai_agent_web_app.backend.logic.temporal import DEFAULT_TZ, resolve_event_fields, resolve_modify_fields
+from calendar_ai_agent_web_app.backend.utils.logger import logger
+from calendar_ai_agent_web_app.backend.utils.metrics import instrumented
+
+CalendarIntent = Union[CreateEventIntent, ModifyEventIntent, ListEventsIntent, NoCalendarIntent]
+
+# Below this the processor falls back to the multi-stage path
+MIN_CONFIDENCE = 0.7
+
+single_shot_stats = Counter()
+
+
+def _single_shot_messages(user_input: str) -> list[dict]:
+    now = datetime.now(DEFAULT_TZ)
+    system_prompt = (
+        f"Today is {now.strftime('%A, %B %d, %Y')}. The calendar week runs from Sunday to Saturday.\n"
+        "Classify the user's message and extract its details in one step.\n\n"
+        "Intents:\n"
+        "- 'create': schedule a new event → fill `details` (name, description, location, date as ISO 8601, "
+        "duration_minutes, participants).\n"
+        "- 'modify': reschedule or change an existing event → fill `details` (original_date is when it is now, "
+        "new_date is when it should be; if two time ranges are given, the first is original_date).\n"
+        "- 'list': ask about existing events → fill `filters` (description, optional start_time/end_time, "
+        "participants, time_of_day as morning/afternoon/evening, keywords).\n"
+        "- 'none': anything that is not about the user's calendar.\n\n"
+        "Rules:\n"
+        "- 'this [weekday]' is the upcoming one before Saturday; 'next [weekday]' is in the week starting next Sunday.\n"
+        "- Times are America/Los_Angeles unless stated; return datetimes in ISO 8601 with timezone.\n"
+        "- confidence_score is between 0 and 1; use a low score if the intent is unclear."
+    )
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_input},
+    ]
+
+
+def _apply_resolver(result: CalendarIntent, user_input: str) -> CalendarIntent:
+    # The rule-based resolver follows the week rules exactly, so its dates win over the model's
+    if isinstance(result, CreateEventIntent):
+        fields = resolve_event_fields(user_input)
+    elif isinstance(result, ModifyEventIntent):
+        fields = resolve_modify_fields(user_input)
+    else:
+        return result
+    if fields:
+        return result.model_copy(update={"details": result.details.model_copy(update=fields)})
+    return result
+
+
+def _record(result: CalendarIntent, seconds: float) -> None:
+    single_shot_stats["calls"] += 1
+    single_shot_stats[f"intent_{result.intent}"] += 1
+    single_shot_stats["seconds"] += seconds
+    if not is_usable(result):
+        single_shot_stats["fallbacks"] += 1
+
+
+def is_usable(result: Optional[CalendarIntent]) -> bool:
+    return result is not None and result.intent != "none" and result.confidence_score >= MIN_CONFIDENCE
+
+
+@instrumented("single_shot")
+async def classify_and_parse_async(user_input: str) -> CalendarIntent:
+    started = time.perf_counter()
+    parsed = await parse_completion_async(_single_shot_messages(user_input), SingleShotParse)
+    result = _apply_resolver(parsed.result, user_input)
+    _record(result, time.perf_counter() - started)
+    logger.info(f"Single-shot parse: {result}")
+    return result
+
+
+def single_shot_stats_summary() -> dict:
+    stats = dict(single_shot_stats)
+    calls = stats.get("calls", 0)
+    stats["avg_ms"] = stats.get("seconds", 0.0) / calls * 1000 if calls else 0.0
+    return stats
@@ -0,0 +1,325 @@
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, date
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+DEFAULT_TZ = ZoneInfo("America/Los_Angeles")
+
+WEEKDAYS = {
+    "monday": 0, "mon": 0, "tuesday": 1, "tue": 1, "tues": 1, "wednesday": 2, "wed": 2,
+    "thursday": 3, "thu": 3, "thur": 3, "thurs": 3, "friday": 4, "fri": 4,
+    "saturday": 5, "sat": 5, "sunday": 6, "sun": 6,
+}
+MONTHS = {
+    "january": 1, "jan": 1, "february": 2, "feb": 2, "march": 3, "mar": 3, "april": 4, "apr": 4,
+    "may": 5, "june": 6, "jun": 6, "july": 7, "jul": 7, "august": 8, "aug": 8,
+    "september": 9, "sep": 9, "sept": 9, "october": 10, "oct": 10, "november": 11, "nov": 11,
+    "december": 12, "dec": 12,
+}
+NUMBER_WORDS = {"a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4}
+
+_WD = "|".join(sorted(WEEKDAYS, key=len, reverse=True))
+_MON = "|".join(sorted(MONTHS, key=len, reverse=True))
+_ORD = r"(?:st|nd|rd|th)?"
+_MERIDIEM = r"(?:a\.?m\.?|p\.?m\.?)"
+_ATOM = rf"(?:noon|midnight|\d{{1,2}}(?::\d{{2}})?\s*{_MERIDIEM}?)"
+
+DAY_PATTERNS = [
+    ("relative", re.compile(r"\b(?:the\s+)?day\s+after\s+tomorrow\b"), lambda m: 2),
+    ("relative", re.compile(r"\b(?:tomorrow|tmrw)\b"), lambda m: 1),
+    ("relative", re.compile(r"\b(?:today|tonight)\b"), lambda m: 0),
+    ("relative", re.compile(r"\byesterday\b"), lambda m: -1),
+    ("relative", re.compile(r"\bin\s+(\d{1,3})\s+days?\b"), lambda m: int(m.group(1))),
+    ("qualified", re.compile(rf"\b(this|next|coming|upcoming)\s+({_WD})\b"), None),
+    ("iso", re.compile(r"\b(\d{4})-(\d{2})-(\d{2})\b"), None),
+    ("month_day", re.compile(rf"\b({_MON})\.?\s+(\d{{1,2}}){_ORD}(?:,?\s+(\d{{4}}))?\b"), None),
+    ("day_month", re.compile(rf"\b(\d{{1,2}}){_ORD}\s+(?:of\s+)?({_MON})(?:,?\s+(\d{{4}}))?\b"), None),
+    ("numeric", re.compile(r"(?<![\d:])(\d{1,2})/(\d{1,2})(?:/(\d{2,4}))?(?![\d:])"), None),
+    ("weekday", re.compile(rf"\b({_WD})\b"), None),
+]
+
+DURATION_PATTERNS = [
+    (re.compile(r"\b(\d+)\s*(?:hours?|hrs?|h)\s*(?:and\s+)?(\d+)\s*(?:minutes?|mins?)\b"),
+     lambda m: int(m.group(1)) * 60 + int(m.group(2))),
+    (re.compile(r"\b(?:an?|one)\s+hour\s+and\s+a\s+half\b"), lambda m: 90),
+    (re.compile(r"\bhalf\s+(?:an?\s+)?hour\b"), lambda m: 30),
+    (re.compile(r"\b(\d+(?:\.\d+)?|an?|one|two|three|four)[\s-]*(hours?|hrs?|minutes?|mins?)\b(?:\s+long)?"),
+     lambda m: _duration_from(m.group(1), m.group(2))),
+]
+
+# An amount of time measured from something else ("an hour later", "in 30 minutes") rather than
+# the event's length; which moment it's relative to is for the LLM to work out
+OFFSET_BEFORE = re.compile(r"\bin\s+$")
+OFFSET_AFTER = re.compile(r"\s*(?:later|earlier|early|late|before(?:hand)?|after|ago|prior|from\s+now)\b")
+
+TIME_RANGE = re.compile(
+    rf"(?<![\w/:])(?:from\s+|between\s+)?(?P<a>{_ATOM})\s*(?:-|to|until|till|and)\s*(?P<b>{_ATOM})(?![\d/])"
+)
+TIME_SINGLE = re.compile(rf"(?<![\w/:])(?P<at>at\s+|@\s*)?(?P<t>{_ATOM})(?![\d/])")
+
+
+@dataclass
+class TimeSpan:
+    start: datetime
+    end: Optional[datetime] = None
+    has_time: bool = False
+
+
+@dataclass
+class TemporalResolution:
+    spans: list[TimeSpan] = field(default_factory=list)
+    duration_minutes: Optional[int] = None
+    # Character ranges of the input consumed by temporal expressions
+    matched: list[tuple[int, int]] = field(default_factory=list)
+
+    @property
+    def timed_spans(self) -> list[TimeSpan]:
+        return [span for span in self.spans if span.has_time]
+
+
+def _duration_from(amount: str, unit: str) -> int:
+    value = NUMBER_WORDS[amount] if amount in NUMBER_WORDS else float(amount)
+    minutes = value * 60 if unit.startswith("h") else value
+    return int(round(minutes))
+
+
+def _sunday_index(day: date) -> int:
+    # Calendar weeks run Sunday (0) to Saturday (6)
+    return (day.weekday() + 1) % 7
+
+
+def week_start(day: date) -> date:
+    return day - timedelta(days=_sunday_index(day))
+
+
+def week_range(which: str, now: datetime) -> tuple[datetime, datetime]:
+    """'this week' is today through Saturday; 'next week' is the following Sunday through Saturday."""
+    today = now.date()
+    if which == "this":
+        start = datetime.combine(today, datetime.min.time(), tzinfo=now.tzinfo)
+        end_day = week_start(today) + timedelta(days=6)
+    else:
+        start_day = week_start(today) + timedelta(days=7)
+        start = datetime.combine(start_day, datetime.min.time(), tzinfo=now.tzinfo)
+        end_day = start_day + timedelta(days=6)
+    end = datetime.combine(end_day, datetime.max.time().replace(microsecond=0), tzinfo=now.tzinfo)
+    return start, end
+
+
+def _resolve_weekday(qualifier: Optional[str], weekday: int, today: date) -> Optional[date]:
+    target = (weekday + 1) % 7
+    if qualifier == "next":
+        # 'next [weekday]' falls in the week starting this upcoming Sunday
+        return week_start(today) + timedelta(days=7 + target)
+    if qualifier == "this":
+        # 'this [weekday]' is the upcoming one within this week; a day already past is ambiguous
+        candidate = week_start(today) + timedelta(days=target)
+        return candidate if candidate >= today else None
+    # Bare or 'coming' weekday: the next occurrence; naming today's weekday is ambiguous
+    ahead = (target - _sunday_index(today)) % 7
+    return today + timedelta(days=ahead) if ahead else None
+
+
+def _safe_date(year: int, month: int, day: int) -> Optional[date]:
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def _resolve_calendar_date(month: int, day: int, year: Optional[str], today: date) -> Optional[date]:
+    if year:
+        year_value = int(year)
+        return _safe_date(year_value + 2000 if year_value < 100 else year_value, month, day)
+    resolved = _safe_date(today.year, month, day)
+    if resolved and resolved < today:
+        resolved = _safe_date(today.year + 1, month, day)
+    return resolved
+
+
+def _day_from_match(kind: str, match: re.Match, resolve, today: date) -> Optional[date]:
+    if kind == "relative":
+        return today + timedelta(days=resolve(match))
+    if kind == "qualified":
+        qualifier = "next" if match.group(1) == "next" else "this" if match.group(1) == "this" else None
+        return _resolve_weekday(qualifier, WEEKDAYS[match.group(2)], today)
+    if kind == "weekday":
+        return _resolve_weekday(None, WEEKDAYS[match.group(1)], today)
+    if kind == "iso":
+        return _safe_date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+    if kind == "month_day":
+        return _resolve_calendar_date(MONTHS[match.group(1)], int(match.group(2)), match.group(3), today)
+    if kind == "day_month":
+        return _resolve_calendar_date(MONTHS[match.group(2)], int(match.group(1)), match.group(3), today)
+    if kind == "numeric":
+        return _resolve_calendar_date(int(match.group(1)), int(match.group(2)), match.group(3), today)
+    return None
+
+
+def _parse_atom(atom: str) -> tuple[Optional[int], int, Optional[str]]:
+    """Return (hour, minute, meridiem) for a single time atom; hour is None when unparseable."""
+    atom = atom.strip().replace(".", "")
+    if atom == "noon":
+        return 12, 0, "pm"
+    if atom == "midnight":
+        return 0, 0, "am"
+    m = re.match(r"(\d{1,2})(?::(\d{2}))?\s*(am|pm)?$", atom)
+    if not m:
+        return None, 0, None
+    hour, minute = int(m.group(1)), int(m.group(2) or 0)
+    if hour > 23 or minute > 59:
+        return None, 0, None
+    return hour, minute, m.group(3)
+
+
+def _to_24h(hour: int, meridiem: Optional[str]) -> int:
+    if meridiem == "am":
+        return 0 if hour == 12 else hour
+    if meridiem == "pm":
+        return hour if hour == 12 else hour + 12
+    # No meridiem: 24-hour values stay, 1–7 read as afternoon, 8–11 as morning
+    if hour >= 13 or hour == 0:
+        return hour
+    return hour + 12 if 1 <= hour <= 7 else hour
+
+
+def _overlaps(start: int, end: int, taken: list[tuple[int, int]]) -> bool:
+    return any(start < t_end and t_start < end for t_start, t_end in taken)
+
+
+def resolve(text: str, now: Optional[datetime] = None) -> TemporalResolution:
+    """Find every date, time-of-day and duration expression in `text`, in reading order."""
+    now = now or datetime.now(DEFAULT_TZ)
+    today = now.date()
+    lowered = text.lower().replace("–", "-").replace("—", "-")
+    result = TemporalResolution()
+    taken: list[tuple[int, int]] = []
+
+    # Durations first so "30 minutes" is never read as a clock time
+    offset = False
+    for pattern, to_minutes in DURATION_PATTERNS:
+        for m in pattern.finditer(lowered):
+            if not _overlaps(m.start(), m.end(), taken):
+                taken.append(m.span())
+                if OFFSET_BEFORE.search(lowered, 0, m.start()) or OFFSET_AFTER.match(lowered, m.end()):
+                    offset = True
+                else:
+                    result.duration_minutes = result.duration_minutes or to_minutes(m)
+
+    days: list[tuple[int, int, Optional[date]]] = []
+    for kind, pattern, resolver in DAY_PATTERNS:
+        for m in pattern.finditer(lowered):
+            if not _overlaps(m.start(), m.end(), taken):
+                taken.append(m.span())
+                days.append((m.start(), m.end(), _day_from_match(kind, m, resolver, today)))
+
+    times: list[tuple[int, int, tuple[int, int], Optional[tuple[int, int]]]] = []
+    for m in TIME_RANGE.finditer(lowered):
+        if _overlaps(m.start(), m.end(), taken):
+            continue
+        start_hour, start_minute, start_mer = _parse_atom(m.group("a"))
+        end_hour, end_minute, end_mer = _parse_atom(m.group("b"))
+        if start_hour is None or end_hour is None or not (start_mer or end_mer):
+            continue
+        end_24 = _to_24h(end_hour, end_mer)
+        start_24 = _to_24h(start_hour, start_mer or end_mer)
+        if start_24 * 60 + start_minute >= end_24 * 60 + end_minute and not start_mer:
+            # "11-1pm" means 11am to 1pm
+            start_24 = _to_24h(start_hour, "am")
+        taken.append(m.span())
+        times.append((m.start(), m.end(), (start_24, start_minute), (end_24, end_minute)))
+
+    for m in TIME_SINGLE.finditer(lowered):
+        if _overlaps(m.start(), m.end(), taken):
+            continue
+        hour, minute, meridiem = _parse_atom(m.group("t"))
+        explicit = meridiem or ":" in m.group("t") or m.group("t").strip() in ("noon", "midnight")
+        if hour is None or not (explicit or m.group("at")):
+            continue
+        taken.append(m.span())
+        times.append((m.start(), m.end(), (_to_24h(hour, meridiem), minute), None))
+
+    result.matched = sorted(taken)
+    days.sort()
+    times.sort()
+
+    if offset or any(day is None for _, _, day in days):
+        # An ambiguous day or offset expression; leave the whole thing to the LLM
+        result.spans = []
+        return result
+
+    # Attach each time to the closest day expression in the same clause
+    used_days = set()
+    for t_start, t_end, (hour, minute), end_clock in times:
+        preceding = [i for i, (_, d_end, _) in enumerate(days) if d_end <= t_start]
+        following = [i for i, (d_start, _, _) in enumerate(days) if d_start >= t_end]
+        choice = None
+        if following and days[following[0]][0] - t_end <= 3 and (not preceding or preceding[-1] in used_days):
+            choice = following[0]
+        elif preceding:
+            choice = preceding[-1]
+        elif following:
+            choice = following[0]
+
+        if choice is None:
+            day = today
+        else:
+            day = days[choice][2]
+            used_days.add(choice)
+
+        start = datetime(day.year, day.month, day.day, hour, minute, tzinfo=DEFAULT_TZ)
+        end = None
+        if end_clock:
+            end = datetime(day.year, day.month, day.day, end_clock[0], end_clock[1], tzinfo=DEFAULT_TZ)
+            if end <= start:
+                end += timedelta(days=1)
+        result.spans.append(TimeSpan(start=start, end=end, has_time=True))
+
+    for i, (_, _, day) in enumerate(days):
+        if i not in used_days:
+            result.spans.append(TimeSpan(start=datetime(day.year, day.month, day.day, tzinfo=DEFAULT_TZ)))
+
+    # Timed spans stay in the order they were written, so "from X to Y" keeps X first
+    return result
+
+
+def _span_duration(span: TimeSpan) -> Optional[int]:
+    if span.end is None:
+        return None
+    return int((span.end - span.start).total_seconds() // 60)
+
+
+def event_fields(resolution: TemporalResolution) -> dict:
+    """`date` / `duration_minutes` for EventDetails, only for the values that resolve unambiguously."""
+    timed = resolution.timed_spans
+    if len(timed) != 1:
+        return {}
+
+    fields = {"date": timed[0].start.isoformat()}
+    duration = _span_duration(timed[0]) or resolution.duration_minutes
+    if duration:
+        fields["duration_minutes"] = duration
+    return fields
+
+
+def modify_fields(resolution: TemporalResolution) -> dict:
+    """`original_date` / `new_date` / `duration_minutes` for EventUpdateDetails, in the order they are mentioned."""
+    timed = resolution.timed_spans
+    if len(timed) != 2:
+        return {}
+
+    original, new = timed
+    fields = {"original_date": original.start.isoformat(), "new_date": new.start.isoformat()}
+    duration = _span_duration(new) or _span_duration(original) or resolution.duration_minutes
+    if duration:
+        fields["duration_minutes"] = duration
+    return fields
+
+
+def resolve_event_fields(text: str, now: Optional[datetime] = None) -> dict:
+    return event_fields(resolve(text, now))
+
+
+def resolve_modify_fields(text: str, now: Optional[datetime] = None) -> dict:
+    return modify_fields(resolve(text, now))
@@ -1 +1 @@
-from .sender import send_email
+from .sender import send_email, send_email_async
@@ -0,0 +1,47 @@
+import hashlib
+import json
+import smtplib
+from typing import Optional
+from calendar_ai_agent_web_app.backend.mail_utils.sender import _build_message
+from calendar_ai_agent_web_app.backend.mail_utils.smtp_pool import smtp_pool
+from calendar_ai_agent_web_app.backend.tasks.job_queue import Job, JobQueue, PermanentJobError
+from calendar_ai_agent_web_app.backend.config import (
+    outbox_path, outbox_max_attempts, outbox_retry_backoff, smtp_pool_size
+)
+
+SEND_EMAIL = "send_email"
+
+# Rejections a retry won't fix; these go straight to the dead letters
+_PERMANENT_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPAuthenticationError)
+
+# One worker per SMTP session, so deliveries never queue on the pool's own cap
+outbox = JobQueue(path=outbox_path, workers=smtp_pool_size,
+                  max_attempts=outbox_max_attempts, retry_backoff=outbox_retry_backoff)
+
+
+def deliver(job: Job) -> dict:
+    to_emails = job.payload["to_emails"]
+    msg = _build_message(to_emails, job.payload["subject"], job.payload["message"])
+    try:
+        smtp_pool.send(msg["From"], to_emails, msg.as_string())
+    except _PERMANENT_ERRORS as e:
+        raise PermanentJobError(str(e)) from e
+    return {"delivered_to": to_emails, "attempts": job.attempts}
+
+
+outbox.register(SEND_EMAIL, deliver)
+
+
+def idempotency_key(to_emails: list[str], subject: str, message: str) -> str:
+    """Same recipients, subject and body count as the same email, however often it is submitted."""
+    raw = json.dumps([sorted(e.strip().lower() for e in to_emails), subject, message])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def enqueue_email(to_emails: list[str], subject: str, message: str, key: Optional[str] = None) -> tuple[str, bool]:
+    """Queue an email for delivery; returns its outbox id and False if `key` was already queued."""
+    return outbox.enqueue_once(
+        SEND_EMAIL,
+        {"to_emails": to_emails, "subject": subject, "message": message},
+        dedupe_key=key or idempotency_key(to_emails, subject, message),
+    )
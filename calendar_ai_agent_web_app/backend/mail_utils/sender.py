@@ -2,26 +2,33 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
 import os
-import smtplib
+from calendar_ai_agent_web_app.backend.mail_utils.smtp_pool import smtp_pool
 from calendar_ai_agent_web_app.backend.utils.logger import logger
 
-def send_email(to_emails: list[str], subject: str, message: str):
-    sender_email = os.getenv("SENDER_EMAIL")
-    sender_password = os.getenv("SENDER_PASSWORD")
-
+def _build_message(to_emails: list[str], subject: str, message: str) -> MIMEMultipart:
     msg = MIMEMultipart()
-    msg["From"] = sender_email
+    msg["From"] = os.getenv("SENDER_EMAIL")
     msg["To"] = ", ".join(to_emails)
     msg["Subject"] = subject
 
     msg.attach(MIMEText(message, "plain"))
+    return msg
+
+def send_email(to_emails: list[str], subject: str, message: str):
+    msg = _build_message(to_emails, subject, message)
 
     try:
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-            server.login(sender_email, sender_password)
-            server.sendmail(sender_email, to_emails, msg.as_string())
+        smtp_pool.send(msg["From"], to_emails, msg.as_string())
         logger.info(f"Email successfully sent to {msg['To']}")
     except Exception as e:
         logger.error(f"Failed to send email: {e}")
 
+async def send_email_async(to_emails: list[str], subject: str, message: str):
+    msg = _build_message(to_emails, subject, message)
 
+    try:
+        # Runs on the pool's threads; the event loop only awaits
+        await smtp_pool.send_async(msg["From"], to_emails, msg.as_string())
+        logger.info(f"Email successfully sent to {msg['To']}")
+    except Exception as e:
+        logger.error(f"Failed to send email: {e}")
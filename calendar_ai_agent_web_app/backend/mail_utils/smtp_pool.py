@@ -0,0 +1,152 @@
+import asyncio
+import os
+import smtplib
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+from calendar_ai_agent_web_app.backend.config import (
+    smtp_host, smtp_port, smtp_use_ssl, smtp_pool_size, smtp_idle_timeout, smtp_max_messages_per_connection
+)
+
+# Connections idle longer than this get a NOOP before reuse, in case the server dropped them
+KEEPALIVE_CHECK_SECONDS = 10.0
+CONNECT_TIMEOUT = 30
+
+
+def _env_credentials() -> tuple[Optional[str], Optional[str]]:
+    return os.getenv("SENDER_EMAIL"), os.getenv("SENDER_PASSWORD")
+
+
+class _Connection:
+    def __init__(self, server: smtplib.SMTP):
+        self.server = server
+        self.last_used = time.monotonic()
+        self.messages = 0
+
+    def close(self) -> None:
+        try:
+            self.server.quit()
+        except Exception:
+            # Already gone; nothing to tell the server
+            self.server.close()
+
+
+class SMTPPool:
+    """
+    Logged-in SMTP connections reused across messages.
+
+    At most `max_connections` sessions are open at once; senders beyond that wait for a
+    free one. Idle connections are kept for `idle_timeout` seconds and checked with a NOOP
+    after a short idle period, and a send that finds the connection dropped reconnects once.
+    Connections are retired after `max_messages` messages (Gmail caps messages per session).
+    `send_async` runs on the pool's own threads, so callers on the event loop never block.
+    """
+
+    def __init__(self, host: str = smtp_host, port: int = smtp_port, use_ssl: bool = smtp_use_ssl,
+                 max_connections: int = smtp_pool_size, idle_timeout: float = smtp_idle_timeout,
+                 max_messages: int = smtp_max_messages_per_connection,
+                 credentials: Callable[[], tuple[Optional[str], Optional[str]]] = _env_credentials):
+        self.host = host
+        self.port = port
+        self.use_ssl = use_ssl
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self.max_messages = max_messages
+        self._credentials = credentials
+
+        self._idle: list[_Connection] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._executor = ThreadPoolExecutor(max_workers=max_connections, thread_name_prefix="smtp")
+        self._stats = Counter()
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def _connect(self) -> _Connection:
+        if self.use_ssl:
+            server = smtplib.SMTP_SSL(self.host, self.port, timeout=CONNECT_TIMEOUT)
+        else:
+            server = smtplib.SMTP(self.host, self.port, timeout=CONNECT_TIMEOUT)
+        user, password = self._credentials()
+        if user and password:
+            server.login(user, password)
+        self._count("connections_opened")
+        return _Connection(server)
+
+    def _checkout(self) -> _Connection:
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+
+        if conn is not None:
+            idle_for = time.monotonic() - conn.last_used
+            if idle_for > self.idle_timeout:
+                conn.close()
+                conn = None
+                self._count("idle_expired")
+            elif idle_for > KEEPALIVE_CHECK_SECONDS:
+                try:
+                    alive = conn.server.noop()[0] == 250
+                except (smtplib.SMTPException, OSError):
+                    alive = False
+                if not alive:
+                    conn.server.close()
+                    conn = None
+                    self._count("stale_dropped")
+
+        return conn or self._connect()
+
+    def _checkin(self, conn: _Connection) -> None:
+        if conn.messages >= self.max_messages:
+            conn.close()
+            return
+        conn.last_used = time.monotonic()
+        with self._lock:
+            self._idle.append(conn)
+
+    def send(self, from_addr: str, to_addrs: list[str], message: str) -> None:
+        with self._slots:
+            conn = self._checkout()
+            try:
+                try:
+                    conn.server.sendmail(from_addr, to_addrs, message)
+                except (smtplib.SMTPServerDisconnected, ConnectionError):
+                    # Dropped between checkout and send; one fresh session, then give up
+                    conn.server.close()
+                    self._count("reconnects")
+                    conn = self._connect()
+                    conn.server.sendmail(from_addr, to_addrs, message)
+            except Exception:
+                conn.server.close()
+                self._count("failures")
+                raise
+
+            conn.messages += 1
+            self._count("messages")
+            self._checkin(conn)
+
+    async def send_async(self, from_addr: str, to_addrs: list[str], message: str) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self.send, from_addr, to_addrs, message)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+        self._executor.shutdown(wait=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["idle_connections"] = len(self._idle)
+        stats["max_connections"] = self.max_connections
+        opened = stats.get("connections_opened", 0)
+        stats["messages_per_connection"] = stats.get("messages", 0) / opened if opened else 0.0
+        return stats
+
+
+smtp_pool = SMTPPool()
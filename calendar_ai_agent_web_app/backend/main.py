@@ -1,11 +1,35 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse, Response
 from pydantic import BaseModel
 from typing import List, Optional
 from fastapi import Request
-from calendar_ai_agent_web_app.backend.services.processor import process_calendar_request
-from calendar_ai_agent_web_app.backend.mail_utils.sender import send_email
+import asyncio
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from calendar_ai_agent_web_app.backend.services.processor import process_calendar_request_async
+from calendar_ai_agent_web_app.backend.services.streaming import process_calendar_request_events, sse_stream
+from calendar_ai_agent_web_app.backend.services.calendar_jobs import submit_calendar_request_async
+from calendar_ai_agent_web_app.backend.services.batch import process_calendar_batch_async
+from calendar_ai_agent_web_app.backend.tasks.job_queue import job_queue
+from calendar_ai_agent_web_app.backend.mail_utils.outbox import outbox, enqueue_email
+from calendar_ai_agent_web_app.backend.mail_utils.smtp_pool import smtp_pool
 from calendar_ai_agent_web_app.backend.schemas.models import  EventConfirmationDraft
+from calendar_ai_agent_web_app.backend.config import async_http_client, batch_max_items, blocking_io_workers
+from calendar_ai_agent_web_app.backend.logic.calendar_service import calendar_service_manager
+from calendar_ai_agent_web_app.backend.logic.calendar_mirror import calendar_mirror
+from calendar_ai_agent_web_app.backend.logic.parser import parser_latency_stats
+from calendar_ai_agent_web_app.backend.logic.event_encoding import encoding_stats_summary
+from calendar_ai_agent_web_app.backend.agents.session_cache import session_cache
+from calendar_ai_agent_web_app.backend.agents.context_detector import enrichment_stats
+from calendar_ai_agent_web_app.backend.logic.single_shot import single_shot_stats_summary
+from calendar_ai_agent_web_app.backend.services.speculative import speculation_stats
+from calendar_ai_agent_web_app.backend.logic.llm_cache import llm_cache
+from calendar_ai_agent_web_app.backend.logic.confirmation import confirmation_stats
+from calendar_ai_agent_web_app.backend.logic.scheduler import scheduler_stats
+from calendar_ai_agent_web_app.backend.utils.logger import logger, traced
+from calendar_ai_agent_web_app.backend.utils.metrics import registry, http_requests, http_seconds, CONTENT_TYPE
 
 app = FastAPI()
 
@@ -18,36 +42,171 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Caller-supplied X-Request-ID is reused as the trace id when it is safe to put in a log line
+_REQUEST_ID = re.compile(r"^[\w.:-]{1,64}$")
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """Give every request a trace id (echoed as X-Trace-ID) and record its latency for /metrics."""
+    request_id = request.headers.get("x-request-id", "")
+    started = time.perf_counter()
+    with traced(request_id if _REQUEST_ID.match(request_id) else None) as trace_id:
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+        finally:
+            # Label by route template (/jobs/{job_id}), not the raw path, to keep the series bounded
+            route = request.scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            http_requests.inc(method=request.method, path=path, status=status)
+            http_seconds.observe(time.perf_counter() - started, method=request.method, path=path)
+    response.headers["X-Trace-ID"] = trace_id
+    return response
+
 class CalendarRequest(BaseModel):
     user_input: str
     participants: Optional[List[str]] = []
+    user_id: Optional[str] = None
+    # Return a job id right after parsing; the calendar write and confirmation run in the job queue
+    background: bool = False
+
+class BatchCalendarRequest(BaseModel):
+    user_inputs: List[str]
+    participants: Optional[List[str]] = []
+    user_id: Optional[str] = None
+
+@app.on_event("startup")
+async def size_blocking_pool():
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=blocking_io_workers, thread_name_prefix="blocking-io")
+    )
+
+@app.on_event("startup")
+def start_job_workers():
+    job_queue.start()
+    outbox.start()
+
+@app.on_event("shutdown")
+async def close_http_pool():
+    job_queue.stop()
+    outbox.stop()
+    await async_http_client.aclose()
+    session_cache.close()
+    smtp_pool.close()
 
 @app.get("/")
 def health_check():
     return {"status": "ok"}
 
+@app.get("/stats")
+def service_stats():
+    return {
+        "calendar_service": calendar_service_manager.stats(),
+        "calendar_mirror": calendar_mirror.stats(),
+        "parser": parser_latency_stats(),
+        "llm_filter": encoding_stats_summary(),
+        "sessions": session_cache.stats(),
+        "enrichment": enrichment_stats.summary(),
+        "single_shot": single_shot_stats_summary(),
+        "speculation": speculation_stats.summary(),
+        "llm_cache": llm_cache.stats(),
+        "confirmation": confirmation_stats.summary(),
+        "jobs": job_queue.stats(),
+        "smtp": smtp_pool.stats(),
+        "outbox": outbox.stats(),
+        "scheduler": scheduler_stats.summary(),
+    }
+
+@app.get("/metrics")
+def prometheus_metrics():
+    return Response(registry.render(), media_type=CONTENT_TYPE)
+
 @app.post("/process")
-def process_event(request: CalendarRequest):
-    confirmation = process_calendar_request(
+async def process_event(request: CalendarRequest):
+    if request.background:
+        submitted = await submit_calendar_request_async(
+            user_input=request.user_input,
+            participants=request.participants or [],
+            user_id=request.user_id
+        )
+        return submitted or {"error": "Not a valid calendar request."}
+
+    confirmation = await process_calendar_request_async(
         user_input=request.user_input,
-        participants=request.participants or []
+        participants=request.participants or [],
+        user_id=request.user_id
     )
     if not confirmation:
         return {"error": "Not a valid calendar request."}
 
     return confirmation.model_dump()
 
+@app.post("/process_batch")
+async def process_event_batch(request: BatchCalendarRequest):
+    if not request.user_inputs:
+        raise HTTPException(status_code=400, detail="user_inputs is empty")
+    if len(request.user_inputs) > batch_max_items:
+        raise HTTPException(status_code=413, detail=f"At most {batch_max_items} items per batch")
+
+    results = await process_calendar_batch_async(
+        user_inputs=request.user_inputs,
+        participants=request.participants or [],
+        user_id=request.user_id
+    )
+    return {"results": [result.model_dump(mode="json") for result in results]}
+
+@app.get("/jobs/{job_id}")
+async def job_status(job_id: str, wait: float = Query(0, ge=0, le=60)):
+    # wait > 0 long-polls until the job finishes or the wait runs out
+    job = await job_queue.wait_async(job_id, wait)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@app.post("/process/stream")
+async def process_event_stream(request: CalendarRequest, http_request: Request):
+    events = process_calendar_request_events(
+        user_input=request.user_input,
+        participants=request.participants or [],
+        user_id=request.user_id
+    )
+    return StreamingResponse(
+        sse_stream(events, http_request.is_disconnected),
+        media_type="text/event-stream",
+        # Keep proxies (nginx) from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 
 @app.post("/send_confirmation_email")
 async def send_confirmation_email(email: EventConfirmationDraft, request: Request):
-    body = await request.json()
-    print("Received body:", body)
+    logger.debug(f"Received confirmation email: {email}")
     try:
-        send_email(
+        # Delivery (with retries) happens in the outbox; resubmitting the same email is a no-op
+        message_id, created = enqueue_email(
             to_emails=email.to_emails,
             subject=email.subject,
-            message=email.confirmation_message
+            message=email.confirmation_message,
+            key=request.headers.get("Idempotency-Key")
         )
-        return {"status": "success"}
+        return {"status": "queued" if created else "duplicate", "message_id": message_id}
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/outbox/dead_letters")
+def outbox_dead_letters(limit: int = Query(50, ge=1, le=500)):
+    return outbox.dead_letters(limit=limit)
+
+@app.get("/outbox/{message_id}")
+def outbox_status(message_id: str):
+    message = outbox.get(message_id)
+    if message is None:
+        raise HTTPException(status_code=404, detail="Message not found")
+    return message
+
+@app.post("/outbox/{message_id}/retry")
+def outbox_retry(message_id: str):
+    if not outbox.requeue(message_id):
+        raise HTTPException(status_code=409, detail="Only dead-lettered messages can be retried")
+    return {"status": "queued", "message_id": message_id}
@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Optional, List, Literal, Union
 from pydantic import BaseModel, Field
 from datetime import datetime
 
@@ -30,12 +30,19 @@ class EventConfirmation(BaseModel):
     confirmation_message: str = Field(description="Natural language confirmation")
     calendar_link: Optional[str] = Field(description="Calendar link")
 
+class EventConflict(BaseModel):
+    title: str = Field(..., description="Title of the overlapping event, or 'Busy' for a participant's free/busy block")
+    start_time: datetime = Field(..., description="Start time of the overlap source")
+    end_time: datetime = Field(..., description="End time of the overlap source")
+    attendee: Optional[str] = Field(None, description="Participant whose free/busy reported the overlap; None for the user's own calendar")
+
 class EventConfirmationDraft(BaseModel):
     confirmation_message: str
     calendar_link: Optional[str]
     to_emails: list[str]
     subject: str
     requires_confirmation: bool = True
+    conflicts: list[EventConflict] = []
 
 
 class ListCalendarEventsFilters(BaseModel):
@@ -64,8 +71,68 @@ class ListedEvents(BaseModel):
     query_summary: str = Field(..., description="A summary of the user's original query or intent")
     matched_events: List[CalendarEvent] = Field(..., description="List of events that matched the query")
 
+class FilteredEventRows(BaseModel):
+    matched_rows: List[int] = Field(..., description="Row numbers of the events that match the user's filter")
+
 class EventListConfirmation(BaseModel):
     """
     Schema for AI-generated natural language response summarizing a list of matched events.
     """
     message: str = Field(..., description="Natural language summary of the matched calendar events, formatted for user display.")
+
+class FindTimeRequest(BaseModel):
+    description: str = Field(..., description="A cleaned-up version of the user query, e.g., 'Find an hour for Alice, Bob and Ethan next week'")
+    participants: List[str] = Field(..., description="People who need to attend, as written (emails when given)")
+    duration_minutes: int = Field(..., description="Length of the meeting in minutes")
+    window_start: datetime = Field(..., description="Earliest time the meeting may start (ISO 8601 with timezone)")
+    window_end: datetime = Field(..., description="Latest time the meeting may end (ISO 8601 with timezone)")
+    time_of_day: Optional[str] = Field(None, description="Preferred part of the day, if any: 'morning', 'afternoon' or 'evening'")
+
+class TimeSlot(BaseModel):
+    start_time: datetime
+    end_time: datetime
+    available: List[str] = Field(..., description="Participants free for the whole slot")
+    unavailable: List[str] = Field(default_factory=list, description="Participants busy during some of the slot")
+
+class AvailableSlots(BaseModel):
+    """Ranked answer to a find-a-time request."""
+    message: str
+    duration_minutes: int
+    slots: List[TimeSlot] = []
+    # Participants whose free/busy we could not read (no email, or no access)
+    unknown_participants: List[str] = []
+
+class BatchItemResult(BaseModel):
+    """Outcome of one /process_batch item; exactly one of `result` and `error` is set."""
+    index: int
+    user_input: str
+    intent: Optional[str] = None
+    result: Optional[Union[EventConfirmationDraft, EventListConfirmation, AvailableSlots]] = None
+    error: Optional[str] = None
+
+
+class CreateEventIntent(BaseModel):
+    intent: Literal["create"]
+    confidence_score: float = Field(description="Confidence score between 0 and 1")
+    details: EventDetails
+
+class ModifyEventIntent(BaseModel):
+    intent: Literal["modify"]
+    confidence_score: float = Field(description="Confidence score between 0 and 1")
+    details: EventUpdateDetails
+
+class ListEventsIntent(BaseModel):
+    intent: Literal["list"]
+    confidence_score: float = Field(description="Confidence score between 0 and 1")
+    filters: ListCalendarEventsFilters
+
+class NoCalendarIntent(BaseModel):
+    intent: Literal["none"]
+    confidence_score: float = Field(description="Confidence score between 0 and 1")
+
+class SingleShotParse(BaseModel):
+    """
+    Classification and parsing in one structured call. The union is tagged by
+    each member's literal `intent` (plain anyOf; strict structured outputs don't accept oneOf).
+    """
+    result: Union[CreateEventIntent, ModifyEventIntent, ListEventsIntent, NoCalendarIntent]
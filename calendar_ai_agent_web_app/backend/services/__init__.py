@@ -1 +1 @@
-from .processor import process_calendar_request
+from .processor import process_calendar_request_async
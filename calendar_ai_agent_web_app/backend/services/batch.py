@@ -0,0 +1,91 @@
+import asyncio
+from typing import Optional
+from calendar_ai_agent_web_app.backend.services.processor import (
+    parse_calendar_request_async, _complete_async, _participant_list, _create_draft
+)
+from calendar_ai_agent_web_app.backend.services.streaming import INVALID_REQUEST
+from calendar_ai_agent_web_app.backend.logic.calendar import event_window
+from calendar_ai_agent_web_app.backend.logic.calendar_batch import add_calendar_events_batch_async
+from calendar_ai_agent_web_app.backend.logic.conflicts import find_conflicts_async
+from calendar_ai_agent_web_app.backend.logic.confirmation import generate_confirmation_async
+from calendar_ai_agent_web_app.backend.schemas.models import BatchItemResult
+from calendar_ai_agent_web_app.backend.config import batch_parse_concurrency
+from calendar_ai_agent_web_app.backend.utils.logger import logger
+
+
+async def _parse_all(user_inputs: list[str], user_id: Optional[str]) -> list:
+    slots = asyncio.Semaphore(batch_parse_concurrency)
+
+    async def parse(user_input: str):
+        async with slots:
+            return await parse_calendar_request_async(user_input, user_id)
+
+    return await asyncio.gather(*(parse(user_input) for user_input in user_inputs), return_exceptions=True)
+
+
+async def _finish_creates(creates: list[tuple[BatchItemResult, object]], participant_list: list[str]) -> None:
+    try:
+        # Conflicts are checked against the calendar before anything in the batch is written
+        conflicts = await asyncio.gather(
+            *(find_conflicts_async(*event_window(details), participant_list) for _, details in creates)
+        )
+        links = await add_calendar_events_batch_async([(details, participant_list) for _, details in creates])
+    except Exception as e:
+        logger.exception("Batch calendar write failed")
+        for item, _ in creates:
+            item.error = str(e)
+        return
+
+    async def confirm(item: BatchItemResult, details, link: str, item_conflicts) -> None:
+        try:
+            confirmation = await generate_confirmation_async(details, link)
+            item.result = _create_draft(details, participant_list, confirmation, item_conflicts)
+        except Exception as e:
+            logger.exception(f"Batch item {item.index} failed")
+            item.error = str(e)
+
+    confirmations = []
+    for (item, details), (link, error), item_conflicts in zip(creates, links, conflicts):
+        if error:
+            item.error = error
+        else:
+            confirmations.append(confirm(item, details, link, item_conflicts))
+    await asyncio.gather(*confirmations)
+
+
+async def _finish_other(item: BatchItemResult, parsed, participants: list[str]) -> None:
+    try:
+        item.result = await _complete_async(item.intent, parsed, participants)
+    except Exception as e:
+        logger.exception(f"Batch item {item.index} failed")
+        item.error = str(e)
+
+
+async def process_calendar_batch_async(user_inputs: list[str], participants: list[str],
+                                       user_id: Optional[str] = None) -> list[BatchItemResult]:
+    """
+    Many /process requests at once: every item is parsed concurrently, then all the new
+    events go to Google Calendar in batch requests rather than one insert each.
+    Modify, list and find-a-time items take the usual per-item path. Results come back in input order.
+    """
+    items = [BatchItemResult(index=index, user_input=user_input) for index, user_input in enumerate(user_inputs)]
+    participant_list = _participant_list(participants)
+
+    creates, others = [], []
+    for item, parsed_request in zip(items, await _parse_all(user_inputs, user_id)):
+        if isinstance(parsed_request, Exception):
+            logger.error(f"Batch item {item.index} could not be parsed: {parsed_request}")
+            item.error = str(parsed_request)
+        elif parsed_request is None:
+            item.error = INVALID_REQUEST
+        else:
+            item.intent, parsed = parsed_request
+            if item.intent == "create":
+                creates.append((item, parsed))
+            else:
+                others.append(_finish_other(item, parsed, participants))
+
+    logger.info(f"Batch of {len(items)}: {len(creates)} creates, {len(others)} other requests")
+    work = [_finish_creates(creates, participant_list)] if creates else []
+    await asyncio.gather(*work, *others)
+    return items
@@ -0,0 +1,81 @@
+from contextlib import contextmanager
+from typing import Optional
+from googleapiclient.errors import HttpError
+from calendar_ai_agent_web_app.backend.logic.calendar_batch import _is_rate_limited
+from calendar_ai_agent_web_app.backend.services.processor import (
+    parse_calendar_request_async, _complete_async, _participant_list,
+    _write_create, _write_modify, _create_draft, _modify_draft
+)
+from calendar_ai_agent_web_app.backend.logic.confirmation import generate_confirmation, generate_modify_confirmation
+from calendar_ai_agent_web_app.backend.schemas.models import EventDetails, EventUpdateDetails, EventConflict
+from calendar_ai_agent_web_app.backend.tasks.job_queue import Job, job_queue, PermanentJobError, QUEUED
+from calendar_ai_agent_web_app.backend.utils.logger import logger
+
+CREATE_EVENT = "create_event"
+MODIFY_EVENT = "modify_event"
+
+
+@contextmanager
+def _google_errors():
+    """Client errors a retry won't fix fail the job; rate limits, 5xx and network errors retry."""
+    try:
+        yield
+    except HttpError as error:
+        if 400 <= error.resp.status < 500 and not _is_rate_limited(error):
+            raise PermanentJobError(str(error)) from error
+        raise
+
+
+def run_create_event(job: Job) -> dict:
+    event_details = EventDetails(**job.payload["details"])
+    participant_list = job.payload["participants"]
+
+    # The write is checkpointed so a retry only redoes the confirmation; the job id doubles
+    # as the Google event id, so an insert interrupted before the checkpoint isn't duplicated
+    if "calendar_link" not in job.state:
+        with _google_errors():
+            calendar_link, conflicts = _write_create(event_details, participant_list, event_id=job.id)
+        job.checkpoint(calendar_link=calendar_link, conflicts=[c.model_dump(mode="json") for c in conflicts])
+
+    conflicts = [EventConflict(**c) for c in job.state["conflicts"]]
+    confirmation = generate_confirmation(event_details, job.state["calendar_link"])
+    return _create_draft(event_details, participant_list, confirmation, conflicts).model_dump(mode="json")
+
+
+def run_modify_event(job: Job) -> dict:
+    event_details = EventUpdateDetails(**job.payload["details"])
+    participant_list = job.payload["participants"]
+
+    # An empty link (no matching event) is final, as on the inline path; API errors raise
+    if "calendar_link" not in job.state:
+        with _google_errors():
+            calendar_link = _write_modify(event_details, participant_list)
+        job.checkpoint(calendar_link=calendar_link)
+
+    confirmation = generate_modify_confirmation(event_details, job.state["calendar_link"])
+    return _modify_draft(event_details, participant_list, confirmation).model_dump(mode="json")
+
+
+job_queue.register(CREATE_EVENT, run_create_event)
+job_queue.register(MODIFY_EVENT, run_modify_event)
+
+
+async def submit_calendar_request_async(user_input: str, participants: list[str], user_id: Optional[str] = None) -> Optional[dict]:
+    """
+    Parse inline, then hand the calendar write and confirmation to the job queue and return
+    the job id. List and find-a-time requests have nothing to write and are answered directly.
+    """
+    parsed_request = await parse_calendar_request_async(user_input, user_id)
+    if parsed_request is None:
+        return None
+
+    intent, parsed = parsed_request
+    if intent in ("list", "find_time"):
+        return (await _complete_async(intent, parsed, participants)).model_dump()
+
+    job_id = job_queue.enqueue(
+        CREATE_EVENT if intent == "create" else MODIFY_EVENT,
+        {"details": parsed.model_dump(mode="json"), "participants": _participant_list(participants)},
+    )
+    logger.info(f"Queued {intent} job {job_id}")
+    return {"job_id": job_id, "status": QUEUED, "intent": intent, "details": parsed.model_dump(mode="json")}
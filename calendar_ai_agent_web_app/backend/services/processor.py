@@ -1,93 +1,272 @@
 from typing import Optional, Union
-from langchain_core.messages import HumanMessage
-from calendar_ai_agent_web_app.backend.logic.extractor import extract_event_info, extract_list_event_info
-from calendar_ai_agent_web_app.backend.logic.parser import parse_calendar_event_details, parse_calendar_modify_details, parse_list_calendar_events
-from calendar_ai_agent_web_app.backend.logic.confirmation import generate_confirmation, generate_modify_confirmation, generate_matched_calendar_events_message
-from calendar_ai_agent_web_app.backend.logic.calendar import add_calendar_event, update_calendar_event, get_calendar_events
-from calendar_ai_agent_web_app.backend.schemas.models import  EventConfirmationDraft, EventListConfirmation
+import asyncio
+import time
+from langchain_core.messages import HumanMessage, AIMessage
+from calendar_ai_agent_web_app.backend.logic.extractor import extract_event_info_async, extract_list_event_info_async
+from calendar_ai_agent_web_app.backend.logic.parser import is_find_time_request, parse_find_time_request_async
+from calendar_ai_agent_web_app.backend.logic.confirmation import (
+    generate_confirmation_async, generate_modify_confirmation_async, generate_matched_calendar_events_message_async
+)
+from calendar_ai_agent_web_app.backend.logic.calendar import (
+    insert_calendar_event, patch_calendar_event, add_calendar_event_async, update_calendar_event_async,
+    get_calendar_events_async, event_window
+)
+from calendar_ai_agent_web_app.backend.logic.conflicts import find_conflicts, find_conflicts_async
+from calendar_ai_agent_web_app.backend.logic.scheduler import find_time
+from calendar_ai_agent_web_app.backend.logic.intent_classifier import load_intent_classifier
+from calendar_ai_agent_web_app.backend.logic.single_shot import classify_and_parse_async, is_usable
+from calendar_ai_agent_web_app.backend.services.speculative import (
+    PARSERS, intent_of, classify_and_parse_speculatively, ParsedRequest
+)
+from calendar_ai_agent_web_app.backend.config import local_classifier_threshold, context_bypass_enabled, pipeline_mode
+from calendar_ai_agent_web_app.backend.schemas.models import  (
+    EventConfirmation, EventConfirmationDraft, EventListConfirmation, EventExtraction, EventConflict,
+    EventDetails, EventUpdateDetails, ListCalendarEventsFilters, FindTimeRequest, AvailableSlots
+)
 from calendar_ai_agent_web_app.backend.utils.logger import logger
+from calendar_ai_agent_web_app.backend.utils.metrics import instrumented
 from calendar_ai_agent_web_app.backend.agents.conversation_agent import (
     get_or_create_session_id, graph, get_chat_history
 )
+from calendar_ai_agent_web_app.backend.agents.session_cache import session_cache
+from calendar_ai_agent_web_app.backend.agents.context_detector import context_reason, enrichment_stats
+
+# Requests that don't identify a user share the original single-user session
+DEFAULT_USER = "ethanchiu940520@gmail.com"
+
+# Loaded once at startup; None when no trained artifact is present
+local_classifier = load_intent_classifier()
+
+@instrumented("classify_local")
+def _classify_locally(enriched_input: str) -> Optional[EventExtraction]:
+    if local_classifier is None:
+        return None
+
+    extraction = local_classifier.predict(enriched_input)
+    if extraction.confidence_score < local_classifier_threshold:
+        logger.info(f"Local classifier below threshold ({extraction.confidence_score}), using remote models")
+        return None
+
+    logger.info(f"Local classifier fast path: {extraction}")
+    return extraction
+
+def _local_guess(enriched_input: str) -> Optional[str]:
+    """The local classifier's best intent regardless of confidence, used to pick a speculative parse."""
+    if local_classifier is None:
+        return None
+    extraction = local_classifier.predict(enriched_input)
+    if extraction.is_calendar_modify_event:
+        return "modify"
+    if extraction.is_calendar_event:
+        return "create"
+    return "list" if extraction.is_list_events else None
 
-def process_calendar_request(user_input: str, participants: list[str]) ->  Optional[Union[EventConfirmationDraft, EventListConfirmation]]:
+def _is_unclassified(extraction: EventExtraction) -> bool:
+    return (
+            not extraction.is_calendar_event
+            and not extraction.is_calendar_modify_event
+            and not extraction.is_list_events
+    ) or extraction.confidence_score < 0.7
+
+def _participant_list(participants: list[str]) -> list[str]:
+    return [email.strip() for email in participants if email.strip()]
+
+def _bypass_reason(user_input: str, session_id: str) -> Optional[str]:
+    """None when the input can skip enrichment; otherwise why it needs the history."""
+    if not context_bypass_enabled:
+        return "disabled"
+    return context_reason(user_input, get_chat_history(session_id).last_activity())
+
+def _record_bypassed_turn(user_input: str, session_id: str) -> None:
+    # Keep the history complete so a later "move it" can still resolve against this turn
+    get_chat_history(session_id).add_messages([HumanMessage(content=user_input), AIMessage(content=user_input)])
+    enrichment_stats.record_bypassed()
+    logger.info("Self-contained input, skipping context enrichment")
+
+@instrumented("enrichment")
+async def _enrich_input_async(user_input: str, session_id: str) -> Optional[str]:
+    async with session_cache.async_lock(session_id):
+        # The first look at a session may read its log from disk
+        reason = await asyncio.to_thread(_bypass_reason, user_input, session_id)
+        if reason is None:
+            await asyncio.to_thread(_record_bypassed_turn, user_input, session_id)
+            return user_input
+
+        started = time.perf_counter()
+        enriched_input = None
+        async for event in graph.astream(
+            {"messages": [HumanMessage(content=user_input)]},
+            config={"configurable": {"session_id": session_id}},
+            stream_mode="values",
+        ):
+            enriched_input = event["messages"][-1].content
+        enrichment_stats.record_enriched(reason, time.perf_counter() - started)
+        return enriched_input
+
+def _with_conflict_note(message: str, conflicts: list[EventConflict]) -> str:
+    if not conflicts:
+        return message
+
+    lines = [
+        f"- {c.title}{f' ({c.attendee})' if c.attendee else ''}: "
+        f"{c.start_time.strftime('%a %b %d %I:%M %p')} - {c.end_time.strftime('%I:%M %p')}"
+        for c in conflicts
+    ]
+    return message + "\n\nHeads up, this overlaps with:\n" + "\n".join(lines)
+
+async def _extract_intent_async(enriched_input: str, local_extraction: Optional[EventExtraction]) -> Optional[EventExtraction]:
+    initial_extraction = local_extraction
+    if initial_extraction is None:
+        initial_extraction = await extract_event_info_async(enriched_input)
+
+    if _is_unclassified(initial_extraction):
+
+        # Fallback to list event-specific extraction
+        initial_extraction = await extract_list_event_info_async(enriched_input)
+
+        if _is_unclassified(initial_extraction):
+            logger.warning(f"Invalid calendar input. Confidence: {initial_extraction.confidence_score}")
+            return None
+    return initial_extraction
+
+def _single_shot_enabled(local_extraction: Optional[EventExtraction]) -> bool:
+    # A confident local classification is already free; only the remote path is worth collapsing
+    return pipeline_mode == "single_shot" and local_extraction is None
+
+def _modify_draft(event_details: EventUpdateDetails, participant_list: list[str], confirmation: EventConfirmation) -> EventConfirmationDraft:
+    return EventConfirmationDraft(
+        confirmation_message=confirmation.confirmation_message,
+        calendar_link=confirmation.calendar_link,
+        to_emails=participant_list,
+        subject=event_details.name,
+        requires_confirmation=True
+    )
+
+def _create_draft(event_details: EventDetails, participant_list: list[str], confirmation: EventConfirmation,
+                  conflicts: list[EventConflict]) -> EventConfirmationDraft:
+    return EventConfirmationDraft(
+        confirmation_message=_with_conflict_note(confirmation.confirmation_message, conflicts),
+        calendar_link=confirmation.calendar_link,
+        to_emails=participant_list,
+        subject=event_details.name,
+        requires_confirmation=True,
+        conflicts=conflicts
+    )
+
+def _write_modify(event_details: EventUpdateDetails, participant_list: list[str]) -> str:
+    logger.info("This is a calendar modify event.")
+    logger.debug(f"Modify details: {event_details}")
+    return patch_calendar_event(event_details, participant_list)
+
+async def _write_modify_async(event_details: EventUpdateDetails, participant_list: list[str]) -> str:
+    logger.info("This is a calendar modify event.")
+    logger.debug(f"Modify details: {event_details}")
+    return await update_calendar_event_async(event_details, participant_list)
+
+async def _complete_modify_async(event_details: EventUpdateDetails, participants: list[str]) -> EventConfirmationDraft:
+    participant_list = _participant_list(participants)
+    calendar_link = await _write_modify_async(event_details, participant_list)
+    confirmation = await generate_modify_confirmation_async(event_details, calendar_link)
+    return _modify_draft(event_details, participant_list, confirmation)
+
+def _write_create(event_details: EventDetails, participant_list: list[str],
+                  event_id: Optional[str] = None) -> tuple[str, list[EventConflict]]:
+    logger.info("This is a calendar event.")
+
+    # Check for double-bookings before the insert, so the new event doesn't match itself
+    conflicts = find_conflicts(*event_window(event_details), participant_list)
+
+    calendar_link = insert_calendar_event(event_details, participant_list, event_id)
+    return calendar_link, conflicts
+
+async def _write_create_async(event_details: EventDetails, participant_list: list[str]) -> tuple[str, list[EventConflict]]:
+    logger.info("This is a calendar event.")
+
+    # Check for double-bookings before the insert, so the new event doesn't match itself
+    conflicts = await find_conflicts_async(*event_window(event_details), participant_list)
+
+    calendar_link = await add_calendar_event_async(event_details, participant_list)
+    return calendar_link, conflicts
+
+async def _complete_create_async(event_details: EventDetails, participants: list[str]) -> EventConfirmationDraft:
+    participant_list = _participant_list(participants)
+    calendar_link, conflicts = await _write_create_async(event_details, participant_list)
+    confirmation = await generate_confirmation_async(event_details, calendar_link)
+    return _create_draft(event_details, participant_list, confirmation, conflicts)
+
+async def _complete_list_async(filters: ListCalendarEventsFilters) -> EventListConfirmation:
+    matched_events = await get_calendar_events_async(filters)
+    matched_events_confirmation_message = await generate_matched_calendar_events_message_async(matched_events)
+
+    return EventListConfirmation(
+        message=matched_events_confirmation_message.message
+    )
+
+async def _complete_find_time_async(request: FindTimeRequest, participants: list[str]) -> AvailableSlots:
+    # Free/busy lookups block on HTTP, so the whole search runs off the event loop
+    return await asyncio.to_thread(find_time, request, _participant_list(participants))
+
+async def _complete_async(intent: str, parsed, participants: list[str]) -> Union[EventConfirmationDraft, EventListConfirmation, AvailableSlots]:
+    if intent == "find_time":
+        return await _complete_find_time_async(parsed, participants)
+    if intent == "modify":
+        return await _complete_modify_async(parsed, participants)
+    if intent == "create":
+        return await _complete_create_async(parsed, participants)
+    return await _complete_list_async(parsed)
+
+async def parse_calendar_request_async(user_input: str, user_id: Optional[str] = None) -> Optional[tuple[str, ParsedRequest]]:
+    """Steps 1-3 of the pipeline: the request's intent and parsed details, or None if it isn't a calendar request."""
     logger.info("Processing calendar request")
 
-    session_id = get_or_create_session_id("ethanchiu940520@gmail.com")
+    session_id = get_or_create_session_id(user_id or DEFAULT_USER)
 
-    # Step 1: Use LangGraph agent to get context-aware enriched input
-    enriched_input = None
-    for event in graph.stream(
-        {"messages": [HumanMessage(content=user_input)]},
-        config={"configurable": {"session_id": session_id}},
-        stream_mode="values",
-    ):
-        enriched_input = event["messages"][-1].content
+    # Step 1: Use LangGraph agent to get context-aware enriched input, unless the input stands on its own
+    enriched_input = await _enrich_input_async(user_input, session_id)
 
     if not enriched_input:
         logger.warning("No valid AI response from LangGraph.")
         return None
 
-    chat_history = get_chat_history(session_id)
     logger.info(f"LangGraph memory for session {session_id}:")
 
-    # Step 2: Extract event info
-    initial_extraction = extract_event_info(enriched_input)
-    if (
-            not initial_extraction.is_calendar_event
-            and not initial_extraction.is_calendar_modify_event
-            and not initial_extraction.is_list_events
-    ) or initial_extraction.confidence_score < 0.7:
+    local_extraction = _classify_locally(enriched_input)
 
-        # Fallback to list event-specific extraction
-        initial_extraction = extract_list_event_info(enriched_input)
+    # Single-shot mode: classify and parse in one structured call
+    if _single_shot_enabled(local_extraction):
+        result = await classify_and_parse_async(enriched_input)
+        if is_usable(result):
+            if is_find_time_request(enriched_input, result.intent):
+                return "find_time", await parse_find_time_request_async(enriched_input)
+            return result.intent, result.filters if result.intent == "list" else result.details
+        logger.info("Single-shot parse inconclusive, falling back to the multi-stage path")
 
-        if(not initial_extraction.is_calendar_event
-            and not initial_extraction.is_calendar_modify_event
-            and not initial_extraction.is_list_events
-        ) or initial_extraction.confidence_score < 0.7:
-            logger.warning(f"Invalid calendar input. Confidence: {initial_extraction.confidence_score}")
+    # Step 2-3 (remote): classifiers and parser overlapped per SPECULATION_LEVEL
+    if local_extraction is None:
+        outcome = await classify_and_parse_speculatively(enriched_input, _local_guess(enriched_input))
+        if is_find_time_request(enriched_input, outcome.intent if outcome else None):
+            return "find_time", await parse_find_time_request_async(enriched_input)
+        if outcome is None:
             return None
+        return outcome.intent, outcome.parsed
+
+    # Step 2: Extract event info, trying the in-process classifier before the remote models
+    initial_extraction = await _extract_intent_async(enriched_input, local_extraction)
+    intent = intent_of(initial_extraction) if initial_extraction else None
+    if is_find_time_request(enriched_input, intent):
+        return "find_time", await parse_find_time_request_async(enriched_input)
+    if intent is None:
+        return None
+
+    # Step 3: Parse
+    return intent, await PARSERS[intent](initial_extraction.description)
 
-    if initial_extraction.is_calendar_modify_event:
-        logger.info("This is a calendar modify event.")
-
-        # Step 3a: Parse, add to calendar, confirm for calendar modify event
-        event_details = parse_calendar_modify_details(initial_extraction.description)
-        print(event_details)
-        participant_list = [email.strip() for email in participants if email.strip()]
-        calendar_link = update_calendar_event(event_details, participant_list)
-        confirmation = generate_modify_confirmation(event_details, calendar_link)
-
-        return EventConfirmationDraft(
-            confirmation_message=confirmation.confirmation_message,
-            calendar_link=confirmation.calendar_link,
-            to_emails=participant_list,
-            subject=event_details.name,
-            requires_confirmation=True
-        )
-    elif initial_extraction.is_calendar_event:
-        logger.info("This is a calendar event.")
-
-        # Step 3b: Parse, add to calendar, confirm for calendar event
-        event_details = parse_calendar_event_details(initial_extraction.description)
-        participant_list = [email.strip() for email in participants if email.strip()]
-        calendar_link = add_calendar_event(event_details, participant_list)
-        confirmation = generate_confirmation(event_details, calendar_link)
-
-        return EventConfirmationDraft(
-            confirmation_message=confirmation.confirmation_message,
-            calendar_link=confirmation.calendar_link,
-            to_emails=participant_list,
-            subject=event_details.name,
-            requires_confirmation=True
-        )
-    else:
-        list_calender_events_filters = parse_list_calendar_events(initial_extraction.description)
-        matched_events = get_calendar_events(list_calender_events_filters)
-        matched_events_confirmation_message = generate_matched_calendar_events_message(matched_events)
-
-        return EventListConfirmation(
-            message=matched_events_confirmation_message.message
-        )
+async def process_calendar_request_async(user_input: str, participants: list[str], user_id: Optional[str] = None) -> Optional[Union[EventConfirmationDraft, EventListConfirmation, AvailableSlots]]:
+    """The whole /process pipeline, awaited directly from the FastAPI event loop."""
+    parsed_request = await parse_calendar_request_async(user_input, user_id)
+    if parsed_request is None:
+        return None
 
+    # Step 4: update / add / list / find a time and confirm
+    intent, parsed = parsed_request
+    return await _complete_async(intent, parsed, participants)
@@ -0,0 +1,171 @@
+import asyncio
+import threading
+import time
+from collections import Counter, deque
+from typing import Awaitable, NamedTuple, Optional, Union
+from calendar_ai_agent_web_app.backend.logic.extractor import extract_event_info_async, extract_list_event_info_async
+from calendar_ai_agent_web_app.backend.logic.parser import (
+    parse_calendar_event_details_async, parse_calendar_modify_details_async, parse_list_calendar_events_async
+)
+from calendar_ai_agent_web_app.backend.logic.llm import track_usage
+from calendar_ai_agent_web_app.backend.schemas.models import (
+    EventExtraction, EventDetails, EventUpdateDetails, ListCalendarEventsFilters, FindTimeRequest
+)
+from calendar_ai_agent_web_app.backend.config import speculation_level
+from calendar_ai_agent_web_app.backend.utils.logger import logger
+
+ParsedRequest = Union[EventDetails, EventUpdateDetails, ListCalendarEventsFilters, FindTimeRequest]
+
+PARSERS = {
+    "modify": parse_calendar_modify_details_async,
+    "create": parse_calendar_event_details_async,
+    "list": parse_list_calendar_events_async,
+}
+
+
+class SpeculativeOutcome(NamedTuple):
+    intent: str
+    extraction: EventExtraction
+    parsed: ParsedRequest
+
+
+def intent_of(extraction: EventExtraction) -> Optional[str]:
+    """Same precedence and threshold the processor has always used."""
+    if extraction.confidence_score < 0.7:
+        return None
+    if extraction.is_calendar_modify_event:
+        return "modify"
+    if extraction.is_calendar_event:
+        return "create"
+    if extraction.is_list_events:
+        return "list"
+    return None
+
+
+class _Branch:
+    """A task plus the token usage its LLM calls recorded."""
+
+    def __init__(self, name: str, coro: Awaitable):
+        self.name = name
+        self.usage = Counter()
+        self.task = asyncio.create_task(self._run(coro))
+
+    async def _run(self, coro):
+        # Tasks copy the context at creation, so this recorder only sees this branch's calls
+        self.usage = track_usage()
+        return await coro
+
+
+class SpeculationStats:
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self._counts = Counter()
+
+    def record(self, seconds: float, branches: list[_Branch], kept: set[str]) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+            self._counts["requests"] += 1
+            for branch in branches:
+                tokens = branch.usage["prompt_tokens"] + branch.usage["completion_tokens"]
+                if branch.name in kept:
+                    self._counts["used_tokens"] += tokens
+                elif branch.task.cancelled():
+                    self._counts["cancelled_branches"] += 1
+                else:
+                    self._counts["discarded_branches"] += 1
+                    self._counts["wasted_tokens"] += tokens
+
+    def count(self, key: str) -> None:
+        with self._lock:
+            self._counts[key] += 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            stats = dict(self._counts)
+            latencies = sorted(self._latencies)
+        if latencies:
+            stats["p50_ms"] = latencies[len(latencies) // 2] * 1000
+            stats["p95_ms"] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000
+        used = stats.get("used_tokens", 0)
+        stats["token_overhead"] = stats.get("wasted_tokens", 0) / used if used else 0.0
+        stats["level"] = speculation_level
+        return stats
+
+
+speculation_stats = SpeculationStats()
+
+
+async def _settle(branch: _Branch, default):
+    try:
+        return await branch.task
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        logger.exception(f"Speculative branch {branch.name} failed")
+        return default
+
+
+async def classify_and_parse_speculatively(text: str, guess: Optional[str] = None,
+                                           level: int = speculation_level) -> Optional[SpeculativeOutcome]:
+    """
+    Remote classification plus parsing, overlapped according to `level`:
+
+    0 - serial: primary classifier, list classifier only if that is unsure, then the parser.
+    1 - both classifiers start together, unless the local classifier's `guess` is create or modify
+        (then the list classifier waits, as in 0); it is cancelled once the primary is confident.
+    2 - as 1, and the parser for `guess` (the local classifier's best intent) starts on the raw
+        text immediately; it is kept if classification agrees, cancelled otherwise.
+    """
+    started = time.perf_counter()
+    branches: list[_Branch] = []
+    kept: set[str] = set()
+
+    def start(name: str, coro: Awaitable) -> _Branch:
+        branch = _Branch(name, coro)
+        branches.append(branch)
+        return branch
+
+    primary = start("classify", extract_event_info_async(text))
+    # The list classifier is only worth starting early when the request may well be a list query
+    early_fallback = level >= 1 and guess in (None, "list")
+    fallback = start("classify_list", extract_list_event_info_async(text)) if early_fallback else None
+    speculative = start(f"speculative_parse_{guess}", PARSERS[guess](text)) if level >= 2 and guess in PARSERS else None
+
+    try:
+        extraction = await primary.task
+        kept.add(primary.name)
+        intent = intent_of(extraction)
+
+        if intent is None:
+            if fallback is None:
+                fallback = start("classify_list", extract_list_event_info_async(text))
+            extraction = await fallback.task
+            kept.add(fallback.name)
+            intent = intent_of(extraction)
+
+        if intent is None:
+            logger.warning(f"Invalid calendar input. Confidence: {extraction.confidence_score}")
+            return None
+
+        if speculative is not None and guess == intent:
+            parsed = await _settle(speculative, None)
+            if parsed is not None:
+                kept.add(speculative.name)
+                speculation_stats.count("parse_hits")
+                return SpeculativeOutcome(intent, extraction, parsed)
+        elif speculative is not None:
+            speculation_stats.count("parse_misses")
+
+        parse = start(f"parse_{intent}", PARSERS[intent](extraction.description))
+        parsed = await parse.task
+        kept.add(parse.name)
+        return SpeculativeOutcome(intent, extraction, parsed)
+
+    finally:
+        # Losing branches still in flight are cancelled; finished ones count as wasted spend
+        losers = [branch for branch in branches if branch.name not in kept and not branch.task.done()]
+        for branch in losers:
+            branch.task.cancel()
+        await asyncio.gather(*(branch.task for branch in losers), return_exceptions=True)
+        speculation_stats.record(time.perf_counter() - started, branches, kept)
@@ -0,0 +1,161 @@
+import asyncio
+import json
+from typing import AsyncIterator, Awaitable, Callable, Optional
+from calendar_ai_agent_web_app.backend.services.processor import (
+    DEFAULT_USER, _enrich_input_async, _classify_locally, _local_guess, _single_shot_enabled,
+    _extract_intent_async, _participant_list, _write_create_async, _write_modify_async, _with_conflict_note,
+    _complete_find_time_async
+)
+from calendar_ai_agent_web_app.backend.services.speculative import PARSERS, intent_of, classify_and_parse_speculatively
+from calendar_ai_agent_web_app.backend.logic.single_shot import classify_and_parse_async, is_usable
+from calendar_ai_agent_web_app.backend.logic.calendar import get_calendar_events_async
+from calendar_ai_agent_web_app.backend.logic.parser import is_find_time_request, parse_find_time_request_async
+from calendar_ai_agent_web_app.backend.logic.confirmation import (
+    stream_confirmation_async, stream_modify_confirmation_async, stream_matched_calendar_events_message_async
+)
+from calendar_ai_agent_web_app.backend.agents.conversation_agent import get_or_create_session_id
+from calendar_ai_agent_web_app.backend.schemas.models import EventConfirmationDraft, EventListConfirmation
+from calendar_ai_agent_web_app.backend.utils.logger import logger
+
+INVALID_REQUEST = "Not a valid calendar request."
+
+# How often an idle stream checks whether the client is still there
+DISCONNECT_POLL_SECONDS = 1.0
+
+
+async def process_calendar_request_events(user_input: str, participants: list[str],
+                                          user_id: Optional[str] = None) -> AsyncIterator[tuple[str, dict]]:
+    """
+    The /process pipeline as a sequence of (event, data) pairs:
+    enriched, classified, parsed, calendar, token..., then done (the /process response body).
+    An invalid request ends with a single error event instead.
+    """
+    session_id = get_or_create_session_id(user_id or DEFAULT_USER)
+
+    enriched_input = await _enrich_input_async(user_input, session_id)
+    if not enriched_input:
+        yield "error", {"error": INVALID_REQUEST}
+        return
+    yield "enriched", {"input": enriched_input}
+
+    local_extraction = _classify_locally(enriched_input)
+    intent = parsed = classified = None
+
+    if _single_shot_enabled(local_extraction):
+        result = await classify_and_parse_async(enriched_input)
+        if is_usable(result):
+            intent, parsed = result.intent, result.filters if result.intent == "list" else result.details
+            classified = {"intent": intent, "source": "single_shot"}
+
+    if intent is None and local_extraction is None:
+        # Classification and parsing overlap here, so both events go out together
+        outcome = await classify_and_parse_speculatively(enriched_input, _local_guess(enriched_input))
+        if outcome is not None:
+            intent, parsed = outcome.intent, outcome.parsed
+            classified = {"intent": intent, "source": "remote", "description": outcome.extraction.description}
+
+    elif intent is None:
+        extraction = await _extract_intent_async(enriched_input, local_extraction)
+        if extraction is not None:
+            intent = intent_of(extraction)
+            classified = {"intent": intent, "source": "local", "description": extraction.description}
+
+    if is_find_time_request(enriched_input, intent):
+        yield "classified", {"intent": "find_time", "source": "rules"}
+        parsed = await parse_find_time_request_async(enriched_input)
+        yield "parsed", {"intent": "find_time", "details": parsed.model_dump(mode="json")}
+        result = await _complete_find_time_async(parsed, participants)
+        yield "calendar", {"slots": len(result.slots), "unknown_participants": result.unknown_participants}
+        # The suggestions come from a template, so the whole message goes out as one token
+        yield "token", {"text": result.message}
+        yield "done", result.model_dump(mode="json")
+        return
+
+    if intent is None:
+        yield "error", {"error": INVALID_REQUEST}
+        return
+    yield "classified", classified
+    if parsed is None:
+        parsed = await PARSERS[intent](classified["description"])
+
+    yield "parsed", {"intent": intent, "details": parsed.model_dump(mode="json")}
+
+    participant_list = _participant_list(participants)
+    conflicts = []
+    if intent == "list":
+        matched_events = await get_calendar_events_async(parsed)
+        yield "calendar", {"matched_events": len(matched_events.matched_events)}
+        tokens = stream_matched_calendar_events_message_async(matched_events)
+    elif intent == "create":
+        calendar_link, conflicts = await _write_create_async(parsed, participant_list)
+        yield "calendar", {"calendar_link": calendar_link, "conflicts": [c.model_dump(mode="json") for c in conflicts]}
+        tokens = stream_confirmation_async(parsed, calendar_link)
+    else:
+        calendar_link = await _write_modify_async(parsed, participant_list)
+        yield "calendar", {"calendar_link": calendar_link}
+        tokens = stream_modify_confirmation_async(parsed, calendar_link)
+
+    chunks = []
+    async for token in tokens:
+        chunks.append(token)
+        yield "token", {"text": token}
+    message = "".join(chunks)
+
+    if conflicts:
+        note = _with_conflict_note(message, conflicts)[len(message):]
+        yield "token", {"text": note}
+        message += note
+
+    if intent == "list":
+        final = EventListConfirmation(message=message)
+    else:
+        final = EventConfirmationDraft(
+            confirmation_message=message,
+            calendar_link=calendar_link,
+            to_emails=participant_list,
+            subject=parsed.name,
+            requires_confirmation=True,
+            conflicts=conflicts
+        )
+    yield "done", final.model_dump(mode="json")
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def sse_stream(events: AsyncIterator[tuple[str, dict]],
+                     is_disconnected: Callable[[], Awaitable[bool]]) -> AsyncIterator[str]:
+    """
+    Server-sent events for `events`. The pipeline runs as its own task so a client that goes
+    away while a stage is in flight gets that stage (and everything after it) cancelled.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    finished = object()
+
+    async def produce():
+        try:
+            async for item in events:
+                await queue.put(item)
+        except Exception as e:
+            logger.exception("Streaming pipeline failed")
+            await queue.put(("error", {"error": str(e)}))
+        finally:
+            queue.put_nowait(finished)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), DISCONNECT_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                if await is_disconnected():
+                    logger.info("Stream client disconnected; cancelling remaining stages")
+                    break
+                continue
+            if item is finished:
+                break
+            yield _sse(*item)
+    finally:
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
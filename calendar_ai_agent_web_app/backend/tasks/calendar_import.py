@@ -0,0 +1,160 @@
+import argparse
+import json
+import os
+import time
+from datetime import date, timedelta
+from itertools import islice
+from typing import Iterator, Optional
+from calendar_ai_agent_web_app.backend.logic.calendar import event_body
+from calendar_ai_agent_web_app.backend.logic.calendar_batch import insert_events_batch
+from calendar_ai_agent_web_app.backend.logic.calendar_mirror import CalendarMirror, calendar_mirror
+from calendar_ai_agent_web_app.backend.logic.event_import import ImportRecord, iter_records, detect_format
+from calendar_ai_agent_web_app.backend.config import calendar_import_rate, calendar_batch_size
+from calendar_ai_agent_web_app.backend.utils.logger import logger
+
+# Rate-limited inserts get this many resends (with backoff) before they count as failed
+IMPORT_RETRIES = 5
+
+
+class _RateLimiter:
+    """Token bucket over events per second; one batch's worth of burst."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def acquire(self, count: int) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= count:
+                self.tokens -= count
+                return
+            time.sleep((count - self.tokens) / self.rate)
+
+
+def _fingerprint(path: str) -> dict:
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def _load_checkpoint(checkpoint_path: str, source: str) -> dict:
+    fresh = {"source": os.path.abspath(source), "file": _fingerprint(source), "records_done": 0,
+             "inserted": 0, "duplicates": 0, "invalid": 0, "failed": 0}
+    if not os.path.exists(checkpoint_path):
+        return fresh
+    with open(checkpoint_path) as f:
+        checkpoint = json.load(f)
+    if checkpoint.get("file") != fresh["file"]:
+        logger.warning(f"{source} changed since checkpoint {checkpoint_path} was written; starting over")
+        return fresh
+    logger.info(f"Resuming {source} after {checkpoint['records_done']} records")
+    return checkpoint
+
+
+def _save_checkpoint(checkpoint_path: str, checkpoint: dict) -> None:
+    # Write-then-rename, so an interrupted save leaves the previous checkpoint intact
+    tmp_path = f"{checkpoint_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, checkpoint_path)
+
+
+def _body(record: ImportRecord) -> dict:
+    body = event_body(record.details, record.details.participants)
+    if record.all_day:
+        # Google marks all-day events by dates in place of times, the end date exclusive
+        first = date.fromisoformat(record.details.date[:10])
+        days = max(1, -(-record.details.duration_minutes // (24 * 60)))
+        body["start"] = {"date": first.isoformat()}
+        body["end"] = {"date": (first + timedelta(days=days)).isoformat()}
+    # Google ids are base32hex; a hex digest of the record key is valid and stable across reruns,
+    # so records re-sent after a crash come back as duplicates instead of second copies
+    body["id"] = record.key[:32]
+    if record.recurrence:
+        body["recurrence"] = record.recurrence
+    return body
+
+
+def _batches(records: Iterator[ImportRecord], size: int) -> Iterator[list[ImportRecord]]:
+    while batch := list(islice(records, size)):
+        yield batch
+
+
+def import_events(source: str, fmt: Optional[str] = None, checkpoint_path: Optional[str] = None,
+                  rate: float = calendar_import_rate, limit: Optional[int] = None, dry_run: bool = False,
+                  service=None, mirror: CalendarMirror = calendar_mirror) -> dict:
+    """
+    Stream `source` (.ics or .csv) into Google Calendar without any LLM calls.
+
+    Records are read one batch at a time and inserted with Calendar batch requests, at most
+    `rate` events per second. After every batch the number of records handled is saved to
+    the checkpoint, so rerunning the same command resumes where an interrupted run stopped.
+    Records that can't be mapped or inserted are appended to `<checkpoint>.errors.jsonl`.
+    `limit` stops after that many records in this run.
+    """
+    fmt = fmt or detect_format(source)
+    checkpoint_path = checkpoint_path or f"{source}.import.json"
+    errors_path = f"{checkpoint_path}.errors.jsonl"
+    checkpoint = _load_checkpoint(checkpoint_path, source)
+    limiter = _RateLimiter(rate, calendar_batch_size)
+
+    records = islice(iter_records(source, fmt), checkpoint["records_done"], None)
+    if limit is not None:
+        records = islice(records, limit)
+
+    started = time.perf_counter()
+    handled = valid_records = 0
+    with open(errors_path, "a") as errors:
+        for batch in _batches(records, calendar_batch_size):
+            valid = [record for record in batch if record.error is None]
+            for record in batch:
+                if record.error is not None:
+                    errors.write(json.dumps({"line": record.line, "error": record.error}) + "\n")
+            checkpoint["invalid"] += len(batch) - len(valid)
+            valid_records += len(valid)
+
+            if valid and not dry_run:
+                limiter.acquire(len(valid))
+                results = insert_events_batch([_body(record) for record in valid], service, mirror,
+                                              retries=IMPORT_RETRIES)
+                for record, (link, error) in zip(valid, results):
+                    if error:
+                        checkpoint["failed"] += 1
+                        errors.write(json.dumps({"line": record.line, "error": error}) + "\n")
+                    elif link is None:
+                        checkpoint["duplicates"] += 1
+                    else:
+                        checkpoint["inserted"] += 1
+
+            errors.flush()
+            checkpoint["records_done"] = batch[-1].number + 1
+            handled += len(batch)
+            if not dry_run:
+                _save_checkpoint(checkpoint_path, checkpoint)
+
+    elapsed = time.perf_counter() - started
+    logger.info(f"Imported {handled} records from {source} in {elapsed:.1f}s")
+    return {**checkpoint, "records_this_run": handled, "valid_this_run": valid_records, "seconds": elapsed,
+            "records_per_second": handled / elapsed if elapsed else 0.0}
+
+def main():
+    parser = argparse.ArgumentParser(description="Import .ics / .csv events into Google Calendar without the LLM.")
+    parser.add_argument("source")
+    parser.add_argument("--format", choices=["ics", "csv"])
+    parser.add_argument("--checkpoint", help="defaults to <source>.import.json")
+    parser.add_argument("--rate", type=float, default=calendar_import_rate, help="events per second, 0 for no limit")
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--dry-run", action="store_true", help="parse and report without writing")
+    args = parser.parse_args()
+    print(json.dumps(import_events(args.source, args.format, args.checkpoint, args.rate, args.limit,
+                                   args.dry_run), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict, deque
+from typing import Callable, Optional
+from calendar_ai_agent_web_app.backend.config import job_queue_path, job_workers, job_max_attempts, job_retry_backoff
+from calendar_ai_agent_web_app.backend.utils.logger import logger, trace_id_var, traced
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT '{}',
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    run_after REAL NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, run_after);
+"""
+
+# Added after the first release; older queue files get the column on open
+_DEDUPE_SCHEMA = "CREATE UNIQUE INDEX IF NOT EXISTS jobs_by_dedupe_key ON jobs (dedupe_key);"
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+TERMINAL = {SUCCEEDED, FAILED}
+
+# Succeeded jobs are kept this long for status lookups; failed ones stay as dead letters
+RETENTION_SECONDS = 7 * 24 * 60 * 60
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying cannot help; the job fails without further attempts."""
+
+
+class Job:
+    """A claimed job as seen by its handler."""
+
+    def __init__(self, queue: "JobQueue", id: str, kind: str, payload: dict, state: dict, attempts: int,
+                 created_at: float, trace_id: Optional[str] = None):
+        self._queue = queue
+        self.id = id
+        self.kind = kind
+        self.payload = payload
+        self.state = state
+        self.attempts = attempts
+        self.created_at = created_at
+        # Trace id of the request that queued the job, so its logs line up with the request's
+        self.trace_id = trace_id
+
+    def checkpoint(self, **values) -> None:
+        """Persist progress so a retry (or a restart) resumes after the steps already done."""
+        self.state.update(values)
+        self._queue._save_state(self.id, self.state)
+
+
+class JobQueue:
+    """
+    Durable job queue on SQLite with a bounded pool of worker threads.
+
+    Handlers are registered per job kind and get a `Job`; what they return is stored as
+    the job's result. A handler that raises is retried with exponential backoff up to
+    `max_attempts` times; one that raises PermanentJobError fails straight away. Failed
+    jobs are kept as dead letters until requeued. Jobs left running by a crash are
+    requeued on start, so handlers should checkpoint the side effects they have already made.
+    """
+
+    def __init__(self, path: str = job_queue_path, workers: int = job_workers,
+                 max_attempts: int = job_max_attempts, retry_backoff: float = job_retry_backoff):
+        self.path = path
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+
+        # Opened on first use, so importing the module doesn't create the file
+        self._connection: Optional[sqlite3.Connection] = None
+        self._open_lock = threading.Lock()
+        self._db_lock = threading.Lock()
+
+        self._handlers: dict[str, Callable[[Job], dict]] = {}
+        self._wakeup = threading.Condition()
+        self._stopping = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+        self._stats_lock = threading.Lock()
+        self._stats = Counter()
+        self._busy = 0
+        self._busy_seconds = 0.0
+        self._started_at: Optional[float] = None
+        # Enqueue-to-success seconds of recent jobs, per kind
+        self._lag: defaultdict[str, deque] = defaultdict(lambda: deque(maxlen=1000))
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        if self._connection is None:
+            with self._open_lock:
+                if self._connection is None:
+                    conn = sqlite3.connect(self.path, check_same_thread=False)
+                    conn.executescript(_SCHEMA)
+                    columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+                    if "dedupe_key" not in columns:
+                        conn.execute("ALTER TABLE jobs ADD COLUMN dedupe_key TEXT")
+                    if "trace_id" not in columns:
+                        conn.execute("ALTER TABLE jobs ADD COLUMN trace_id TEXT")
+                    conn.executescript(_DEDUPE_SCHEMA)
+                    self._connection = conn
+        return self._connection
+
+    def register(self, kind: str, handler: Callable[[Job], dict]) -> None:
+        self._handlers[kind] = handler
+
+    # ----------------------------- Lifecycle -----------------------------
+    def start(self) -> None:
+        if self._threads:
+            return
+        now = time.time()
+        with self._db_lock, self._conn:
+            recovered = self._conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE status = ?", (QUEUED, now, RUNNING)
+            ).rowcount
+            self._conn.execute(
+                "DELETE FROM jobs WHERE status = ? AND updated_at < ?", (SUCCEEDED, now - RETENTION_SECONDS)
+            )
+        if recovered:
+            logger.warning(f"Requeued {recovered} job(s) interrupted by the last shutdown")
+
+        self._stopping.clear()
+        self._started_at = now
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stopping.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    # ----------------------------- Producer side -----------------------------
+    def enqueue(self, kind: str, payload: dict) -> str:
+        return self.enqueue_once(kind, payload)[0]
+
+    def enqueue_once(self, kind: str, payload: dict, dedupe_key: Optional[str] = None) -> tuple[str, bool]:
+        """
+        Queue a job unless one with the same `dedupe_key` already exists. Returns the job id
+        and whether it was created by this call.
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for job kind {kind!r}")
+
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._db_lock, self._conn:
+            if dedupe_key is not None:
+                existing = self._conn.execute("SELECT id FROM jobs WHERE dedupe_key = ?", (dedupe_key,)).fetchone()
+                if existing:
+                    self._count("deduplicated")
+                    return existing[0], False
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, payload, status, run_after, created_at, updated_at, dedupe_key, trace_id) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, json.dumps(payload), QUEUED, now, now, now, dedupe_key, trace_id_var.get()),
+            )
+        self._count("enqueued")
+        with self._wakeup:
+            self._wakeup.notify()
+        return job_id, True
+
+    def requeue(self, job_id: str) -> bool:
+        """Give a failed (dead-lettered) job a fresh set of attempts."""
+        now = time.time()
+        with self._db_lock, self._conn:
+            requeued = self._conn.execute(
+                "UPDATE jobs SET status = ?, attempts = 0, run_after = ?, updated_at = ? WHERE id = ? AND status = ?",
+                (QUEUED, now, now, job_id, FAILED),
+            ).rowcount
+        if requeued:
+            self._count("requeued")
+            with self._wakeup:
+                self._wakeup.notify()
+        return bool(requeued)
+
+    def dead_letters(self, kind: Optional[str] = None, limit: int = 50) -> list[dict]:
+        with self._db_lock:
+            rows = self._conn.execute(
+                "SELECT id FROM jobs WHERE status = ? AND (? IS NULL OR kind = ?) ORDER BY updated_at DESC LIMIT ?",
+                (FAILED, kind, kind, limit),
+            ).fetchall()
+        return [self.get(row[0]) for row in rows]
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT id, kind, status, attempts, result, error, created_at, updated_at FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "id": row[0],
+            "kind": row[1],
+            "status": row[2],
+            "attempts": row[3],
+            "result": json.loads(row[4]) if row[4] else None,
+            "error": row[5],
+            "created_at": row[6],
+            "updated_at": row[7],
+        }
+
+    async def wait_async(self, job_id: str, timeout: float, poll_interval: float = 0.25) -> Optional[dict]:
+        """Long-poll: the job once it has finished, or as it stands after `timeout` seconds."""
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job["status"] in TERMINAL or time.monotonic() >= deadline:
+                return job
+            await asyncio.sleep(min(poll_interval, max(0.0, deadline - time.monotonic())))
+
+    # ----------------------------- Worker side -----------------------------
+    def _claim(self) -> Optional[Job]:
+        now = time.time()
+        with self._db_lock, self._conn:
+            row = self._conn.execute(
+                "SELECT id, kind, payload, state, attempts, created_at, trace_id FROM jobs WHERE status = ? AND run_after <= ? "
+                "ORDER BY run_after LIMIT 1",
+                (QUEUED, now),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?", (RUNNING, now, row[0])
+            )
+        return Job(self, row[0], row[1], json.loads(row[2]), json.loads(row[3]), row[4] + 1, row[5], row[6])
+
+    def _save_state(self, job_id: str, state: dict) -> None:
+        with self._db_lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET state = ?, updated_at = ? WHERE id = ?", (json.dumps(state), time.time(), job_id)
+            )
+
+    def _finish(self, job: Job, status: str, result: Optional[dict] = None, error: Optional[str] = None,
+                run_after: Optional[float] = None) -> None:
+        now = time.time()
+        with self._db_lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, run_after = COALESCE(?, run_after), updated_at = ? "
+                "WHERE id = ?",
+                (status, json.dumps(result) if result is not None else None, error, run_after, now, job.id),
+            )
+
+    def _run(self, job: Job) -> None:
+        handler = self._handlers.get(job.kind)
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for job kind {job.kind!r}")
+            result = handler(job)
+        except Exception as e:
+            permanent = isinstance(e, PermanentJobError) or handler is None
+            if job.attempts < self.max_attempts and not permanent:
+                delay = self.retry_backoff * 2 ** (job.attempts - 1)
+                logger.warning(f"Job {job.id} ({job.kind}) attempt {job.attempts} failed, retrying in {delay:.1f}s: {e}")
+                self._finish(job, QUEUED, error=str(e), run_after=time.time() + delay)
+                self._count("retries")
+            else:
+                logger.exception(f"Job {job.id} ({job.kind}) failed after {job.attempts} attempt(s)")
+                self._finish(job, FAILED, error=str(e))
+                self._count("failed")
+            return
+
+        self._finish(job, SUCCEEDED, result=result)
+        with self._stats_lock:
+            self._stats["succeeded"] += 1
+            self._stats["succeeded_attempts"] += job.attempts
+            self._lag[job.kind].append(time.time() - job.created_at)
+
+    def _next_due_in(self, longest: float = 1.0) -> float:
+        with self._db_lock:
+            (run_after,) = self._conn.execute("SELECT MIN(run_after) FROM jobs WHERE status = ?", (QUEUED,)).fetchone()
+        if run_after is None:
+            return longest
+        return min(longest, max(0.01, run_after - time.time()))
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def _work(self) -> None:
+        while not self._stopping.is_set():
+            job = self._claim()
+            if job is None:
+                # Woken by enqueue/stop; otherwise sleep until the next retry is due
+                with self._wakeup:
+                    self._wakeup.wait(timeout=self._next_due_in())
+                continue
+
+            started = time.perf_counter()
+            with self._stats_lock:
+                self._busy += 1
+            try:
+                with traced(job.trace_id):
+                    self._run(job)
+            finally:
+                with self._stats_lock:
+                    self._busy -= 1
+                    self._busy_seconds += time.perf_counter() - started
+
+    def stats(self) -> dict:
+        with self._db_lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        with self._stats_lock:
+            stats = dict(self._stats)
+            busy, busy_seconds = self._busy, self._busy_seconds
+            lags = {kind: sorted(values) for kind, values in self._lag.items()}
+        uptime = time.time() - self._started_at if self._started_at else 0.0
+
+        stats["queue_depth"] = counts.get(QUEUED, 0)
+        stats["running"] = counts.get(RUNNING, 0)
+        stats["workers"] = len(self._threads)
+        stats["busy_workers"] = busy
+        stats["utilization"] = busy_seconds / (self.workers * uptime) if uptime and self.workers else 0.0
+        stats["dead_letters"] = counts.get(FAILED, 0)
+        succeeded = stats.pop("succeeded_attempts", 0)
+        stats["avg_attempts"] = succeeded / stats["succeeded"] if stats.get("succeeded") else 0.0
+        stats["lag_seconds"] = {
+            kind: {"p50": values[len(values) // 2], "p95": values[min(len(values) - 1, int(len(values) * 0.95))]}
+            for kind, values in lags.items() if values
+        }
+        return stats
+
+
+job_queue = JobQueue()
@@ -0,0 +1,41 @@
+import os
+import tempfile
+from datetime import datetime, timedelta
+import pytest
+
+# config.py reads these at import time: no real OpenAI key needed, and the default stores
+# land in a scratch directory instead of the source tree
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="calendar-tests-"))
+
+from calendar_ai_agent_web_app.backend.benchmarks.fake_calendar import FakeCalendarServer, fake_service  # noqa: E402
+from calendar_ai_agent_web_app.backend.logic import calendar_mirror as calendar_mirror_module  # noqa: E402
+from calendar_ai_agent_web_app.backend.logic.calendar_mirror import CalendarMirror  # noqa: E402
+
+
+def make_event(event_id: str, start: datetime, minutes: int = 30, **fields) -> dict:
+    """A timed event resource as Google returns it."""
+    end = start + timedelta(minutes=minutes)
+    return {
+        "id": event_id,
+        "status": "confirmed",
+        "summary": event_id,
+        "updated": "2026-01-01T00:00:00.000Z",
+        "start": {"dateTime": start.isoformat(), "timeZone": "America/Los_Angeles"},
+        "end": {"dateTime": end.isoformat(), "timeZone": "America/Los_Angeles"},
+        **fields,
+    }
+
+
+@pytest.fixture
+def calendar_server():
+    with FakeCalendarServer() as server:
+        yield server
+
+
+@pytest.fixture
+def mirror(tmp_path, calendar_server, monkeypatch):
+    """A mirror in a fresh database that syncs from the fake Calendar server."""
+    service = fake_service(calendar_server.port)
+    monkeypatch.setattr(calendar_mirror_module, "get_calendar_service", lambda: service)
+    return CalendarMirror(str(tmp_path / "mirror.db"), max_staleness=0)
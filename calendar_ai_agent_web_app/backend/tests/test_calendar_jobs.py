@@ -0,0 +1,91 @@
+import json
+from datetime import datetime
+import pytest
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.http import HttpMockSequence
+from calendar_ai_agent_web_app.backend.logic import calendar as calendar_module
+from calendar_ai_agent_web_app.backend.services import calendar_jobs, processor
+from calendar_ai_agent_web_app.backend.services.calendar_jobs import CREATE_EVENT, MODIFY_EVENT
+from calendar_ai_agent_web_app.backend.tasks.job_queue import JobQueue, FAILED, QUEUED, SUCCEEDED
+from calendar_ai_agent_web_app.backend.logic.temporal import DEFAULT_TZ
+from conftest import make_event
+
+START = datetime(2026, 3, 2, 15, 0, tzinfo=DEFAULT_TZ)
+CREATE = {"details": {"name": "Review", "description": "", "location": "", "date": "2026-03-02T15:00:00",
+                      "duration_minutes": 30, "participants": []}, "participants": []}
+MODIFY = {"details": {"name": "Review", "description": "", "location": "", "original_date": START.isoformat(),
+                      "new_date": "2026-03-03T15:00:00-08:00", "duration_minutes": 30, "participants": []},
+          "participants": []}
+
+
+def _google(*responses: tuple[int, dict]):
+    """A Calendar service answering each request with the next (status, body)."""
+    http = HttpMockSequence([({"status": str(status)}, json.dumps(body)) for status, body in responses])
+    return build_from_document(json.loads(get_static_doc("calendar", "v3")), http=http)
+
+
+def _error(status: int, reason: str = "backendError") -> tuple[int, dict]:
+    return status, {"error": {"code": status, "message": reason, "errors": [{"reason": reason}]}}
+
+
+@pytest.fixture
+def queue(tmp_path, mirror, monkeypatch):
+    queue = JobQueue(str(tmp_path / "jobs.db"), workers=0, max_attempts=3, retry_backoff=0)
+    queue.register(CREATE_EVENT, calendar_jobs.run_create_event)
+    queue.register(MODIFY_EVENT, calendar_jobs.run_modify_event)
+    monkeypatch.setattr(calendar_module, "calendar_mirror", mirror)
+    monkeypatch.setattr(processor, "find_conflicts", lambda start, end, emails: [])
+    return queue
+
+
+def _use_google(monkeypatch, *responses) -> None:
+    service = _google(*responses)
+    monkeypatch.setattr(calendar_module, "get_calendar_service", lambda: service)
+
+
+def _run_next(queue: JobQueue) -> dict:
+    job = queue._claim()
+    queue._run(job)
+    return queue.get(job.id)
+
+
+def test_unavailable_insert_is_retried(queue, monkeypatch):
+    job_id = queue.enqueue(CREATE_EVENT, CREATE)
+    _use_google(monkeypatch, _error(503))
+    job = _run_next(queue)
+    assert (job["status"], job["attempts"]) == (QUEUED, 1)
+    assert "503" in job["error"]
+
+    _use_google(monkeypatch, (200, make_event(job_id, START, htmlLink="https://calendar.example/review")))
+    job = _run_next(queue)
+    assert (job["status"], job["attempts"]) == (SUCCEEDED, 2)
+    assert "https://calendar.example/review" in job["result"]["confirmation_message"]
+
+
+@pytest.mark.parametrize("response, status", [
+    (_error(429, "rateLimitExceeded"), QUEUED),
+    (_error(403, "rateLimitExceeded"), QUEUED),
+    (_error(400, "invalid"), FAILED),
+    (_error(403, "forbidden"), FAILED),
+])
+def test_insert_retries_only_transient_errors(queue, monkeypatch, response, status):
+    queue.enqueue(CREATE_EVENT, CREATE)
+    _use_google(monkeypatch, response)
+    job = _run_next(queue)
+    assert (job["status"], job["attempts"]) == (status, 1)
+
+
+def test_unavailable_patch_is_retried(queue, calendar_server, monkeypatch):
+    calendar_server.put(make_event("review", START))
+    queue.enqueue(MODIFY_EVENT, MODIFY)
+    _use_google(monkeypatch, _error(503))
+    job = _run_next(queue)
+    assert (job["status"], job["attempts"]) == (QUEUED, 1)
+
+
+def test_no_matching_event_is_final(queue, monkeypatch):
+    queue.enqueue(MODIFY_EVENT, MODIFY)
+    _use_google(monkeypatch)
+    job = _run_next(queue)
+    assert job["status"] == SUCCEEDED
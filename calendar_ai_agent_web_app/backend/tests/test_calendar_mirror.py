@@ -0,0 +1,124 @@
+from datetime import datetime, timedelta
+from calendar_ai_agent_web_app.backend.logic.temporal import DEFAULT_TZ
+from conftest import make_event
+
+MONDAY = datetime(2026, 3, 2, 9, 0, tzinfo=DEFAULT_TZ)
+WEEK = (MONDAY - timedelta(hours=9), MONDAY + timedelta(days=7))
+
+
+def _ids(events: list[dict]) -> list[str]:
+    return [event["id"] for event in events]
+
+
+def _standup(**fields) -> dict:
+    return make_event("standup", MONDAY, 15, recurrence=["RRULE:FREQ=DAILY;COUNT=5"], **fields)
+
+
+def test_full_sync_then_incremental(mirror, calendar_server):
+    calendar_server.put(make_event("review", MONDAY + timedelta(hours=2)))
+    calendar_server.put(make_event("lunch", MONDAY + timedelta(hours=3)))
+    assert mirror.sync() == 2
+    assert _ids(mirror.query(*WEEK)) == ["review", "lunch"]
+
+    calendar_server.put(make_event("review", MONDAY + timedelta(days=1), summary="Moved review"))
+    calendar_server.cancel("lunch")
+    calendar_server.put(make_event("retro", MONDAY + timedelta(days=2)))
+    assert mirror.sync() == 3
+
+    events = mirror.query(*WEEK)
+    assert _ids(events) == ["review", "retro"]
+    assert events[0]["summary"] == "Moved review"
+    stats = mirror.stats()
+    assert (stats["full_syncs"], stats["incremental_syncs"], stats["events"]) == (1, 1, 2)
+
+
+def test_unchanged_sync_keeps_version(mirror, calendar_server):
+    calendar_server.put(make_event("review", MONDAY))
+    mirror.sync()
+    version = mirror.version
+    mirror.upsert(calendar_server.events["review"])
+    assert mirror.version == version
+
+
+def test_recurring_series_expands_over_query_window(mirror, calendar_server):
+    calendar_server.put(_standup())
+    mirror.sync()
+    assert mirror.stats()["series"] == 1
+
+    tuesday_to_thursday = mirror.query(MONDAY + timedelta(days=1), MONDAY + timedelta(days=3, hours=12))
+    assert _ids(tuesday_to_thursday) == ["standup_20260303T170000Z", "standup_20260304T170000Z",
+                                         "standup_20260305T170000Z"]
+    assert {event["recurringEventId"] for event in tuesday_to_thursday} == {"standup"}
+    assert tuesday_to_thursday[0]["start"]["dateTime"] == "2026-03-03T09:00:00-08:00"
+    # COUNT=5 ends the series on Friday
+    assert len(mirror.query(*WEEK)) == 5
+
+
+def test_windows_on_the_same_days_share_one_expansion(mirror, calendar_server):
+    calendar_server.put(_standup())
+    mirror.sync()
+
+    assert len(mirror.query(*WEEK)) == 5
+    # Minutes later, over the same days: served from the cache, still cut to the window
+    later = mirror.query(MONDAY + timedelta(minutes=20), MONDAY + timedelta(days=7, minutes=20))
+    assert _ids(later) == ["standup_20260303T170000Z", "standup_20260304T170000Z", "standup_20260305T170000Z",
+                           "standup_20260306T170000Z"]
+    # Windows that only clip an occurrence still include it
+    assert _ids(mirror.query(MONDAY + timedelta(minutes=14), MONDAY + timedelta(hours=1))) == [
+        "standup_20260302T170000Z"]
+    assert mirror.query(MONDAY + timedelta(minutes=15), MONDAY + timedelta(hours=1)) == []
+    assert mirror.stats()["expansion_cache_hits"] == 2
+
+
+def test_cancelled_and_moved_occurrences(mirror, calendar_server):
+    calendar_server.put(_standup())
+    mirror.sync()
+
+    calendar_server.put({"id": "standup_20260303T170000Z", "status": "cancelled", "recurringEventId": "standup"})
+    moved = make_event("standup_20260304T170000Z", MONDAY + timedelta(days=2, hours=3), 15,
+                       recurringEventId="standup",
+                       originalStartTime={"dateTime": "2026-03-04T09:00:00-08:00"})
+    calendar_server.put(moved)
+    mirror.sync()
+
+    events = mirror.query(*WEEK)
+    assert "standup_20260303T170000Z" not in _ids(events)
+    assert _ids(events).count("standup_20260304T170000Z") == 1
+    assert events[_ids(events).index("standup_20260304T170000Z")]["start"] == moved["start"]
+    assert len(events) == 4
+
+    # Cancelling the master drops the whole series, moved occurrence included
+    calendar_server.cancel("standup")
+    mirror.sync()
+    assert mirror.query(*WEEK) == []
+
+
+def test_expired_sync_token_runs_full_resync(mirror, calendar_server):
+    calendar_server.put(make_event("review", MONDAY))
+    mirror.sync()
+
+    calendar_server.cancel("review")
+    calendar_server.put(make_event("retro", MONDAY + timedelta(days=1)))
+    calendar_server.expire_sync_tokens()
+    mirror.sync()
+
+    assert _ids(mirror.query(*WEEK)) == ["retro"]
+    stats = mirror.stats()
+    assert stats["resyncs_after_410"] == 1
+    assert stats["full_syncs"] == 2
+
+
+def test_changes_since_reports_one_off_writes(mirror):
+    version = mirror.version
+    event = make_event("review", MONDAY)
+    mirror.upsert(event)
+    assert mirror.changes_since(version) == {"review": event}
+
+    version = mirror.version
+    mirror.upsert({"id": "review", "status": "cancelled"})
+    assert mirror.changes_since(version) == {"review": None}
+
+    # A series change can't be replayed event by event
+    version = mirror.version
+    mirror.upsert(_standup())
+    assert mirror.changes_since(version) is None
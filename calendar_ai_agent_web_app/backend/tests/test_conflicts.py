@@ -0,0 +1,88 @@
+from datetime import timedelta
+import pytest
+from calendar_ai_agent_web_app.backend.logic.conflicts import CalendarConflictIndex, IntervalTree
+from calendar_ai_agent_web_app.backend.logic.recurrence import day_after
+from conftest import make_event
+
+TOMORROW_NINE = day_after(1) + timedelta(hours=9)
+
+
+@pytest.fixture
+def index(mirror, monkeypatch):
+    """A week-long index over the mirror; `index.builds` counts full reads of the window."""
+    index = CalendarConflictIndex(mirror, days=7)
+    index.builds = 0
+    query = mirror.query
+
+    def counting_query(time_min, time_max):
+        if (time_min, time_max) == (day_after(-1), day_after(7)):
+            index.builds += 1
+        return query(time_min, time_max)
+
+    monkeypatch.setattr(mirror, "query", counting_query)
+    return index
+
+
+def _titles(index: CalendarConflictIndex, start, minutes: int = 60) -> list[str]:
+    return [conflict.title for conflict in index.conflicts(start, start + timedelta(minutes=minutes))]
+
+
+def test_interval_tree_matches_linear_scan():
+    intervals = [(float(start), float(start + length), (start, length))
+                 for start in range(0, 200, 7) for length in (1, 5, 30)]
+    tree = IntervalTree(intervals)
+    assert len(tree) == len(intervals)
+    for start, end in [(0, 1), (10, 12), (50, 100), (199, 250), (300, 400)]:
+        expected = {payload for a, b, payload in intervals if a < end and b > start}
+        assert set(tree.overlaps(start, end)) == expected
+
+
+def test_only_blocking_events_conflict(mirror, index):
+    mirror.upsert_many([
+        make_event("review", TOMORROW_NINE),
+        make_event("focus", TOMORROW_NINE, transparency="transparent"),
+        {"id": "offsite", "summary": "offsite", "start": {"date": day_after(1).date().isoformat()},
+         "end": {"date": day_after(2).date().isoformat()}},
+    ])
+    assert _titles(index, TOMORROW_NINE) == ["review"]
+    # Half-open: a meeting ending at 9:00 doesn't conflict with one starting then
+    assert _titles(index, TOMORROW_NINE - timedelta(hours=1)) == []
+
+
+def test_writes_go_to_overlay_without_rebuild(mirror, index):
+    mirror.upsert(make_event("review", TOMORROW_NINE))
+    assert _titles(index, TOMORROW_NINE) == ["review"]
+    assert index.builds == 1
+
+    mirror.upsert(make_event("sync", TOMORROW_NINE + timedelta(minutes=30)))
+    assert _titles(index, TOMORROW_NINE) == ["review", "sync"]
+
+    # Moved out of the slot, then deleted: the tree's copy is shadowed both times
+    mirror.upsert(make_event("review", TOMORROW_NINE + timedelta(hours=3)))
+    assert _titles(index, TOMORROW_NINE) == ["sync"]
+    assert _titles(index, TOMORROW_NINE + timedelta(hours=3)) == ["review"]
+    mirror.upsert({"id": "review", "status": "cancelled"})
+    assert _titles(index, TOMORROW_NINE + timedelta(hours=3)) == []
+    assert index.builds == 1
+
+
+def test_series_change_and_full_overlay_rebuild(mirror, index):
+    assert _titles(index, TOMORROW_NINE) == []
+    mirror.upsert(make_event("standup", TOMORROW_NINE, 15, recurrence=["RRULE:FREQ=DAILY"]))
+    assert _titles(index, TOMORROW_NINE + timedelta(days=2)) == ["standup"]
+    assert index.builds == 2
+
+    index.max_overlay = 2
+    for i in range(3):
+        mirror.upsert(make_event(f"call{i}", TOMORROW_NINE + timedelta(hours=4 + i)))
+        _titles(index, TOMORROW_NINE)
+    assert index.builds == 3
+    assert _titles(index, TOMORROW_NINE + timedelta(hours=4), 180) == ["call0", "call1", "call2"]
+
+
+def test_checks_outside_the_window_read_the_mirror(mirror, index):
+    later = TOMORROW_NINE + timedelta(days=30)
+    mirror.upsert(make_event("quarterly", later))
+    assert _titles(index, TOMORROW_NINE) == []
+    assert _titles(index, later) == ["quarterly"]
+    assert _titles(index, TOMORROW_NINE + timedelta(days=6), 60 * 24 * 2) == []
@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta
+import pytest
+from calendar_ai_agent_web_app.backend.logic.event_filter import filter_events
+from calendar_ai_agent_web_app.backend.logic.temporal import DEFAULT_TZ
+from calendar_ai_agent_web_app.backend.schemas.models import ListCalendarEventsFilters
+from conftest import make_event
+
+MONDAY = datetime(2026, 3, 2, tzinfo=DEFAULT_TZ)
+
+EVENTS = [
+    make_event("planning", MONDAY + timedelta(days=1, hours=14), summary="Sprint planning",
+               attendees=[{"email": "ethanchiu@example.com", "displayName": "Ethan Chiu"}]),
+    make_event("standup", MONDAY + timedelta(hours=9), summary="Daily standup",
+               attendees=[{"email": "maria@example.com"}]),
+    make_event("dinner", MONDAY + timedelta(days=2, hours=19), summary="Team dinner", location="Zuni Cafe",
+               organizer={"email": "Maria@example.com"}),
+    {"id": "offsite", "summary": "Offsite", "start": {"date": "2026-03-03"}, "end": {"date": "2026-03-04"}},
+    {"id": "broken", "summary": "No start"},
+]
+
+
+def _titles(**filters) -> list[str]:
+    listed = filter_events(EVENTS, ListCalendarEventsFilters(description="test", **filters))
+    return [event.title for event in listed.matched_events]
+
+
+def test_no_filters_lists_everything_in_start_order():
+    assert _titles() == ["Daily standup", "Offsite", "Sprint planning", "Team dinner"]
+
+
+def test_time_range_is_half_open_and_naive_bounds_are_local():
+    tuesday = datetime(2026, 3, 3)
+    assert _titles(start_time=tuesday, end_time=tuesday + timedelta(days=1)) == ["Offsite", "Sprint planning"]
+    assert _titles(end_time=MONDAY + timedelta(hours=9)) == []
+
+
+@pytest.mark.parametrize("time_of_day, expected", [
+    ("morning", ["Daily standup"]),
+    ("Afternoon", ["Sprint planning"]),
+    ("evening", ["Team dinner"]),
+])
+def test_time_of_day_skips_all_day_events(time_of_day, expected):
+    assert _titles(time_of_day=time_of_day) == expected
+
+
+@pytest.mark.parametrize("participant, expected", [
+    ("ethan", ["Sprint planning"]),
+    ("Ethan Chiu", ["Sprint planning"]),
+    ("maria@example.com", ["Daily standup", "Team dinner"]),
+    ("maria@elsewhere.com", []),
+])
+def test_participants_match_names_and_emails(participant, expected):
+    assert _titles(participants=[participant]) == expected
+
+
+def test_keywords_match_prefixes_and_ignore_generic_words():
+    assert _titles(keywords=["plans", "standups"]) == ["Daily standup"]
+    assert _titles(keywords=["zuni"]) == ["Team dinner"]
+    assert _titles(keywords=["meetings"]) == _titles()
+    assert _titles(keywords=["dinner"], participants=["ethan"]) == []
@@ -0,0 +1,126 @@
+import pytest
+from calendar_ai_agent_web_app.backend.logic.event_import import iter_csv, iter_ics
+from calendar_ai_agent_web_app.backend.tasks.calendar_import import _body
+
+
+def _ics(*events: str) -> list[str]:
+    body = "".join(f"BEGIN:VEVENT\r\n{event.strip()}\r\nEND:VEVENT\r\n" for event in events)
+    return f"BEGIN:VCALENDAR\r\nVERSION:2.0\r\n{body}END:VCALENDAR\r\n".splitlines(keepends=True)
+
+
+def _csv(*rows: str) -> list[str]:
+    return [f"{row}\n" for row in rows]
+
+
+def test_ics_unfolds_lines_and_unescapes_text():
+    [record] = iter_ics(_ics(
+        "UID:review-1\r\nSUMMARY:Quarterly review\\, part\r\n  two\r\nDESCRIPTION:Agenda:\\nbudget\r\n"
+        "DTSTART;TZID=America/Los_Angeles:20260302T150000\r\nDURATION:PT45M\r\n"
+        "ATTENDEE;CN=\"Lee, Ana\":mailto:ana@example.com"
+    ))
+    assert record.error is None
+    assert record.details.name == "Quarterly review, part two"
+    assert record.details.description == "Agenda:\nbudget"
+    assert record.details.participants == ["ana@example.com"]
+    assert record.line == 3
+
+
+@pytest.mark.parametrize("start, end, expected", [
+    ("DTSTART;TZID=America/New_York:20260302T150000", "DTEND;TZID=America/New_York:20260302T160000",
+     ("2026-03-02T12:00:00", 60)),
+    ("DTSTART:20260302T230000Z", "DURATION:PT1H30M", ("2026-03-02T15:00:00", 90)),
+    ("DTSTART:20260302T090000", "DURATION:P1DT2H", ("2026-03-02T09:00:00", 26 * 60)),
+    ("DTSTART;TZID=Pacific Standard Time:20260302T090000", "", ("2026-03-02T09:00:00", 0)),
+])
+def test_ics_times_land_in_the_calendar_zone(start, end, expected):
+    [record] = iter_ics(_ics(f"UID:x\r\nSUMMARY:Call\r\n{start}\r\n{end}"))
+    assert (record.details.date, record.details.duration_minutes) == expected
+    assert not record.all_day
+
+
+def test_ics_all_day_events():
+    one_day, two_days = iter_ics(_ics(
+        "UID:a\r\nSUMMARY:Holiday\r\nDTSTART;VALUE=DATE:20260302",
+        "UID:b\r\nSUMMARY:Offsite\r\nDTSTART;VALUE=DATE:20260302\r\nDTEND;VALUE=DATE:20260304",
+    ))
+    assert (one_day.all_day, one_day.details.date, one_day.details.duration_minutes) == (
+        True, "2026-03-02T00:00:00", 24 * 60)
+    assert (two_days.all_day, two_days.details.duration_minutes) == (True, 2 * 24 * 60)
+
+
+def test_ics_skips_alarms_and_keeps_recurrence():
+    [record] = iter_ics(_ics(
+        "UID:standup\r\nSUMMARY:Standup\r\nDTSTART:20260302T170000Z\r\nDTEND:20260302T171500Z\r\n"
+        "RRULE:FREQ=WEEKLY;BYDAY=MO,WE\r\nEXDATE:20260304T170000Z\r\n"
+        "BEGIN:VALARM\r\nSUMMARY:Reminder\r\nDURATION:PT5M\r\nEND:VALARM"
+    ))
+    assert record.details.name == "Standup"
+    assert record.details.duration_minutes == 15
+    assert record.recurrence == ["RRULE:FREQ=WEEKLY;BYDAY=MO,WE", "EXDATE:20260304T170000Z"]
+
+
+def test_ics_unmappable_events_carry_an_error():
+    records = list(iter_ics(_ics(
+        "UID:a\r\nSUMMARY:No start",
+        "UID:b\r\nRECURRENCE-ID:20260302T170000Z\r\nDTSTART:20260302T180000Z",
+        "UID:c\r\nSTATUS:CANCELLED\r\nDTSTART:20260302T180000Z",
+        "UID:d\r\nDTSTART:20260302T180000Z\r\nDURATION:one hour",
+    )))
+    assert [record.number for record in records] == [0, 1, 2, 3]
+    assert all(record.details is None for record in records)
+    assert [record.error for record in records] == [
+        "missing DTSTART", "recurrence override (RECURRENCE-ID) skipped", "cancelled event skipped",
+        "bad DURATION 'one hour'",
+    ]
+    # Overrides of one series are told apart by their RECURRENCE-ID
+    assert len({record.key for record in iter_ics(_ics("UID:a\r\nDTSTART:20260302T180000Z",
+                                                       "UID:a\r\nRECURRENCE-ID:20260309T180000Z"))}) == 2
+
+
+def test_csv_maps_export_headers():
+    records = list(iter_csv(_csv(
+        "Subject,Start Date,Start Time,End Date,End Time,All Day Event,Description,Location,Attendees",
+        "Review,03/02/2026,3:00 PM,03/02/2026,4:30 PM,False,Budget,Room 4,ana@example.com; raj@example.com",
+        ",,,,,,,,",
+        "Offsite,03/03/2026,,03/04/2026,,True,,,",
+    )))
+    review, offsite = records
+    assert (review.details.name, review.details.date, review.details.duration_minutes) == (
+        "Review", "2026-03-02T15:00:00", 90)
+    assert (review.details.location, review.details.description) == ("Room 4", "Budget")
+    assert review.details.participants == ["ana@example.com", "raj@example.com"]
+    # Blank rows are skipped but still count towards line numbers
+    assert [(record.number, record.line) for record in records] == [(0, 2), (1, 4)]
+    # All-day exports give the last day itself as the end date
+    assert (offsite.all_day, offsite.details.date, offsite.details.duration_minutes) == (
+        True, "2026-03-03T00:00:00", 2 * 24 * 60)
+
+
+def test_csv_plain_layout_and_defaults():
+    timed, default, bad = iter_csv(_csv(
+        "name,date,duration_minutes,uid",
+        "Call,2026-03-02T18:00:00Z,20,call-1",
+        "Lunch,2026-03-02 12:00,,",
+        "Broken,next tuesday,,",
+    ))
+    assert (timed.details.date, timed.details.duration_minutes) == ("2026-03-02T10:00:00", 20)
+    assert (default.details.date, default.details.duration_minutes) == ("2026-03-02T12:00:00", 60)
+    assert bad.details is None and "next tuesday" in bad.error
+
+
+def test_csv_header_needs_title_and_start():
+    with pytest.raises(ValueError, match="title and a start"):
+        list(iter_csv(_csv("Subject,Location", "Review,Room 4")))
+    assert list(iter_csv([])) == []
+
+
+def test_body_sends_all_day_events_as_dates():
+    offsite, call = iter_csv(_csv(
+        "Subject,Start Date,Start Time,End Date,All Day Event",
+        "Offsite,03/03/2026,,03/04/2026,True",
+        "Call,03/03/2026,9:00 AM,,False",
+    ))
+    body = _body(offsite)
+    assert (body["start"], body["end"]) == ({"date": "2026-03-03"}, {"date": "2026-03-05"})
+    body = _body(call)
+    assert "dateTime" in body["start"] and "date" not in body["start"]
@@ -0,0 +1,164 @@
+import asyncio
+import pytest
+from calendar_ai_agent_web_app.backend.tasks import job_queue as job_queue_module
+from calendar_ai_agent_web_app.backend.tasks.job_queue import (
+    FAILED, QUEUED, RUNNING, SUCCEEDED, JobQueue, PermanentJobError
+)
+
+
+class Handler:
+    """Fails the first `failures` calls with `error`, then returns the payload."""
+
+    def __init__(self, failures: int = 0, error: Exception = RuntimeError("Calendar unavailable")):
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    def __call__(self, job):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        return {"echo": job.payload, "state": job.state}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = [1_000_000.0]
+    monkeypatch.setattr(job_queue_module.time, "time", lambda: clock[0])
+    return clock
+
+
+def _queue(tmp_path, handler=None, **kwargs) -> JobQueue:
+    kwargs.setdefault("max_attempts", 3)
+    kwargs.setdefault("retry_backoff", 10)
+    queue = JobQueue(str(tmp_path / "jobs.db"), workers=0, **kwargs)
+    queue.register("echo", handler or Handler())
+    return queue
+
+
+def _run_next(queue: JobQueue):
+    job = queue._claim()
+    if job is None:
+        return None
+    queue._run(job)
+    return queue.get(job.id)
+
+
+def test_successful_job_stores_its_result(tmp_path, clock):
+    queue = _queue(tmp_path)
+    job_id = queue.enqueue("echo", {"n": 1})
+    assert queue.get(job_id)["status"] == QUEUED
+    job = _run_next(queue)
+    assert (job["id"], job["status"], job["attempts"]) == (job_id, SUCCEEDED, 1)
+    assert job["result"] == {"echo": {"n": 1}, "state": {}}
+    assert _run_next(queue) is None
+
+
+def test_unknown_kind_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="No handler"):
+        _queue(tmp_path).enqueue("missing", {})
+
+
+def test_failures_back_off_exponentially(tmp_path, clock):
+    handler = Handler(failures=2)
+    queue = _queue(tmp_path, handler)
+    job_id = queue.enqueue("echo", {})
+
+    job = _run_next(queue)
+    assert (job["status"], job["attempts"], job["error"]) == (QUEUED, 1, "Calendar unavailable")
+    # Not due until retry_backoff * 2**0 seconds have passed
+    clock[0] += 9.9
+    assert queue._claim() is None
+    clock[0] += 0.1
+    assert _run_next(queue)["attempts"] == 2
+
+    clock[0] += 19.9
+    assert queue._claim() is None
+    clock[0] += 0.1
+    job = _run_next(queue)
+    assert (job["id"], job["status"], job["attempts"]) == (job_id, SUCCEEDED, 3)
+    assert queue.stats()["retries"] == 2
+
+
+def test_jobs_dead_letter_after_max_attempts_and_can_be_requeued(tmp_path, clock):
+    handler = Handler(failures=3)
+    queue = _queue(tmp_path, handler, retry_backoff=0)
+    job_id = queue.enqueue("echo", {})
+    for _ in range(3):
+        job = _run_next(queue)
+    assert (job["status"], job["attempts"]) == (FAILED, 3)
+    assert [dead["id"] for dead in queue.dead_letters()] == [job_id]
+    assert queue.stats()["dead_letters"] == 1
+
+    assert queue.requeue(job_id)
+    assert not queue.requeue(job_id)
+    job = _run_next(queue)
+    assert (job["status"], job["attempts"]) == (SUCCEEDED, 1)
+    assert queue.dead_letters() == []
+
+
+def test_permanent_errors_skip_retries(tmp_path, clock):
+    handler = Handler(failures=1, error=PermanentJobError("event was deleted"))
+    queue = _queue(tmp_path, handler)
+    job_id = queue.enqueue("echo", {})
+    job = _run_next(queue)
+    assert (job["status"], job["attempts"], job["error"]) == (FAILED, 1, "event was deleted")
+    assert handler.calls == 1
+    assert queue.dead_letters("echo")[0]["id"] == job_id
+    assert queue.dead_letters("other") == []
+
+
+def test_enqueue_once_dedupes_on_key(tmp_path, clock):
+    queue = _queue(tmp_path)
+    first, created = queue.enqueue_once("echo", {"n": 1}, dedupe_key="request-1")
+    assert created
+    assert queue.enqueue_once("echo", {"n": 2}, dedupe_key="request-1") == (first, False)
+    # Still deduplicated once the first job has finished
+    _run_next(queue)
+    assert queue.enqueue_once("echo", {"n": 3}, dedupe_key="request-1") == (first, False)
+    assert queue.enqueue_once("echo", {"n": 4}, dedupe_key="request-2")[1]
+    assert queue.enqueue("echo", {}) != queue.enqueue("echo", {})
+    assert queue.stats()["deduplicated"] == 2
+
+
+def test_restart_requeues_interrupted_jobs_with_their_checkpoints(tmp_path, clock):
+    queue = _queue(tmp_path)
+    job_id = queue.enqueue("echo", {"n": 1})
+    job = queue._claim()
+    job.checkpoint(event_id="abc")
+    # The process dies here, mid-handler
+    assert queue.get(job_id)["status"] == RUNNING
+
+    restarted = _queue(tmp_path)
+    restarted.start()
+    assert restarted.get(job_id)["status"] == QUEUED
+    job = _run_next(restarted)
+    assert (job["status"], job["attempts"]) == (SUCCEEDED, 2)
+    assert job["result"]["state"] == {"event_id": "abc"}
+
+
+def test_restart_drops_old_succeeded_jobs(tmp_path, clock):
+    queue = _queue(tmp_path)
+    old = queue.enqueue("echo", {})
+    _run_next(queue)
+    clock[0] += job_queue_module.RETENTION_SECONDS + 1
+    recent = queue.enqueue("echo", {})
+    _run_next(queue)
+
+    restarted = _queue(tmp_path)
+    restarted.start()
+    assert restarted.get(old) is None
+    assert restarted.get(recent)["status"] == SUCCEEDED
+
+
+def test_workers_run_jobs_in_the_background(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"), workers=2, max_attempts=2, retry_backoff=0)
+    queue.register("echo", Handler())
+    queue.start()
+    try:
+        job_ids = [queue.enqueue("echo", {"n": n}) for n in range(5)]
+        jobs = [asyncio.run(queue.wait_async(job_id, timeout=5, poll_interval=0.01)) for job_id in job_ids]
+    finally:
+        queue.stop()
+    assert [job["status"] for job in jobs] == [SUCCEEDED] * 5
+    assert [job["result"]["echo"]["n"] for job in jobs] == list(range(5))
@@ -0,0 +1,126 @@
+import sqlite3
+import pytest
+from pydantic import BaseModel
+from calendar_ai_agent_web_app.backend.logic import llm_cache as llm_cache_module
+from calendar_ai_agent_web_app.backend.logic.llm_cache import LLMResponseCache
+
+MODEL = "gpt-test"
+
+
+class Reply(BaseModel):
+    text: str
+
+
+class Renamed(BaseModel):
+    body: str
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+        self.day = "2026-03-02|2026-03-02"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(llm_cache_module.time, "time", lambda: clock.now)
+    monkeypatch.setattr(llm_cache_module, "_day_context", lambda: clock.day)
+    return clock
+
+
+def _cache(tmp_path=None, **kwargs) -> LLMResponseCache:
+    kwargs.setdefault("ttl", 60)
+    path = str(tmp_path / "llm_cache.db") if tmp_path else None
+    return LLMResponseCache(path=path, enabled=True, **kwargs)
+
+
+def _rows(tmp_path) -> int:
+    with sqlite3.connect(tmp_path / "llm_cache.db") as conn:
+        return conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+
+def test_lookup_ignores_case_whitespace_and_punctuation(clock):
+    cache = _cache()
+    cache.put("classify", MODEL, "Lunch with Ana  tomorrow?", Reply(text="create"))
+    assert cache.get("classify", MODEL, "lunch with ana tomorrow", Reply) == Reply(text="create")
+    assert cache.get("classify", "other-model", "lunch with ana tomorrow", Reply) is None
+    assert cache.get("extract", MODEL, "lunch with ana tomorrow", Reply) is None
+
+
+def test_entries_expire_after_ttl(clock, tmp_path):
+    cache = _cache(tmp_path)
+    cache.put("classify", MODEL, "hello", Reply(text="a"))
+    clock.now += 59
+    assert cache.get("classify", MODEL, "hello", Reply) == Reply(text="a")
+    clock.now += 1
+    assert cache.get("classify", MODEL, "hello", Reply) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_memory_tier_evicts_least_recently_used(clock):
+    cache = _cache(max_entries=2)
+    cache.put("classify", MODEL, "a", Reply(text="a"))
+    cache.put("classify", MODEL, "b", Reply(text="b"))
+    cache.get("classify", MODEL, "a", Reply)
+    cache.put("classify", MODEL, "c", Reply(text="c"))
+    assert cache.get("classify", MODEL, "b", Reply) is None
+    assert cache.get("classify", MODEL, "a", Reply) == Reply(text="a")
+    assert cache.get("classify", MODEL, "c", Reply) == Reply(text="c")
+    assert cache.stats()["evictions"] == 1
+
+
+def test_day_rollover_clears_both_tiers(clock, tmp_path):
+    cache = _cache(tmp_path)
+    cache.put("classify", MODEL, "standup tomorrow", Reply(text="create"))
+    clock.day = "2026-03-03|2026-03-03"
+    assert cache.get("classify", MODEL, "standup tomorrow", Reply) is None
+    assert cache.stats()["day_rollovers"] == 1
+    assert _rows(tmp_path) == 0
+
+
+def test_disk_tier_survives_restart_for_the_same_day(clock, tmp_path):
+    _cache(tmp_path).put("classify", MODEL, "hello", Reply(text="a"))
+    cache = _cache(tmp_path)
+    assert cache.get("classify", MODEL, "hello", Reply) == Reply(text="a")
+    assert cache.stats()["stages"]["classify"]["disk_hits"] == 1
+
+    clock.day = "2026-03-03|2026-03-03"
+    assert _cache(tmp_path).get("classify", MODEL, "hello", Reply) is None
+    assert _rows(tmp_path) == 0
+
+
+def test_disk_tier_keeps_at_most_max_disk_entries(clock, tmp_path):
+    cache = _cache(tmp_path, max_disk_entries=3)
+    for index in range(5):
+        clock.now += 1
+        cache.put("classify", MODEL, f"request {index}", Reply(text=str(index)))
+    assert _rows(tmp_path) == 3
+    assert cache.stats()["disk_evictions"] == 2
+
+    # The soonest-expiring rows went first; a fresh process only sees the newest three
+    reopened = _cache(tmp_path, max_disk_entries=3)
+    assert [reopened.get("classify", MODEL, f"request {index}", Reply) is not None
+            for index in range(5)] == [False, False, True, True, True]
+
+    # Reopening also sheds expired rows
+    clock.now += 60
+    assert _cache(tmp_path, max_disk_entries=3).stats()["disk_entries"] == 0
+    assert _rows(tmp_path) == 0
+
+
+def test_stale_entry_is_dropped_on_validation_error(clock, tmp_path):
+    cache = _cache(tmp_path)
+    cache.put("classify", MODEL, "hello", Reply(text="a"))
+    assert cache.get("classify", MODEL, "hello", Renamed) is None
+    assert cache.stats()["stale_dropped"] == 1
+    assert cache.stats()["entries"] == 0
+    assert _rows(tmp_path) == 0
+    assert cache.get("classify", MODEL, "hello", Reply) is None
+
+
+def test_disabled_cache_stores_nothing(clock):
+    cache = LLMResponseCache(path=None, enabled=False)
+    cache.put("classify", MODEL, "hello", Reply(text="a"))
+    assert cache.get("classify", MODEL, "hello", Reply) is None
+    assert cache.stats()["entries"] == 0
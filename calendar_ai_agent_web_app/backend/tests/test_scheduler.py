@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+import numpy as np
+from calendar_ai_agent_web_app.backend.logic.scheduler import OWNER, busy_bitmap, rank_slots, solve
+from calendar_ai_agent_web_app.backend.logic.temporal import DEFAULT_TZ
+
+MONDAY = datetime(2026, 3, 2, tzinfo=DEFAULT_TZ)
+WORKDAY = (9, 17)
+
+
+def _busy(*hours: tuple[float, float], day: datetime = MONDAY) -> list[tuple[float, float]]:
+    return [((day + timedelta(hours=a)).timestamp(), (day + timedelta(hours=b)).timestamp()) for a, b in hours]
+
+
+def _starts(slots) -> list[str]:
+    return [f"{slot.start_time:%a %H:%M}" for slot in slots]
+
+
+def test_busy_bitmap_marks_partly_busy_slots():
+    bitmap = busy_bitmap([[(10.0, 20.0)], []], origin=0.0, n_slots=4, resolution=1)
+    assert bitmap.tolist() == [[True, False, False, False], [False, False, False, False]]
+    bitmap = busy_bitmap([[(30.0, 150.0)]], origin=0.0, n_slots=4, resolution=1)
+    assert bitmap.tolist() == [[True, True, True, False]]
+
+
+def test_rank_slots_prefers_more_attendees_then_earlier():
+    busy = np.array([
+        [1, 1, 0, 0, 0, 0],
+        [0, 0, 0, 0, 1, 1],
+        [1, 0, 0, 1, 0, 0],
+    ], dtype=bool)
+    allowed = np.ones(6, dtype=bool)
+    ranked = rank_slots(busy, allowed, duration_slots=1, limit=6)
+    assert [start for start, _ in ranked] == [2, 1, 3, 4, 5, 0]
+    assert ranked[0][1].tolist() == [True, True, True]
+
+    # Two-slot meetings never overlap each other
+    starts = [start for start, _ in rank_slots(busy, allowed, duration_slots=2)]
+    assert all(abs(a - b) >= 2 for a in starts for b in starts if a != b)
+
+
+def test_rank_slots_required_participant_must_be_free():
+    busy = np.array([
+        [0, 1, 1],
+        [1, 0, 0],
+        [1, 0, 0],
+    ], dtype=bool)
+    allowed = np.ones(3, dtype=bool)
+    assert [start for start, _ in rank_slots(busy, allowed, 1)] == [1, 2, 0]
+    assert [start for start, _ in rank_slots(busy, allowed, 1, required=(0,))] == [0]
+
+
+def test_solve_finds_common_free_time_in_working_hours():
+    busy = {
+        OWNER: _busy((9, 10), (13, 17)),
+        "ana@example.com": _busy((10, 11)),
+        "raj@example.com": _busy((11, 12)),
+    }
+    slots = solve(busy, MONDAY, MONDAY + timedelta(days=1), 60, WORKDAY)
+    # Everyone at noon first, then the best of the rest; at most two suggestions a day
+    assert _starts(slots) == ["Mon 12:00", "Mon 10:00"]
+    assert slots[0].available == [OWNER, "ana@example.com", "raj@example.com"]
+    assert slots[1].unavailable == ["ana@example.com"]
+
+
+def test_solve_never_offers_time_the_owner_is_busy():
+    busy = {
+        OWNER: _busy((9, 16)),
+        "ana@example.com": _busy((16, 17)),
+        "raj@example.com": _busy((16, 17)),
+    }
+    slots = solve(busy, MONDAY, MONDAY + timedelta(days=1), 30, WORKDAY)
+    assert _starts(slots) == ["Mon 16:00", "Mon 16:30"]
+    assert slots[0].available == [OWNER]
+    assert slots[0].unavailable == ["ana@example.com", "raj@example.com"]
+
+    # Nobody is required when the owner isn't part of the request
+    others = {name: blocks for name, blocks in busy.items() if name != OWNER}
+    assert _starts(solve(others, MONDAY, MONDAY + timedelta(days=1), 30, WORKDAY))[0] == "Mon 09:00"
+
+
+def test_solve_skips_weekends():
+    saturday = MONDAY - timedelta(days=2)
+    slots = solve({OWNER: []}, saturday, MONDAY + timedelta(days=1), 60, WORKDAY)
+    assert {slot.start_time.date() for slot in slots} == {MONDAY.date()}
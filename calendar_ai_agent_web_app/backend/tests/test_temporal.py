@@ -0,0 +1,39 @@
+import json
+import os
+from datetime import datetime
+import pytest
+from calendar_ai_agent_web_app.backend.logic.temporal import (
+    DEFAULT_TZ, resolve, resolve_event_fields, resolve_modify_fields
+)
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "temporal_corpus.jsonl")
+NOW = datetime(2025, 7, 25, 10, 0, tzinfo=DEFAULT_TZ)
+
+
+def _corpus() -> list[dict]:
+    with open(CORPUS_PATH) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+@pytest.mark.parametrize("case", _corpus(), ids=lambda case: case["text"])
+def test_corpus(case):
+    """Each case resolves against its own fixed `now`; an empty `expected` means leave it to the LLM."""
+    now = datetime.fromisoformat(case["now"]).astimezone(DEFAULT_TZ)
+    resolver = resolve_modify_fields if case["kind"] == "modify" else resolve_event_fields
+    assert resolver(case["text"], now) == case["expected"]
+
+
+def test_corpus_has_negative_cases():
+    assert sum(1 for case in _corpus() if not case["expected"]) >= 5
+
+
+@pytest.mark.parametrize("text", ["an hour later", "in 30 minutes", "15 minutes before", "two hours from now"])
+def test_offsets_are_not_durations(text):
+    resolution = resolve(f"Standup tomorrow at 9am, {text}", NOW)
+    assert resolution.duration_minutes is None
+    assert resolution.spans == []
+
+
+def test_noon_is_not_read_inside_afternoon():
+    assert resolve_event_fields("Coffee tomorrow afternoon", NOW) == {}
+    assert resolve_event_fields("Coffee tomorrow at noon", NOW) == {"date": "2025-07-26T12:00:00-07:00"}
@@ -1,11 +1,55 @@
+import functools
 import logging
 import sys
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+# Trace id of the request (or background job) being handled; every log line carries it
+trace_id_var: ContextVar[str] = ContextVar("trace_id", default="-")
+
+_record_factory = logging.getLogRecordFactory()
+
+
+def _with_trace_id(*args, **kwargs) -> logging.LogRecord:
+    record = _record_factory(*args, **kwargs)
+    record.trace_id = trace_id_var.get()
+    return record
+
+
+logging.setLogRecordFactory(_with_trace_id)
 
 logging.basicConfig(
     level=logging.INFO,
     stream=sys.stdout,
-    format="%(asctime)s - %(levelname)s - %(message)s",
+    format="%(asctime)s - %(levelname)s - [%(trace_id)s] %(message)s",
     datefmt="%Y-%m-%d %H:%M:%S",
 )
 
 logger = logging.getLogger(__name__)
+
+
+def new_trace_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+@contextmanager
+def traced(trace_id: Optional[str] = None) -> Iterator[str]:
+    """Run the block under `trace_id` (a fresh one if None); tasks and to_thread calls inherit it."""
+    token = trace_id_var.set(trace_id or new_trace_id())
+    try:
+        yield trace_id_var.get()
+    finally:
+        trace_id_var.reset(token)
+
+
+def in_current_trace(func):
+    """Wrap `func` to run under the caller's trace id; thread pools don't copy contextvars."""
+    trace_id = trace_id_var.get()
+
+    @functools.wraps(func)
+    def run(*args, **kwargs):
+        with traced(trace_id):
+            return func(*args, **kwargs)
+    return run
@@ -0,0 +1,181 @@
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Iterator, Sequence
+from calendar_ai_agent_web_app.backend.utils.logger import logger
+
+# Prometheus text exposition format, served by GET /metrics
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency buckets (seconds): from in-process stages up to slow LLM and Google calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: dict[tuple, object] = {}
+        registry.register(self)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: tuple, *extra: tuple[str, str]) -> str:
+        pairs = [*zip(self.labelnames, key), *extra]
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}" if pairs else ""
+
+    def samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{self._labels(key)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, totals = self._values.setdefault(key, ([0] * len(self.buckets), [0.0, 0]))
+            index = bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                counts[index] += 1
+            totals[0] += value
+            totals[1] += 1
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            values = sorted((key, (list(counts), list(totals))) for key, (counts, totals) in self._values.items())
+        for key, (counts, (total, count)) in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket{self._labels(key, ('le', repr(bound)))} {cumulative}"
+            yield f"{self.name}_bucket{self._labels(key, ('le', '+Inf'))} {count}"
+            yield f"{self.name}_sum{self._labels(key)} {_format_value(total)}"
+            yield f"{self.name}_count{self._labels(key)} {count}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric: _Metric) -> None:
+        self._metrics.append(metric)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+stage_seconds = Histogram("calendar_stage_duration_seconds", "Time spent in each pipeline stage.", ["stage"])
+stage_errors = Counter("calendar_stage_errors_total", "Pipeline stages that raised an exception.", ["stage"])
+
+llm_requests = Counter("openai_requests_total", "OpenAI requests by model and outcome (ok / error).", ["model", "outcome"])
+llm_seconds = Histogram("openai_request_duration_seconds", "OpenAI request latency by model.", ["model"])
+llm_tokens = Counter("openai_tokens_total", "OpenAI tokens by model and type (prompt / completion).", ["model", "type"])
+
+google_requests = Counter("google_api_requests_total", "Google Calendar API HTTP requests by method and status.",
+                          ["method", "status"])
+google_seconds = Histogram("google_api_request_duration_seconds", "Google Calendar API latency by method.", ["method"])
+
+http_requests = Counter("http_requests_total", "Requests served by this app, by route and status.",
+                        ["method", "path", "status"])
+http_seconds = Histogram("http_request_duration_seconds", "Time to the response headers, by route.", ["method", "path"])
+
+
+@contextmanager
+def stage(name: str):
+    """Time a pipeline stage; it counts as an error if it raises."""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        stage_errors.inc(stage=name)
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        stage_seconds.observe(elapsed, stage=name)
+        logger.info(f"Stage {name} took {elapsed * 1000:.1f}ms")
+
+
+def instrumented(name: str):
+    """Decorator: every call of the function (sync, async or async generator) is stage `name`."""
+    def decorate(func):
+        if inspect.isasyncgenfunction(func):
+            @functools.wraps(func)
+            async def stream(*args, **kwargs):
+                with stage(name):
+                    async for item in func(*args, **kwargs):
+                        yield item
+            return stream
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def run_async(*args, **kwargs):
+                with stage(name):
+                    return await func(*args, **kwargs)
+            return run_async
+
+        @functools.wraps(func)
+        def run(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return run
+
+    return decorate
+
+
+def record_llm_call(model: str, seconds: float, ok: bool = True, prompt_tokens: int = 0,
+                    completion_tokens: int = 0) -> None:
+    llm_requests.inc(model=model, outcome="ok" if ok else "error")
+    llm_seconds.observe(seconds, model=model)
+    if prompt_tokens:
+        llm_tokens.inc(prompt_tokens, model=model, type="prompt")
+    if completion_tokens:
+        llm_tokens.inc(completion_tokens, model=model, type="completion")
+
+
+def record_google_call(method: str, status: str, seconds: float) -> None:
+    google_requests.inc(method=method, status=status)
+    google_seconds.observe(seconds, method=method)
@@ -1,37 +1,93 @@
 import React, { useState } from 'react';
-import axios from 'axios';
 import EmailConfirmationPrompt from './EmailConfirmationPrompt';
 
+const STAGE_LABELS = {
+    enriched: '🧩 Understanding your request...',
+    classified: '🏷️ Working out what you want...',
+    parsed: '📝 Reading the event details...',
+    calendar: '📆 Calendar updated, writing confirmation...',
+};
+
+// Splits one "event: ...\ndata: ..." block of a server-sent-events stream
+const parseSseBlock = (block) => {
+    let event = 'message';
+    let data = '';
+    block.split('\n').forEach((line) => {
+        if (line.startsWith('event:')) event = line.slice(6).trim();
+        else if (line.startsWith('data:')) data += line.slice(5).trim();
+    });
+    return { event, data: data ? JSON.parse(data) : null };
+};
+
 const EventForm = () => {
     const [eventDescription, setEventDescription] = useState('');
     const [participants, setParticipants] = useState('');
     const [confirmation, setConfirmation] = useState(null);
     const [draft, setDraft] = useState(null);
     const [loading, setLoading] = useState(false);
+    const [stage, setStage] = useState('');
+    const [streamedText, setStreamedText] = useState('');
+
+    const showResult = (data) => {
+        if (data.confirmation_message && data.requires_confirmation) {
+            setDraft({
+                requires_confirmation: true,
+                subject: data.subject || "Meeting Confirmation",
+                confirmation_message: data.confirmation_message,
+                to_emails: participants.split(',').map(email => email.trim()),
+                calendar_link: data.calendar_link
+            });
+            setConfirmation(null);
+        } else {
+            setConfirmation(data);
+            setDraft(null);
+        }
+    };
 
     const handleSubmit = async (e) => {
         e.preventDefault();
         setLoading(true);
+        setStage('');
+        setStreamedText('');
+        setConfirmation(null);
+        setDraft(null);
         try {
-            const response = await axios.post('https://calendar-agent-app.com/process', {
-                user_input: eventDescription,
-                participants: participants.split(',').map(email => email.trim())
+            // Stage updates and confirmation tokens arrive as server-sent events
+            const response = await fetch('https://calendar-agent-app.com/process/stream', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({
+                    user_input: eventDescription,
+                    participants: participants.split(',').map(email => email.trim())
+                })
             });
+            if (!response.ok || !response.body) {
+                throw new Error(`Stream failed with status ${response.status}`);
+            }
+
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            for (;;) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
 
-            const data = response.data;
+                let boundary;
+                while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                    const { event, data } = parseSseBlock(buffer.slice(0, boundary));
+                    buffer = buffer.slice(boundary + 2);
 
-            if (data.confirmation_message && data.requires_confirmation) {
-                setDraft({
-                    requires_confirmation: true,
-                    subject: data.subject || "Meeting Confirmation",
-                    confirmation_message: data.confirmation_message,
-                    to_emails: participants.split(',').map(email => email.trim()),
-                    calendar_link: data.calendar_link
-                });
-                setConfirmation(null);
-            } else {
-                setConfirmation(data);
-                setDraft(null);
+                    if (event === 'token') {
+                        setStreamedText((text) => text + data.text);
+                    } else if (event === 'done') {
+                        showResult(data);
+                    } else if (event === 'error') {
+                        setConfirmation(data);
+                    } else if (STAGE_LABELS[event]) {
+                        setStage(STAGE_LABELS[event]);
+                    }
+                }
             }
         } catch (error) {
             console.error('Error processing the event', error);
@@ -39,6 +95,7 @@ const EventForm = () => {
             setDraft(null);
         } finally {
             setLoading(false);
+            setStreamedText('');
         }
     };
 
@@ -138,7 +195,14 @@ const EventForm = () => {
                 )}
                 {/* Optional: Loading indicator */}
                 {loading && (
-                    <p className="text-center text-sm text-gray-500">🔄 Processing your request...</p>
+                    <div className="space-y-3">
+                        <p className="text-center text-sm text-gray-500">{stage || '🔄 Processing your request...'}</p>
+                        {streamedText && (
+                            <div className="bg-white rounded-xl shadow p-6 text-gray-700 whitespace-pre-line">
+                                {streamedText}
+                            </div>
+                        )}
+                    </div>
                 )}
             </div>
         </div>
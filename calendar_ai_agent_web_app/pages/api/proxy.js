@@ -7,11 +7,13 @@ export default async function handler(req, res) {
   }
 
   try {
-    const { user_input, participants } = req.body;
+    const { user_input, participants, user_id, background } = req.body;
 
     const response = await axios.post('http://18.221.147.151:8000/process', {
       user_input,
-      participants
+      participants,
+      user_id,
+      background
     }, {
       headers: {
         'Content-Type': 'application/json'
@@ -10,6 +10,8 @@ export default async function handler(req, res) {
     const response = await axios.post('http://18.221.147.151:8000/send_confirmation_email', req.body, {
       headers: {
         'Content-Type': 'application/json',
+        // Lets the backend outbox drop retried submissions of the same email
+        ...(req.headers['idempotency-key'] && { 'Idempotency-Key': req.headers['idempotency-key'] }),
       },
     });
 